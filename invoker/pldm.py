@@ -1,8 +1,12 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT License.
 
+import re
 import argparse
 from pathlib import Path
+import importlib
+import multiprocessing
+import time
 import os
 import sys
 sys.path.append("../python")
@@ -10,10 +14,22 @@ sys.path.append("../python")
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Append the parent directory to the Python path
 sys.path.append(parent_dir)
-# Now you can import unpack.py
-from python import unpack
-from python import repack
-from python import error_injection
+# Subsystems are imported only for the chosen mode, see import_subsystem
+from spec import load_spec
+
+#time taken by the lazy imports and the spec loading, printed with --timings
+timings = {}
+
+def import_subsystem(name):
+    """
+    This function imports the module of the chosen mode from the python package and measures the import time
+        Parameters:
+            name: name of the module, e.g. unpack
+    """
+    start = time.perf_counter()
+    module = importlib.import_module("python." + name)
+    timings["import " + name] = time.perf_counter() - start
+    return module
 
 
 class UpdateChoices(argparse.Action):
@@ -34,24 +50,13 @@ class UpdateChoices(argparse.Action):
         setattr(namespace, self.dest, values)
 
 
-if __name__ == '__main__':
-    parser = argparse.ArgumentParser()
-    #take fwpkg file name along with folder from the user
-    parser.add_argument("-F", "--fwpkg-file-path", help="Name of the PLDM FW update package", dest="fwpkg_file_path") #file path
-    #Define the PLDM FW Update Specification Version
-    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0") 
-    # Define the name argument with the custom action class
-    parser.add_argument("-N","--name", help="Enter name of the program", choices=["unpack", "repack"], action=UpdateChoices)
-    # Define the error argument as an optional choice
-    parser.add_argument("-E","--error_file",help="Enter the type of error to be injected", dest="error_file",choices=["descriptor", "UUID", "image","signkey","largefile"])
-    # Return only header.json file as output
-    parser.add_argument("-D", "--dump_header_json", help="Dump Header.json from bundle", dest="dump_header_json", action="store_true")
-    # take the output path in which unpacked data/header.json file will be stored
-    parser.add_argument("-O", "--output", help="Provide directory path for storing output data", dest="output", required=False)
-    args = parser.parse_args()
-    if args.name in ["unpack", "repack"] and not args.fwpkg_file_path:
-        parser.error("argument -F/--fwpkg-file-path is required when --mode is ['unpack', 'repack']")
-
+def main(args):
+    """
+    This function runs the chosen mode. It is called only from the main module, the worker processes of unpack
+    import this module again and must not run it
+        Parameters:
+            args: parsed command line arguments
+    """
     file_path = args.fwpkg_file_path # path of the firmware package
     spec_path = args.spec_path
     program_name = args.name #name of the python code
@@ -59,78 +64,220 @@ if __name__ == '__main__':
     dump_header = args.dump_header_json
     output_dir = args.output
     
-    file = Path(file_path)
+    #roundtrip does not need a package, a package on an http server is unpacked in the current folder
+    file = Path(file_path if file_path and not re.match(r"https?://", file_path) else "./package")
     #name of main folder
     folder = (file.parent)
     if(error_file):
         program_name = "error_injection"
-#handling error files
-if(error_file):
-    output_parent_folder = str(folder)+"_error_"+str(error_file)
-    error_injection.main(file_path,error_file)
-    output_folder = output_parent_folder
-    print("\nError Injected successfully.")
-    output_path = os.path.abspath(output_folder)
-    print(f"Corrupted files are available here: {output_path}")
-    image_file_path  =Path("repack/repacked_data.fwpkg")
-    image_path = output_path/image_file_path
-    print("Full image is available here:",image_path)
+    if args.sync:
+        import_subsystem("output_writer").sync_output = True
+    #the spec is loaded once here and reused by the subsystems
+    start = time.perf_counter()
+    load_spec(spec_path)
+    timings["load " + spec_path] = time.perf_counter() - start
+    #handling error files
+    if(error_file):
+        output_parent_folder = str(folder)+"_error_"+str(error_file)
+        error_injection = import_subsystem("error_injection")
+        error_injection.main(file_path,error_file,spec_path)
+        output_folder = output_parent_folder
+        print("\nError Injected successfully.")
+        output_path = os.path.abspath(output_folder)
+        print(f"Corrupted files are available here: {output_path}")
+        image_file_path  =Path("repack/repacked_data.fwpkg")
+        image_path = output_path/image_file_path
+        print("Full image is available here:",image_path)
     
-elif(program_name):
-    if (output_dir != None):
-        output_parent_folder = output_dir
-    else:
-        output_parent_folder = str(folder)
-    if(program_name == "unpack"):
+    elif(program_name):
+        if (output_dir != None):
+            output_parent_folder = output_dir
+        else:
+            output_parent_folder = str(folder)
+        if(program_name == "unpack"):
+            #unpack
+            output_folder = output_parent_folder +"/unpack"
+            error_file=None
+            unpack = import_subsystem("unpack")
+            #messages must not end up in an archive written to stdout
+            message_file = sys.stderr if args.archive == "-" else sys.stdout
+            if unpack.main(file_path, output_dir, spec_path, None, args.header_format, args.archive, args.component, args.compress, args.level, args.jobs):
+                print("\nUnpack was successful. CRC matches! Package is PLDM compliant.", file=message_file)
+            else: 
+                print("\nUnpack was successful. But CRC mismatches!", file=message_file)
+            if args.archive:
+                if args.archive != "-":
+                    print(f"Unpacked archive is available here: {os.path.abspath(args.archive)}")
+            else:
+                output_path = os.path.abspath(output_folder)
+                print(f"Unpacked files are available here: {output_path}")
+        elif(program_name == "repack"):
+            #repack
+            output_folder = output_parent_folder +"/repack/repacked_data.fwpkg"
+            repack = import_subsystem("repack")
+            repack.main(file_path, output_dir, spec_path, args.manifest, args.rebuild)
+            print("\nRepack was successful.")
+            output_path = os.path.abspath(output_folder)
+            print(f"Repacked file is available at: {output_path}")
+        elif(program_name == "variants"):
+            #variants
+            output_folder = output_parent_folder +"/variants"
+            variants = import_subsystem("variants")
+            variants.main(file_path, args.variants, output_dir, spec_path, args.jobs or 1, args.manifest)
+            print("\nVariants were built successfully.")
+            output_path = os.path.abspath(output_folder)
+            print(f"Variants are available here: {output_path}")
+        elif(program_name == "query"):
+            #query
+            query = import_subsystem("query")
+            query.main(file_path, spec_path, args.query)
+        elif(program_name == "applicability"):
+            #component to device record applicability report
+            applicability = import_subsystem("applicability")
+            applicability.main(file_path, spec_path)
+        elif(program_name == "verify"):
+            #header and payload checksums without unpacking
+            verify = import_subsystem("verify")
+            if not verify.main(file_path, spec_path, args.jobs):
+                print("\nVerification failed.")
+                sys.exit(1)
+            print("\nVerification was successful.")
+        elif(program_name == "simulate"):
+            #serve the package to simulated firmware devices and measure their transfers
+            simulator = import_subsystem("simulator")
+            simulator.main(file_path, spec_path, args.jobs, args.transfer_size)
+        elif(program_name in ["split", "merge"]):
+            #split a package per device record or merge the components of several packages
+            split_merge = import_subsystem("split_merge")
+            split_merge.main(program_name, [file_path] if program_name == "split" else args.input, spec_path, output_dir, args.record)
+        elif(program_name == "watch"):
+            #rebuild the bundle of an unpack folder every time it changes
+            watch = import_subsystem("watch")
+            watch.main(file_path, spec_path, output_dir)
+        elif(program_name == "index"):
+            #add the packages of the folder to the sqlite catalog
+            catalog = import_subsystem("catalog")
+            catalog.main(file_path, spec_path, args.catalog)
+        elif(program_name == "catalog"):
+            #packages of the sqlite catalog matching the filters
+            catalog = import_subsystem("catalog")
+            catalog.main(file_path or ".", spec_path, args.catalog, args.query)
+        elif(program_name == "roundtrip"):
+            #round trip of generated packages and of the sample packages of the -F folder
+            roundtrip = import_subsystem("roundtrip")
+            if not roundtrip.main(file_path, spec_path, update_baselines=args.update_baselines):
+                print("\nRound trip failed.")
+                sys.exit(1)
+            print("\nRound trip was successful.")
+
+    #unpack and repack both
+    elif not (program_name) and not (error_file) and not (dump_header):
+        if (output_dir != None):
+            output_parent_folder = output_dir
+        else:
+            output_parent_folder = str(folder)
         #unpack
         output_folder = output_parent_folder +"/unpack"
-        error_file=None
-        if unpack.main(file_path, output_dir, spec_path, None):
+        unpack = import_subsystem("unpack")
+        if unpack.main(file_path, output_dir, spec_path, None, args.header_format, compression=args.compress, level=args.level, jobs=args.jobs):
             print("\nUnpack was successful. CRC matches! Package is PLDM compliant.")
         else: 
             print("\nUnpack was successful. But CRC mismatches!")
         output_path = os.path.abspath(output_folder)
         print(f"Unpacked files are available here: {output_path}")
-    elif(program_name == "repack"):
+    
         #repack
         output_folder = output_parent_folder +"/repack/repacked_data.fwpkg"
+        repack = import_subsystem("repack")
         repack.main(file_path, output_dir, spec_path)
         print("\nRepack was successful.")
         output_path = os.path.abspath(output_folder)
         print(f"Repacked file is available at: {output_path}")
-
-#unpack and repack both
-elif not (program_name) and not (error_file) and not (dump_header):
-    if (output_dir != None):
-        output_parent_folder = output_dir
-    else:
-        output_parent_folder = str(folder)
-    #unpack
-    output_folder = output_parent_folder +"/unpack"
-    if unpack.main(file_path, output_dir, spec_path, None):
-        print("\nUnpack was successful. CRC matches! Package is PLDM compliant.")
-    else: 
-        print("\nUnpack was successful. But CRC mismatches!")
-    output_path = os.path.abspath(output_folder)
-    print(f"Unpacked files are available here: {output_path}")
     
-    #repack
-    output_folder = output_parent_folder +"/repack/repacked_data.fwpkg"
-    repack.main(file_path, output_dir, spec_path)
-    print("\nRepack was successful.")
-    output_path = os.path.abspath(output_folder)
-    print(f"Repacked file is available at: {output_path}")
-    
-#only dump header.json
-elif dump_header:
-    if (output_dir != None):
-        output_parent_folder = output_dir
-    else:
-        output_parent_folder = str(folder)
-    output_folder = output_parent_folder +"/unpack"
-    if unpack.main(file_path, output_dir, spec_path, dump_header):
-        print("\nHeader.json file saved. CRC matches! Package is PLDM compliant.")
-    else: 
-        print("\nHeader.json file saved. But CRC mismatches!")
-    output_path = os.path.abspath(output_folder)
-    print(f"header.json file available here: {output_path}")
\ No newline at end of file
+    #only dump header.json
+    elif dump_header:
+        if (output_dir != None):
+            output_parent_folder = output_dir
+        else:
+            output_parent_folder = str(folder)
+        output_folder = output_parent_folder +"/unpack"
+        unpack = import_subsystem("unpack")
+        if unpack.main(file_path, output_dir, spec_path, dump_header, args.header_format, components=args.component, jobs=args.jobs):
+            print("\nHeader.json file saved. CRC matches! Package is PLDM compliant.")
+        else: 
+            print("\nHeader.json file saved. But CRC mismatches!")
+        output_path = os.path.abspath(output_folder)
+        print(f"header.json file available here: {output_path}")
+
+    if args.timings:
+        print("\nTimings:")
+        for step, seconds in timings.items():
+            print(f"    {step}: {seconds * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    #unpack decodes large device record tables on worker processes, needed by the PyInstaller executable
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser()
+    #take fwpkg file name along with folder from the user
+    parser.add_argument("-F", "--fwpkg-file-path", help="Name of the PLDM FW update package", dest="fwpkg_file_path") #file path
+    #Define the PLDM FW Update Specification Version
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0") 
+    # Define the name argument with the custom action class
+    parser.add_argument("-N","--name", help="Enter name of the program", choices=["unpack", "repack", "variants", "query", "roundtrip", "applicability", "verify", "index", "catalog", "split", "merge", "watch", "simulate"], action=UpdateChoices)
+    # Define the error argument as an optional choice
+    parser.add_argument("-E","--error_file",help="Enter the type of error to be injected", dest="error_file",choices=["descriptor", "UUID", "image","signkey","largefile"])
+    # Return only header.json file as output
+    parser.add_argument("-D", "--dump_header_json", help="Dump Header.json from bundle", dest="dump_header_json", action="store_true")
+    # take the output path in which unpacked data/header.json file will be stored
+    parser.add_argument("-O", "--output", help="Provide directory path for storing output data", dest="output", required=False)
+    # take the manifest that maps the components to their source files while repacking
+    parser.add_argument("-M", "--manifest", help="Manifest mapping components to image files or package byte ranges for repack", dest="manifest", required=False)
+    # take the variants file with the overrides of every variant
+    parser.add_argument("-V", "--variants", help="Variants json file with the per-variant header overrides", dest="variants", required=False)
+    # number of variants written in parallel, of threads calculating the payload checksum in verify mode, of processes decoding device records in unpack mode, or of simulated devices
+    parser.add_argument("-J", "--jobs", help="Number of variants written in parallel, of checksum threads in verify mode or of processes decoding large device record tables in unpack mode (sequential by default), or of devices in simulate mode (8 by default)", dest="jobs", type=int)
+    # number of bytes requested at a time by the simulated devices
+    parser.add_argument("-X", "--transfer-size", help="Number of bytes requested at a time by the devices in simulate mode", dest="transfer_size", type=int)
+    # format of the header file written by unpack, compact and ndjson are written while the header is decoded
+    parser.add_argument("-H", "--header-format", help="Format of the header file written by unpack", dest="header_format", choices=["json", "compact", "ndjson"], default="json")
+    # write the unpacked package as a tar archive instead of the unpack folder, - for stdout
+    parser.add_argument("-A", "--archive", help="Tar archive written by unpack instead of the unpack folder, - for stdout", dest="archive", required=False)
+    # field paths printed by query, or filters of the catalog mode
+    parser.add_argument("-Q", "--query", help="Field path to print in query mode, e.g. ComponentImageInformationArea.ComponentImageInformation[*].ComponentIdentifier, or Field=value filter in catalog mode", dest="query", action="append")
+    # sqlite catalog of the index and catalog modes
+    parser.add_argument("-C", "--catalog", help="SQLite catalog file of the index and catalog modes, pldm_catalog.sqlite in the -F folder by default", dest="catalog", required=False)
+    # records split out by split mode
+    parser.add_argument("-R", "--record", help="Index of a firmware device ID record to split out, all of them by default", dest="record", type=int, action="append")
+    # packages merged by merge mode
+    parser.add_argument("-I", "--input", help="Package to merge with optional component indexes, e.g. bundle.fwpkg:0,2", dest="input", action="append")
+    # repack even when the repacked file is up to date
+    parser.add_argument("-B", "--rebuild", help="Repack even when the repacked file is up to date", dest="rebuild", action="store_true")
+    # components extracted by unpack, only their bytes are read from the package
+    parser.add_argument("-K", "--component", help="Index of a component to extract in unpack mode, only the header and the selected components are read", dest="component", type=int, action="append")
+    # store the component images compressed when unpacking, repack decompresses them while it streams them into the bundle
+    parser.add_argument("-Z", "--compress", help="Store the component images compressed with this codec when unpacking", dest="compress", choices=["zlib", "lzma"])
+    parser.add_argument("-L", "--level", help="Compression level of -Z, 0 to 9", dest="level", type=int, choices=range(10))
+    # store the round trip measurements as the new baselines
+    parser.add_argument("-U", "--update-baselines", help="Store the round trip measurements as the new baselines", dest="update_baselines", action="store_true")
+    # flush the output folders of unpack and repack to the disk before they are published
+    parser.add_argument("-Y", "--sync", help="Flush the files of the unpack and repack output folders to the disk before publishing them", dest="sync", action="store_true")
+    # print the import and spec loading times
+    parser.add_argument("-T", "--timings", help="Print the time taken to import the subsystem and to load the spec", dest="timings", action="store_true")
+    args = parser.parse_args()
+    if args.name in ["unpack", "repack", "variants", "query", "applicability", "verify", "index", "split", "watch", "simulate"] and not args.fwpkg_file_path:
+        parser.error("argument -F/--fwpkg-file-path is required when --mode is ['unpack', 'repack', 'variants', 'query', 'applicability', 'verify', 'index', 'split', 'watch', 'simulate']")
+    if args.name == "merge" and not args.input:
+        parser.error("argument -I/--input is required when --mode is merge")
+    if args.name == "catalog" and not (args.query and (args.fwpkg_file_path or args.catalog)):
+        parser.error("arguments -Q/--query and -F/--fwpkg-file-path or -C/--catalog are required when --mode is catalog")
+    if args.name == "variants" and not args.variants:
+        parser.error("argument -V/--variants is required when --mode is variants")
+    if args.name == "query" and not args.query:
+        parser.error("argument -Q/--query is required when --mode is query")
+    if args.name == "simulate" and args.transfer_size is not None:
+        #the simulator is only imported in simulate mode
+        baseline_transfer_size = import_subsystem("simulator").BASELINE_TRANSFER_SIZE
+        if args.transfer_size < baseline_transfer_size:
+            parser.error(f"argument -X/--transfer-size: must be at least the baseline transfer size of {baseline_transfer_size} bytes")
+    main(args)
@@ -0,0 +1,167 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import json
+import argparse
+from pathlib import Path
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import query
+from python import header_stream
+from spec import load_spec
+
+#records with an ApplicableComponents bitmap: (area, records field, bitmap field)
+BITMAP_FIELDS = [
+    ("FirmwareDeviceIdentificationArea", "FirmwareDeviceIDRecords", "ApplicableComponents"),
+    ("DownstreamDeviceIdentificationArea", "DownstreamDeviceIDRecords", "DownstreamDeviceApplicableComponents"),
+]
+
+def bitset(value):
+    """
+    This function turns a decoded bitmap, a hex-le string like "0x5", into an integer. Bit N set means component N
+        Parameters:
+            value: decoded value of the bitmap
+    """
+    if isinstance(value, int):
+        return value
+    return int(value, 16) if value else 0
+
+def set_bits(value):
+    """
+    This function returns the indexes of the bits set in an integer bitset, lowest first
+        Parameters:
+            value: integer bitset
+    """
+    bits = []
+    while value:
+        lowest = value & -value
+        bits.append(lowest.bit_length() - 1)
+        value ^= lowest
+    return bits
+
+def build_index(output_dict):
+    """
+    This function builds the applicability index of a decoded header. Every bitmap is parsed once, both directions
+    are then answered with a list or dictionary lookup
+        {
+            "component_count": 3,
+            "bitsets": {"FirmwareDeviceIDRecords": [7, 3], "DownstreamDeviceIDRecords": [5]},
+            "records": {"FirmwareDeviceIDRecords": [[0, 1, 2], [0, 1]], "DownstreamDeviceIDRecords": [[0, 2]]},
+            "components": [{"FirmwareDeviceIDRecords": [0, 1], "DownstreamDeviceIDRecords": [0]}, ...]
+        }
+        Parameters:
+            output_dict: decoded header, records that were not decoded are None
+    """
+    component_count = len(output_dict["ComponentImageInformationArea"]["ComponentImageInformation"])
+    index = {"component_count": component_count, "bitsets": {}, "records": {}, "components": [{} for _ in range(component_count)]}
+    for area, records_field, bitmap_field in BITMAP_FIELDS:
+        if records_field not in output_dict.get(area, {}):
+            continue
+        bitsets = [bitset(record[bitmap_field]) if record else 0 for record in output_dict[area][records_field]]
+        index["bitsets"][records_field] = bitsets
+        index["records"][records_field] = [set_bits(value) for value in bitsets]
+        for component in index["components"]:
+            component[records_field] = []
+        for record_index, components in enumerate(index["records"][records_field]):
+            for component_index in components:
+                #bits past the last component are kept on the record only, see invalid_bits
+                if component_index < component_count:
+                    index["components"][component_index][records_field].append(record_index)
+    return index
+
+def records_for(index, component_index, records_field="FirmwareDeviceIDRecords"):
+    """
+    This function returns the indexes of the records a component applies to
+        Parameters:
+            index: applicability index
+            component_index: index of the component in ComponentImageInformation
+            records_field: FirmwareDeviceIDRecords or DownstreamDeviceIDRecords
+    """
+    return index["components"][component_index].get(records_field, [])
+
+def components_for(index, record_index, records_field="FirmwareDeviceIDRecords"):
+    """
+    This function returns the indexes of the components a device record receives
+        Parameters:
+            index: applicability index
+            record_index: index of the record
+            records_field: FirmwareDeviceIDRecords or DownstreamDeviceIDRecords
+    """
+    return index["records"][records_field][record_index]
+
+def applies(index, component_index, record_index, records_field="FirmwareDeviceIDRecords"):
+    """
+    This function checks whether a component applies to a device record
+        Parameters:
+            index: applicability index
+            component_index: index of the component in ComponentImageInformation
+            record_index: index of the record
+            records_field: FirmwareDeviceIDRecords or DownstreamDeviceIDRecords
+    """
+    return bool(index["bitsets"][records_field][record_index] >> component_index & 1)
+
+def invalid_bits(index):
+    """
+    This function returns the (records field, record index, component index) of the bits set for components that are
+    not part of the package
+        Parameters:
+            index: applicability index
+    """
+    return [(records_field, record_index, component_index)
+            for records_field, records in index["records"].items()
+            for record_index, components in enumerate(records)
+            for component_index in components if component_index >= index["component_count"]]
+
+def load_header(file_path, spec_path):
+    """
+    This function returns the decoded header of a package or of an unpack folder. Only the records, the bitmaps and
+    the component information are decoded from a package
+        Parameters:
+            file_path: package, or unpack folder with header.json or header.ndjson
+            spec_path: version of the spec
+    """
+    path = Path(file_path)
+    if path.is_dir():
+        if (path / "header.json").exists():
+            with open(path / "header.json", "r") as f:
+                return json.load(f)
+        return header_stream.load_header(path / "header.ndjson")
+    spec_data = load_spec(spec_path)
+    paths = [["ComponentImageInformationArea", "ComponentImageInformation", "*"]]
+    for _, _, bitmap_field in BITMAP_FIELDS:
+        paths.extend(query.find_field(spec_data, bitmap_field))
+    return query.read_header(path, spec_path, paths)
+
+def main(file_path, spec_path):
+    """
+    This function prints which device records every component applies to and which components every device record
+    receives
+        Parameters:
+            file_path: package, or unpack folder with header.json or header.ndjson
+            spec_path: version of the spec
+    """
+    output_dict = load_header(file_path, spec_path)
+    index = build_index(output_dict)
+    components = output_dict["ComponentImageInformationArea"]["ComponentImageInformation"]
+    for component_index, component in enumerate(components):
+        print(f"Component {component_index} ({component['ComponentIdentifier']} {component['ComponentVersionString']}):")
+        for records_field in index["records"]:
+            print(f"    {records_field}: {records_for(index, component_index, records_field)}")
+    for records_field, records in index["records"].items():
+        for record_index, record_components in enumerate(records):
+            print(f"{records_field}[{record_index}]: components {record_components}")
+    for records_field, record_index, component_index in invalid_bits(index):
+        print(f"Warning: {records_field}[{record_index}] applies to component {component_index} which is not in the package")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    #take fwpkg file name or an unpack folder
+    parser.add_argument("-F", "--fwpkg-file-path", help="PLDM FW update package or unpack folder", dest="fwpkg_file_path", required=True)
+    #take the spec version
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0")
+    args = parser.parse_args()
+    main(args.fwpkg_file_path, args.spec_path)
@@ -0,0 +1,324 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import json
+import sqlite3
+import argparse
+from pathlib import Path
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import query
+from python import applicability
+from spec import load_spec
+
+#name of the catalog created in the indexed folder when no catalog path is given
+CATALOG_NAME = "pldm_catalog.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    spec TEXT NOT NULL,
+    header_identifier TEXT,
+    release_date TEXT,
+    package_version TEXT,
+    header_crc_match INTEGER
+);
+CREATE TABLE IF NOT EXISTS device_records (
+    package_id INTEGER NOT NULL REFERENCES packages(id) ON DELETE CASCADE,
+    records_field TEXT NOT NULL,
+    record_index INTEGER NOT NULL,
+    version TEXT,
+    applicable_components TEXT,
+    PRIMARY KEY (package_id, records_field, record_index)
+);
+CREATE TABLE IF NOT EXISTS descriptors (
+    package_id INTEGER NOT NULL REFERENCES packages(id) ON DELETE CASCADE,
+    records_field TEXT NOT NULL,
+    record_index INTEGER NOT NULL,
+    descriptor_index INTEGER NOT NULL,
+    type TEXT,
+    data TEXT,
+    title TEXT
+);
+CREATE TABLE IF NOT EXISTS components (
+    package_id INTEGER NOT NULL REFERENCES packages(id) ON DELETE CASCADE,
+    component_index INTEGER NOT NULL,
+    identifier TEXT,
+    version TEXT,
+    classification TEXT,
+    comparison_stamp INTEGER,
+    size INTEGER,
+    PRIMARY KEY (package_id, component_index)
+);
+CREATE TABLE IF NOT EXISTS record_components (
+    package_id INTEGER NOT NULL REFERENCES packages(id) ON DELETE CASCADE,
+    records_field TEXT NOT NULL,
+    record_index INTEGER NOT NULL,
+    component_index INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failures (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    spec TEXT NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS components_identifier ON components (identifier, version);
+CREATE INDEX IF NOT EXISTS components_version ON components (version);
+CREATE INDEX IF NOT EXISTS descriptors_data ON descriptors (type, data);
+CREATE INDEX IF NOT EXISTS descriptors_record ON descriptors (package_id, records_field, record_index);
+CREATE INDEX IF NOT EXISTS record_components_component ON record_components (package_id, component_index);
+CREATE INDEX IF NOT EXISTS packages_version ON packages (package_version);
+"""
+
+#filters of the catalog query matching a column of the components table
+COMPONENT_FILTERS = {"ComponentIdentifier": "identifier", "ComponentVersionString": "version", "ComponentClassification": "classification"}
+
+#filters of the catalog query matching a column of the packages table
+PACKAGE_FILTERS = {"PackageVersionString": "package_version", "PackageHeaderIdentifier": "header_identifier"}
+
+#decoding errors of a package, it is recorded as a failure and decoded again only when it changes
+DECODE_ERRORS = (KeyError, IndexError, ValueError, TypeError, UnicodeDecodeError)
+
+def descriptor_types(spec_data):
+    """
+    This function returns the descriptor types a catalog filter can name, the decoded types of the descriptor type
+    fields of the spec, e.g. "PCI Vendor ID"
+        Parameters:
+            spec_data: spec json
+    """
+    types = set()
+    for name, value in spec_data.items():
+        if not isinstance(value, dict):
+            continue
+        if name.endswith("DescriptorType") and isinstance(value.get("decode"), dict):
+            types.update(value["decode"].values())
+        types |= descriptor_types(value)
+    return types
+
+def connect(catalog_path):
+    """
+    This function opens the catalog and creates its tables when they do not exist yet
+        Parameters:
+            catalog_path: path of the sqlite file
+    """
+    connection = sqlite3.connect(catalog_path)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(SCHEMA)
+    return connection
+
+def normalize(value):
+    """
+    This function writes hexadecimal values the way unpack decodes them, e.g. 0x00AB -> 0xab, other values are kept
+        Parameters:
+            value: value from the header or from a filter
+    """
+    if isinstance(value, str) and value[:2].lower() == "0x":
+        try:
+            return hex(int(value, 16))
+        except ValueError:
+            return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+def descriptor_rows(record):
+    """
+    This function returns the (type, data, title) of the descriptors of a device record
+        Parameters:
+            record: decoded FirmwareDeviceIDRecords or DownstreamDeviceIDRecords entry
+    """
+    descriptors = next((v for k, v in record.items() if k.endswith("RecordDescriptors")), [])
+    rows = []
+    for descriptor in descriptors:
+        descriptor_type = descriptor.get("InitialDescriptorType", descriptor.get("AdditionalDescriptorType"))
+        if "VendorDefinedDescriptorData" in descriptor:
+            data = descriptor["VendorDefinedDescriptorData"]
+        else:
+            data = descriptor.get("InitialDescriptorData", descriptor.get("AdditionalDescriptorIdentifierData"))
+        rows.append((descriptor_type, normalize(data), descriptor.get("VendorDefinedDescriptorTitleString")))
+    return rows
+
+def store_package(connection, file_path, spec_path, stat):
+    """
+    This function decodes a package and replaces its rows in the catalog, a failure recorded for it is dropped
+        Parameters:
+            connection: catalog connection
+            file_path: path of the package
+            spec_path: version of the spec
+            stat: os.stat of the package
+    """
+    output_dict, header_crc_match = query.read_package(file_path, spec_path)
+    info = output_dict["PackageHeaderInformation"]
+    connection.execute("DELETE FROM packages WHERE path = ?", (str(file_path),))
+    connection.execute("DELETE FROM failures WHERE path = ?", (str(file_path),))
+    package_id = connection.execute(
+        "INSERT INTO packages (path, size, mtime_ns, spec, header_identifier, release_date, package_version, header_crc_match) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (str(file_path), stat.st_size, stat.st_mtime_ns, spec_path, normalize(info["PackageHeaderIdentifier"]),
+         info["PackageReleaseDateTime"], info["PackageVersionString"], header_crc_match)).lastrowid
+    for area, records_field, bitmap_field in applicability.BITMAP_FIELDS:
+        for record_index, record in enumerate(output_dict.get(area, {}).get(records_field, [])):
+            connection.execute("INSERT INTO device_records VALUES (?, ?, ?, ?, ?)",
+                               (package_id, records_field, record_index, record.get("ComponentImageSetVersionString"), record[bitmap_field]))
+            connection.executemany("INSERT INTO descriptors VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   [(package_id, records_field, record_index, i) + row for i, row in enumerate(descriptor_rows(record))])
+    components = output_dict["ComponentImageInformationArea"]["ComponentImageInformation"]
+    connection.executemany("INSERT INTO components VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           [(package_id, i, normalize(c["ComponentIdentifier"]), c["ComponentVersionString"], c.get("ComponentClassification"),
+                             c.get("ComponentComparisonStamp"), c["ComponentSize"]) for i, c in enumerate(components)])
+    applicability_index = applicability.build_index(output_dict)
+    connection.executemany("INSERT INTO record_components VALUES (?, ?, ?, ?)",
+                           [(package_id, records_field, record_index, component_index)
+                            for records_field, records in applicability_index["records"].items()
+                            for record_index, record_components in enumerate(records)
+                            for component_index in record_components])
+
+def store_failure(connection, file_path, spec_path, stat, error):
+    """
+    This function records that a package could not be decoded, with its size and modification time so it is not
+    decoded again until it changes. The rows of a previous version of the package are removed
+        Parameters:
+            connection: catalog connection
+            file_path: path of the package
+            spec_path: version of the spec
+            stat: os.stat of the package
+            error: decoding error
+    """
+    connection.execute("DELETE FROM packages WHERE path = ?", (str(file_path),))
+    connection.execute("INSERT OR REPLACE INTO failures VALUES (?, ?, ?, ?, ?)",
+                       (str(file_path), stat.st_size, stat.st_mtime_ns, spec_path, repr(error)))
+
+def index(file_path, spec_path, catalog_path=None):
+    """
+    This function adds the packages of a folder, or a single package, to the catalog. Every package is stored in a
+    savepoint, a package that fails to decode leaves no rows behind and is recorded as a failure. Packages, and
+    failures, whose size and modification time did not change since they were indexed are skipped, packages of the
+    folder that no longer exist are removed. It returns the number of (indexed, skipped, removed) packages
+        Parameters:
+            file_path: package or folder of packages, searched recursively
+            spec_path: version of the spec
+            catalog_path: path of the sqlite file, pldm_catalog.sqlite in the folder by default
+    """
+    path = Path(file_path).resolve()
+    packages = sorted(path.rglob("*.fwpkg")) if path.is_dir() else [path]
+    if catalog_path is None:
+        catalog_path = (path if path.is_dir() else path.parent) / CATALOG_NAME
+    connection = connect(catalog_path)
+    known = {row[0]: row[1:] for row in connection.execute("SELECT path, size, mtime_ns, spec FROM packages")}
+    failed = {row[0]: row[1:] for row in connection.execute("SELECT path, size, mtime_ns, spec FROM failures")}
+    indexed = skipped = removed = 0
+    with connection:
+        for package in packages:
+            stat = package.stat()
+            if (stat.st_size, stat.st_mtime_ns, spec_path) in (known.get(str(package)), failed.get(str(package))):
+                skipped += 1
+                continue
+            connection.execute("SAVEPOINT package")
+            try:
+                store_package(connection, package, spec_path, stat)
+                indexed += 1
+            except DECODE_ERRORS as e:
+                connection.execute("ROLLBACK TO package")
+                print(f"{package} could not be decoded with {spec_path}: {e!r}")
+                store_failure(connection, package, spec_path, stat, e)
+            connection.execute("RELEASE package")
+        if path.is_dir():
+            present = {str(package) for package in packages}
+            for known_path in known.keys() | failed.keys():
+                if Path(known_path).is_relative_to(path) and known_path not in present:
+                    connection.execute("DELETE FROM packages WHERE path = ?", (known_path,))
+                    connection.execute("DELETE FROM failures WHERE path = ?", (known_path,))
+                    if known_path in known:
+                        removed += 1
+    connection.close()
+    return indexed, skipped, removed
+
+def parse_filter(text, types):
+    """
+    This function splits a catalog filter Field=value. Field is a component field, a package field or a descriptor
+    type such as "PCI Vendor ID", other fields raise a ValueError
+        Parameters:
+            text: filter expression
+            types: descriptor types of the spec, see descriptor_types
+    """
+    field, separator, value = text.partition("=")
+    if not separator:
+        raise ValueError(f"Invalid filter {text}, expected Field=value")
+    field = field.strip()
+    if field not in COMPONENT_FILTERS and field not in PACKAGE_FILTERS and field not in types:
+        raise ValueError(f"Unknown filter field {field}, expected one of {', '.join(list(COMPONENT_FILTERS) + list(PACKAGE_FILTERS))} or a descriptor type: {', '.join(sorted(types))}")
+    return field, normalize(value.strip())
+
+def find_packages(connection, filters):
+    """
+    This function returns the (path, package version) of the packages matching all the filters. Component filters
+    have to match the same component and descriptor filters the same device record
+        Parameters:
+            connection: catalog connection
+            filters: list of (field, value) checked by parse_filter
+    """
+    queries = []
+    parameters = []
+    component_filters = [(COMPONENT_FILTERS[f], v) for f, v in filters if f in COMPONENT_FILTERS]
+    if component_filters:
+        queries.append("SELECT package_id FROM components WHERE " + " AND ".join(f"{column} = ?" for column, _ in component_filters))
+        parameters += [v for _, v in component_filters]
+    descriptor_filters = [(f, v) for f, v in filters if f not in COMPONENT_FILTERS and f not in PACKAGE_FILTERS]
+    if descriptor_filters:
+        joins = " ".join(f"JOIN descriptors d{i} USING (package_id, records_field, record_index)" for i in range(1, len(descriptor_filters)))
+        queries.append(f"SELECT DISTINCT package_id FROM descriptors d0 {joins} WHERE " + " AND ".join(f"d{i}.type = ? AND d{i}.data = ?" for i in range(len(descriptor_filters))))
+        parameters += [x for f, v in descriptor_filters for x in (f, v)]
+    for f, v in filters:
+        if f in PACKAGE_FILTERS:
+            queries.append(f"SELECT id FROM packages WHERE {PACKAGE_FILTERS[f]} = ?")
+            parameters.append(v)
+    if not queries:
+        queries.append("SELECT id FROM packages")
+    return connection.execute(
+        f"SELECT path, package_version FROM packages WHERE id IN ({' INTERSECT '.join(queries)}) ORDER BY path", parameters).fetchall()
+
+def main(file_path, spec_path, catalog_path=None, filters=None):
+    """
+    This function indexes the packages into the catalog when filters is None, otherwise it prints the packages of the
+    catalog matching the filters
+        Parameters:
+            file_path: package or folder of packages, used to find the catalog when catalog_path is not given
+            spec_path: version of the spec
+            catalog_path: path of the sqlite file
+            filters: filter expressions, e.g. ["ComponentIdentifier=0x1234", "ComponentVersionString=1.2"]
+    """
+    if filters is None:
+        indexed, skipped, removed = index(file_path, spec_path, catalog_path)
+        print(f"Indexed {indexed} packages, skipped {skipped} unchanged and removed {removed} deleted packages")
+        return
+    if catalog_path is None:
+        path = Path(file_path)
+        catalog_path = (path if path.is_dir() else path.parent) / CATALOG_NAME
+    types = descriptor_types(load_spec(spec_path))
+    filters = [parse_filter(f, types) for f in filters]
+    if not Path(catalog_path).exists():
+        raise FileNotFoundError(f"Catalog {catalog_path} does not exist, run the index command first")
+    connection = connect(catalog_path)
+    for package_path, package_version in find_packages(connection, filters):
+        print(f"{package_path}: {package_version}")
+    connection.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    #take fwpkg file name or a folder of fwpkg files
+    parser.add_argument("-F", "--fwpkg-file-path", help="PLDM FW update package or folder of packages", dest="fwpkg_file_path", default=".")
+    #take the spec version
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0")
+    #take the catalog file
+    parser.add_argument("-C", "--catalog", help="SQLite catalog file, pldm_catalog.sqlite in the folder by default", dest="catalog")
+    #filters of the catalog query, the packages are indexed when there is none
+    parser.add_argument("-Q", "--query", help="Filter Field=value, e.g. ComponentIdentifier=0x1234 or \"PCI Vendor ID=0x8086\"", dest="query", action="append")
+    args = parser.parse_args()
+    main(args.fwpkg_file_path, args.spec_path, args.catalog, args.query)
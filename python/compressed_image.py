@@ -0,0 +1,171 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import lzma
+import zlib
+import struct
+
+#appended to the name of a component image file when it is stored compressed, e.g. <...>_image_0.bin.pldmz
+SUFFIX = ".pldmz"
+
+#first bytes of a compressed component image
+MAGIC = b"PLDMZIMG"
+
+#index header: magic, codec, level, chunk size, size of the image, number of chunks. The compressed size of every
+#chunk follows as a uint32, then the chunks
+HEADER_FORMAT = "<8sBBxxIQI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+CHUNK_SIZE_FORMAT = "<I"
+
+#the image is compressed in chunks of this size, so it is never decompressed as a whole
+CHUNK_SIZE = 4 * 1024 * 1024
+
+CODECS = {"zlib": 1, "lzma": 2}
+CODEC_NAMES = {number: name for name, number in CODECS.items()}
+
+#level used when none is given
+DEFAULT_LEVELS = {"zlib": 6, "lzma": 6}
+
+def compress_chunk(codec, level, data):
+    """
+    This function compresses one chunk of an image
+        Parameters:
+            codec: zlib or lzma
+            level: compression level, 0 to 9
+            data: bytes like chunk
+    """
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    return lzma.compress(data, format=lzma.FORMAT_XZ, preset=level)
+
+def decompress_chunk(codec, data):
+    """
+    This function decompresses one chunk of an image
+        Parameters:
+            codec: zlib or lzma
+            data: compressed chunk
+    """
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return lzma.decompress(data, format=lzma.FORMAT_XZ)
+
+class CompressedImageWriter:
+    """
+    Writes a component image compressed to a seekable binary file. The size of the image has to be known up front,
+    the index header is written first and the compressed sizes of the chunks are filled in by close.
+        writer = CompressedImageWriter(f, len(image), "lzma", 9)
+        writer.write(image)
+        writer.close()
+    """
+    def __init__(self, file, size, codec="zlib", level=None, chunk_size=CHUNK_SIZE):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown compression {codec}, choose from {', '.join(CODECS)}")
+        self.file = file
+        self.size = size
+        self.codec = codec
+        self.level = DEFAULT_LEVELS[codec] if level is None else level
+        self.chunk_size = chunk_size
+        self.start = file.tell()
+        chunk_count = (size + chunk_size - 1) // chunk_size
+        file.write(struct.pack(HEADER_FORMAT, MAGIC, CODECS[codec], self.level, chunk_size, size, chunk_count))
+        file.write(bytes(chunk_count * struct.calcsize(CHUNK_SIZE_FORMAT)))
+        self.compressed_sizes = []
+        self.buffer = bytearray()
+        self.written = 0
+
+    def write(self, data):
+        view = memoryview(data).cast("B")
+        if self.written + len(self.buffer) + len(view) > self.size:
+            raise ValueError(f"The image is larger than the {self.size} bytes announced")
+        position = 0
+        #full chunks are compressed straight from the data, only the partial ones are buffered
+        if self.buffer:
+            position = min(self.chunk_size - len(self.buffer), len(view))
+            self.buffer += view[:position]
+            if len(self.buffer) == self.chunk_size:
+                self.write_chunk(self.buffer)
+                self.buffer = bytearray()
+        while len(view) - position >= self.chunk_size:
+            self.write_chunk(view[position:position + self.chunk_size])
+            position += self.chunk_size
+        self.buffer += view[position:]
+
+    def write_chunk(self, chunk):
+        compressed = compress_chunk(self.codec, self.level, chunk)
+        self.file.write(compressed)
+        self.compressed_sizes.append(len(compressed))
+        self.written += len(chunk)
+
+    def close(self):
+        if self.buffer:
+            self.write_chunk(self.buffer)
+            self.buffer = bytearray()
+        if self.written != self.size:
+            raise ValueError(f"The image is {self.written} bytes, {self.size} bytes were announced")
+        end = self.file.tell()
+        self.file.seek(self.start + HEADER_SIZE)
+        self.file.write(b"".join(struct.pack(CHUNK_SIZE_FORMAT, size) for size in self.compressed_sizes))
+        self.file.seek(end)
+
+def compress_image(data, codec="zlib", level=None):
+    """
+    This function returns a component image compressed with its index header
+        Parameters:
+            data: bytes like image
+            codec: zlib or lzma
+            level: compression level, the default level of the codec by default
+    """
+    buffer = io.BytesIO()
+    writer = CompressedImageWriter(buffer, len(data), codec, level)
+    writer.write(data)
+    writer.close()
+    return buffer.getvalue()
+
+def read_index(file_path, offset=0):
+    """
+    This function reads the index header of a compressed image. It returns None when the file does not hold a
+    compressed image at that offset
+        Parameters:
+            file_path: path of the file
+            offset: offset of the compressed image in the file, e.g. inside a tar archive
+    """
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        header = f.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+            return None
+        _, codec, level, chunk_size, size, chunk_count = struct.unpack(HEADER_FORMAT, header)
+        if codec not in CODEC_NAMES:
+            raise ValueError(f"{file_path} is compressed with an unknown codec {codec}")
+        table = f.read(chunk_count * struct.calcsize(CHUNK_SIZE_FORMAT))
+    return {
+        "codec": CODEC_NAMES[codec],
+        "level": level,
+        "chunk_size": chunk_size,
+        "size": size,
+        "compressed_sizes": [size for (size,) in struct.iter_unpack(CHUNK_SIZE_FORMAT, table)],
+        "data_offset": offset + HEADER_SIZE + len(table),
+    }
+
+def read_chunks(file_path, offset=0, index=None):
+    """
+    This function decompresses a compressed image chunk by chunk and yields the decompressed chunks
+        Parameters:
+            file_path: path of the file
+            offset: offset of the compressed image in the file
+            index: index returned by read_index, read from the file by default
+    """
+    if index is None:
+        index = read_index(file_path, offset)
+        if index is None:
+            raise ValueError(f"{file_path} does not hold a compressed image at offset {offset}")
+    remaining = index["size"]
+    with open(file_path, "rb") as f:
+        f.seek(index["data_offset"])
+        for compressed_size in index["compressed_sizes"]:
+            chunk = decompress_chunk(index["codec"], f.read(compressed_size))
+            if len(chunk) != min(index["chunk_size"], remaining):
+                raise ValueError(f"{file_path} holds a damaged chunk of {len(chunk)} bytes")
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,164 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+#number of bytes given to one thread, big enough for the thread overhead to be negligible
+CHUNK_SIZE = 4 * 1024 * 1024
+
+#data shorter than this is checksummed right away instead of on the thread pool
+MIN_PARALLEL_SIZE = 64 * 1024
+
+#reflected CRC-32 polynomial used by zlib and by the PLDM checksums
+POLYNOMIAL = 0xedb88320
+
+def multiply_mod_p(a, b):
+    """
+    This function multiplies two polynomials modulo the CRC-32 polynomial, both in reflected bit order
+        Parameters:
+            a: first polynomial
+            b: second polynomial
+    """
+    m = 1 << 31
+    p = 0
+    while True:
+        if a & m:
+            p ^= b
+            if a & (m - 1) == 0:
+                break
+        m >>= 1
+        b = (b >> 1) ^ POLYNOMIAL if b & 1 else b >> 1
+    return p
+
+#x^(2^n) modulo the polynomial, the powers of x needed to shift a CRC by any number of bytes
+X2N_TABLE = [1 << 30]
+for _ in range(31):
+    X2N_TABLE.append(multiply_mod_p(X2N_TABLE[-1], X2N_TABLE[-1]))
+
+def x2n_mod_p(n, k):
+    """
+    This function returns x^(n * 2^k) modulo the polynomial
+        Parameters:
+            n: multiplier of the power
+            k: log2 of the unit of n, 3 for bytes
+    """
+    p = 1 << 31
+    while n:
+        if n & 1:
+            p = multiply_mod_p(X2N_TABLE[k & 31], p)
+        n >>= 1
+        k += 1
+    return p
+
+def crc32_combine(crc1, crc2, length2):
+    """
+    This function returns the CRC32 of two blocks placed one after the other from the CRC32 of each block, like
+    crc32_combine of zlib. It takes O(log length2) steps and never touches the data
+        Parameters:
+            crc1: CRC32 of the first block
+            crc2: CRC32 of the second block
+            length2: length of the second block in bytes
+    """
+    return multiply_mod_p(x2n_mod_p(length2, 3), crc1) ^ crc2
+
+def default_jobs():
+    """
+    This function returns the number of threads used when none is given
+    """
+    return os.cpu_count() or 1
+
+class ParallelCrc32:
+    """
+    Calculates the CRC32 of a stream of data on a thread pool. The data given to update is cut in chunks of
+    chunk_size bytes whose CRCs are calculated in parallel, zlib releases the GIL while it works, and combined in order
+    with crc32_combine. The number of chunks in flight is bounded, so memory does not grow with the size of the stream.
+    Data is not copied, it must not be modified until value is called.
+        crc = ParallelCrc32()
+        for chunk in chunks:
+            crc.update(chunk)
+        checksum = crc.value()
+    """
+    def __init__(self, jobs=None, chunk_size=CHUNK_SIZE):
+        self.jobs = jobs or default_jobs()
+        self.chunk_size = chunk_size
+        self.executor = None
+        #(future or CRC, length) of the chunks not combined yet, in the order of the stream
+        self.pending = []
+        self.checksum = 0
+
+    def update(self, data):
+        view = memoryview(data).cast("B")
+        for start in range(0, len(view), self.chunk_size):
+            piece = view[start:start + self.chunk_size]
+            if self.jobs == 1 or len(piece) < MIN_PARALLEL_SIZE:
+                self.pending.append((zlib.crc32(piece), len(piece)))
+            else:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.jobs)
+                self.pending.append((self.executor.submit(zlib.crc32, piece), len(piece)))
+            if len(self.pending) > 2 * self.jobs:
+                self.combine(len(self.pending) - self.jobs)
+
+    def combine(self, count):
+        for crc, length in self.pending[:count]:
+            if not isinstance(crc, int):
+                crc = crc.result()
+            self.checksum = crc32_combine(self.checksum, crc, length)
+        del self.pending[:count]
+
+    def value(self):
+        self.combine(len(self.pending))
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        return self.checksum
+
+def crc32(data, jobs=None):
+    """
+    This function returns the CRC32 of a bytes like object, calculated in parallel when it is large
+        Parameters:
+            data: bytes, bytearray or memoryview
+            jobs: number of threads, all the CPUs by default
+    """
+    if len(data) < 2 * CHUNK_SIZE:
+        return zlib.crc32(data)
+    crc = ParallelCrc32(jobs)
+    crc.update(data)
+    return crc.value()
+
+def read_crc(file_path, offset, size):
+    """
+    This function returns the CRC32 of a byte range of a file, reading it in one go
+        Parameters:
+            file_path: path of the file
+            offset: start of the range
+            size: length of the range
+    """
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        data = f.read(size)
+    if len(data) != size:
+        raise ValueError(f"{file_path} ends before offset {offset + size}")
+    return zlib.crc32(data)
+
+def crc32_ranges(ranges, jobs=None):
+    """
+    This function returns the CRC32 of byte ranges of files placed one after the other. Every range is cut in chunks
+    that are read and checksummed in parallel, so the ranges are never in memory as a whole
+        Parameters:
+            ranges: list of (file path, offset, size)
+            jobs: number of threads, all the CPUs by default
+    """
+    pieces = []
+    for file_path, offset, size in ranges:
+        for start in range(0, size, CHUNK_SIZE):
+            pieces.append((file_path, offset + start, min(CHUNK_SIZE, size - start)))
+    jobs = jobs or default_jobs()
+    checksum = 0
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        #results are consumed in order while later pieces are still being read
+        for (_, _, size), crc in zip(pieces, executor.map(lambda piece: read_crc(*piece), pieces)):
+            checksum = crc32_combine(checksum, crc, size)
+    return checksum
@@ -2,7 +2,6 @@
 # Licensed under the MIT License.
 
 import json 
-import zlib
 import argparse
 from pathlib import Path
 import random
@@ -16,6 +15,7 @@ sys.path.append(parent_dir)
 # Now you can import unpack.py
 from python import unpack
 from python import repack
+from python import crc
 
 
 
@@ -179,7 +179,7 @@ def main(file_path, error_file, spec_path):
     length_without_checksum = len(header_info)-4
     corrupted_data_without_Checksum = header_info[0:length_without_checksum]
     #calculate checksum of the corrupted data
-    correct_checksum = zlib.crc32(corrupted_data_without_Checksum)
+    correct_checksum = crc.crc32(corrupted_data_without_Checksum)
     correct_checksum_bytes =correct_checksum.to_bytes(4,"little")#convert to 4 bytes in little endian order
     #this is the corrupted data with correct checksum
     corrupted_data_correct_checksum = corrupted_data_without_Checksum + correct_checksum_bytes
@@ -0,0 +1,140 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import json
+import os
+
+#compact separators used by both streaming formats
+SEPARATORS = (",", ":")
+
+#record lists that are not kept in memory while streaming, only the images need their records afterwards
+STREAMED_RECORDS = ["FirmwareDeviceIDRecords", "DownstreamDeviceIDRecords"]
+
+class HeaderWriter:
+    """
+    Writes the decoded header piece by piece while it is being decoded. A piece is addressed by its path in the
+    header, e.g. ["FirmwareDeviceIdentificationArea", "FirmwareDeviceIDRecords", 3] for the 4th device record.
+    Pieces have to be written in the order of the header.
+        compact: a single compact json document, identical in content to header.json
+        ndjson: one [path, value] pair per line
+    file_path can also be a text file object, e.g. io.StringIO, it is left open by close
+    """
+    def __init__(self, file_path, header_format):
+        self.owns_file = isinstance(file_path, (str, os.PathLike))
+        self.file = open(file_path, "w") if self.owns_file else file_path
+        self.header_format = header_format
+        #keys and closing brackets of the containers that are currently open
+        self.open_path = []
+        self.closers = []
+        #whether the next item of each open container is its first one, the first entry is the root object
+        self.first = [True]
+        if header_format == "compact":
+            self.file.write("{")
+
+    def write(self, path, value):
+        if self.header_format == "ndjson":
+            self.file.write(json.dumps([path, value], separators=SEPARATORS) + "\n")
+            return
+        parents = path[:-1]
+        common = 0
+        while common < min(len(self.open_path), len(parents)) and self.open_path[common] == parents[common]:
+            common += 1
+        self.close_containers(common)
+        for depth in range(common, len(parents)):
+            self.write_key(parents[depth])
+            opener, closer = ("[", "]") if isinstance(path[depth + 1], int) else ("{", "}")
+            self.file.write(opener)
+            self.open_path.append(parents[depth])
+            self.closers.append(closer)
+            self.first.append(True)
+        self.write_key(path[-1])
+        self.file.write(json.dumps(value, separators=SEPARATORS))
+
+    def write_key(self, key):
+        if not self.first[-1]:
+            self.file.write(",")
+        self.first[-1] = False
+        #list entries have no key
+        if not isinstance(key, int):
+            self.file.write(json.dumps(key) + ":")
+
+    def close_containers(self, depth):
+        while len(self.open_path) > depth:
+            self.open_path.pop()
+            self.first.pop()
+            self.file.write(self.closers.pop())
+
+    def close(self):
+        if self.header_format == "compact":
+            self.close_containers(0)
+            self.file.write("}")
+        if self.owns_file:
+            self.file.close()
+
+def parse_header_lines(lines):
+    """
+    This function parses the lines of a header written in the ndjson format one piece at a time
+        Parameters:
+            lines: iterable of the lines
+    """
+    for line in lines:
+        if line.strip():
+            path, value = json.loads(line)
+            yield path, value
+
+def read_header_lines(file_path):
+    """
+    This function reads a header written in the ndjson format one piece at a time
+        Parameters:
+            file_path: path of header.ndjson
+    """
+    with open(file_path, "r") as f:
+        yield from parse_header_lines(f)
+
+def assign(output_dict, path, value):
+    """
+    This function stores a piece of the header at its path, creating the missing dictionaries and lists
+        Parameters:
+            output_dict: header dictionary
+            path: path of the piece
+            value: decoded value of the piece
+    """
+    node = output_dict
+    for key, next_key in zip(path, path[1:]):
+        if isinstance(node, list):
+            while len(node) <= key:
+                node.append(None)
+        if isinstance(node, dict) and key not in node or isinstance(node, list) and node[key] is None:
+            node[key] = [] if isinstance(next_key, int) else {}
+        node = node[key]
+    if isinstance(node, list):
+        while len(node) <= path[-1]:
+            node.append(None)
+    node[path[-1]] = value
+
+def load_header(file_path):
+    """
+    This function loads the whole header from a header.ndjson file
+        Parameters:
+            file_path: path of header.ndjson
+    """
+    output_dict = {}
+    for path, value in read_header_lines(file_path):
+        assign(output_dict, path, value)
+    return output_dict
+
+def update_header_lines(file_path, values):
+    """
+    This function replaces the values of some pieces of a header.ndjson file. The file is rewritten line by line
+        Parameters:
+            file_path: path of header.ndjson
+            values: dictionary of path tuple to new value
+    """
+    temp_path = str(file_path) + ".tmp"
+    with open(file_path, "r") as src, open(temp_path, "w") as dst:
+        for line in src:
+            path, value = json.loads(line)
+            if tuple(path) in values:
+                line = json.dumps([path, values[tuple(path)]], separators=SEPARATORS) + "\n"
+            dst.write(line)
+    os.replace(temp_path, file_path)
@@ -0,0 +1,227 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+import re
+import time
+import shutil
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import crc
+
+#output folders are flushed to the disk when they are published only when this is set, e.g. by --sync
+sync_output = False
+
+#staging folders older than this are left over by a run that crashed, when the process cannot be checked
+STALE_STAGING_AGE = 24 * 3600
+
+def scan_backups(folder, prefix):
+    """
+    This function returns the highest backup number of a prefix found in the folder, 0 when there is none. It reads
+    the folder once instead of probing every number
+        Parameters:
+            folder: folder of the backups
+            prefix: name of the backups without the number
+    """
+    pattern = re.compile(re.escape(prefix) + r"(\d+)")
+    highest = 0
+    for entry in os.scandir(folder):
+        match = pattern.fullmatch(entry.name)
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest
+
+def allocate_backup(folder, prefix):
+    """
+    This function returns the path of the next backup, e.g. unpack_backup_7. The folder is read once, nothing is
+    stored next to the backups
+        Parameters:
+            folder: folder of the backups
+            prefix: name of the backups without the number
+    """
+    return Path(folder) / f"{prefix}{scan_backups(folder, prefix) + 1}"
+
+def process_running(pid):
+    """
+    This function checks whether a process is running. It returns None when it cannot be checked, on Windows a signal
+    would end the process
+        Parameters:
+            pid: id of the process
+    """
+    if os.name == "nt":
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+def remove_stale_staging(folder, name):
+    """
+    This function removes the staging folders of an output folder left over by runs that crashed: the ones of
+    processes that are not running any more, or older than STALE_STAGING_AGE when that cannot be checked
+        Parameters:
+            folder: folder of the output folder
+            name: name of the output folder
+    """
+    pattern = re.compile(re.escape(f".{name}.tmp") + r"(\d+)")
+    for entry in os.scandir(folder):
+        match = pattern.fullmatch(entry.name)
+        if not match or not entry.is_dir() or int(match.group(1)) == os.getpid():
+            continue
+        running = process_running(int(match.group(1)))
+        if running is False or (running is None and time.time() - entry.stat().st_mtime > STALE_STAGING_AGE):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+def fsync_path(path):
+    """
+    This function flushes a file or a folder to the disk. Folders cannot be opened on Windows, they are skipped
+        Parameters:
+            path: file or folder
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        if os.path.isdir(path):
+            return
+        raise
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class OutputWriter:
+    """
+    Writes the files of an output folder, e.g. unpack, and publishes the folder once complete. The files are written
+    to a hidden staging folder next to it on a thread pool, the number of files in flight is bounded. publish waits for
+    them and renames the staging folder to the output folder, an existing output folder is renamed to its next backup
+    first. The output folder is never written halfway, but between the two renames it does not exist and a crash there
+    leaves only the backup and the staging folder. With sync, or sync_output set, the files are flushed to the disk
+    before the renames. Leaving the with block because of an error removes the staging folder, and the folder when the
+    writer created it, staging folders left by runs that crashed are removed by the next run.
+        with OutputWriter(folder, "unpack", "unpack_backup_") as writer:
+            writer.write("image.bin", data)
+            with open(writer.path("header.json"), "w") as f:
+                f.write(header)
+    """
+    def __init__(self, folder, name, backup_prefix=None, jobs=None, sync=None):
+        self.folder = Path(folder)
+        self.final_path = self.folder / name
+        self.backup_prefix = backup_prefix
+        self.jobs = jobs or crc.default_jobs()
+        self.sync = sync_output if sync is None else sync
+        #a folder created here is removed again by abort when it is left empty
+        self.created_folder = not self.folder.exists()
+        self.folder.mkdir(parents=True, exist_ok=True)
+        remove_stale_staging(self.folder, name)
+        self.staging_path = self.folder / f".{name}.tmp{os.getpid()}"
+        if self.staging_path.exists():
+            shutil.rmtree(self.staging_path)
+        self.staging_path.mkdir(parents=True)
+        self.executor = None
+        self.pending = []
+        #files of the staging folder, flushed to the disk by publish
+        self.files = []
+
+    def path(self, name):
+        """
+        This function returns the path of a file of the staging folder, for files written by the caller
+        """
+        file_path = self.staging_path / name
+        self.files.append(file_path)
+        return file_path
+
+    def write(self, name, data, encode=None):
+        """
+        This function writes a file in the background. Data is not copied, it must not be modified until publish.
+        encode, e.g. a compression, is applied to the data on the thread pool before it is written
+        """
+        file_path = self.path(name)
+        if self.jobs == 1:
+            write_file(file_path, data, encode)
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.jobs)
+        self.pending.append(self.executor.submit(write_file, file_path, data, encode))
+        if len(self.pending) > 2 * self.jobs:
+            self.wait(len(self.pending) - self.jobs)
+
+    def wait(self, count):
+        for future in self.pending[:count]:
+            future.result()
+        del self.pending[:count]
+
+    def publish(self):
+        """
+        This function waits for the files, flushes them to the disk with sync and renames the staging folder to the
+        output folder, see the class for when the output folder is briefly missing. It returns the path of the output
+        folder
+        """
+        self.wait(len(self.pending))
+        if self.sync:
+            if self.executor is not None and self.files:
+                list(self.executor.map(fsync_path, self.files))
+            else:
+                for file_path in self.files:
+                    fsync_path(file_path)
+            fsync_path(self.staging_path)
+        self.close()
+        if self.final_path.exists():
+            if self.backup_prefix is None:
+                raise FileExistsError(f"{self.final_path} already exists")
+            self.final_path.rename(allocate_backup(self.folder, self.backup_prefix))
+        os.replace(self.staging_path, self.final_path)
+        if self.sync:
+            fsync_path(self.folder)
+        return self.final_path
+
+    def abort(self):
+        """
+        This function drops the staging folder, the output folder is left as it is. The folder of the output folder is
+        removed when it was created by the writer and nothing else is in it
+        """
+        for future in self.pending:
+            future.cancel()
+        self.pending = []
+        self.close()
+        shutil.rmtree(self.staging_path, ignore_errors=True)
+        if self.created_folder:
+            try:
+                self.folder.rmdir()
+            except OSError:
+                pass
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.publish()
+        else:
+            self.abort()
+        return False
+
+def write_file(file_path, data, encode=None):
+    """
+    This function writes a bytes like object to a file
+        Parameters:
+            file_path: path of the file
+            data: content of the file
+            encode: function applied to the data before it is written, None to write it as it is
+    """
+    if encode is not None:
+        data = encode(data)
+    with open(file_path, "wb") as f:
+        f.write(data)
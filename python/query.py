@@ -0,0 +1,230 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import re
+import contextlib
+import argparse
+from pathlib import Path
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import unpack
+from python import range_source
+from spec import load_spec
+
+def parse_query(query):
+    """
+    This function splits a field path expression into its segments. A segment is a field name, an index or * for
+    every entry of a list
+        e.g. ComponentImageInformationArea.ComponentImageInformation[*].ComponentIdentifier
+        Parameters:
+            query: field path expression
+    """
+    segments = []
+    for part in query.split("."):
+        match = re.fullmatch(r"([^\[\]]+)((?:\[(?:\d+|\*)\])*)", part)
+        if not match:
+            raise ValueError(f"Invalid field path {query}")
+        segments.append(match.group(1))
+        for index in re.findall(r"\[(\d+|\*)\]", match.group(2)):
+            segments.append("*" if index == "*" else int(index))
+    return segments
+
+def find_field(spec_data, field_name, prefix=()):
+    """
+    This function finds the full paths of a field in the spec, lists are added as wildcards
+        Parameters:
+            spec_data: spec json or a part of it
+            field_name: name of the field
+            prefix: path of spec_data
+    """
+    paths = []
+    for name, info in spec_data.items():
+        if not isinstance(info, dict):
+            continue
+        path = prefix + (name,) + (("*",) if "count" in info else ())
+        if name == field_name:
+            paths.append(list(path))
+        elif "length" not in info:
+            paths.extend(find_field(info, field_name, path))
+    return paths
+
+def expand_query(spec_data, query):
+    """
+    This function turns a query into full field paths. A query not starting with a section of the spec is looked up by
+    the name of its first field, e.g. PackageVersionString or ComponentIdentifier
+        Parameters:
+            spec_data: spec json
+            query: field path expression
+    """
+    segments = parse_query(query)
+    if segments[0] in spec_data:
+        return [segments]
+    paths = find_field(spec_data, segments[0])
+    if not paths:
+        raise ValueError(f"Field {segments[0]} is not part of the spec")
+    return [path + segments[1:] for path in paths]
+
+def wanted(paths, prefix):
+    """
+    This function checks whether any of the paths goes through prefix
+        Parameters:
+            paths: expanded field paths
+            prefix: path of a part of the header
+    """
+    for path in paths:
+        if all(p == "*" or q == "*" or p == q for p, q in zip(path, prefix)):
+            return True
+    return False
+
+def decode_header(firmware_data, spec_data, paths):
+    """
+    This function decodes only the parts of the header needed to reach the paths. Records that are not needed are
+    skipped using their own length field and decoding stops after the last needed section
+        Parameters:
+            firmware_data: header bytes
+            spec_data: spec json
+            paths: expanded field paths
+    """
+    output_dict = {}
+    offset = 0
+    sections = list(spec_data)
+    last_section = max(sections.index(path[0]) for path in paths)
+    #ApplicableComponents length is in PackageHeaderInformation, it is always decoded
+    for section_name in sections[:last_section + 1]:
+        section_info = spec_data[section_name]
+        if "length" in section_info:
+            #top level fields are taken as they are, unpack replaces PackageHeaderChecksum with the calculated one
+            data_length = section_info["length"]
+            output_dict[section_name] = unpack.parse_field(firmware_data[offset:offset + data_length], section_info["data_type"])
+            offset += data_length
+            continue
+        if not any(isinstance(v, dict) and "count" in v for v in section_info.values()):
+            offset = unpack.search(firmware_data, {section_name: section_info}, output_dict, offset)
+            continue
+        output_dict[section_name] = section_dict = {}
+        for field_name, field_info in section_info.items():
+            if not (isinstance(field_info, dict) and "count" in field_info):
+                offset = unpack.search(firmware_data, {field_name: field_info}, section_dict, offset)
+                continue
+            record_json_data = {k: v for k, v in field_info.items() if k != "count"}
+            #records starting with their own length can be skipped without decoding them
+            first_field = next(iter(record_json_data))
+            length_prefixed = first_field.endswith("RecordLength") and isinstance(record_json_data[first_field]["length"], int)
+            records = section_dict[field_name] = []
+            for i in range(section_dict[field_info["count"]]):
+                if wanted(paths, [section_name, field_name, i]) or not length_prefixed:
+                    record = {}
+                    end = unpack.search(firmware_data, record_json_data, record, offset)
+                    if length_prefixed and end - offset != record[first_field]:
+                        raise ValueError(f"{field_name}[{i}] decodes to {end - offset} bytes but {first_field} is {record[first_field]}")
+                    records.append(record)
+                    offset = end
+                else:
+                    length = record_json_data[first_field]["length"]
+                    records.append(None)
+                    offset += int.from_bytes(firmware_data[offset:offset + length], "little")
+    return output_dict
+
+def select(node, path, prefix=""):
+    """
+    This function returns the (field path, value) pairs matching a path in the decoded header
+        Parameters:
+            node: decoded header or a part of it
+            path: remaining segments of the path
+            prefix: text of the segments already matched
+    """
+    if not path:
+        return [(prefix, node)]
+    segment, rest = path[0], path[1:]
+    if segment == "*":
+        return [match for i, entry in enumerate(node or []) for match in select(entry, rest, f"{prefix}[{i}]")]
+    if isinstance(segment, int):
+        return select(node[segment], rest, f"{prefix}[{segment}]") if node and segment < len(node) else []
+    if not isinstance(node, dict) or segment not in node:
+        return []
+    return select(node[segment], rest, f"{prefix}.{segment}" if prefix else segment)
+
+def read_header_bytes(file_path):
+    """
+    This function reads only the header bytes of a local package, see range_source.read_header_bytes
+        Parameters:
+            file_path: path of the package
+    """
+    with contextlib.closing(range_source.FileRangeSource(file_path)) as source:
+        return range_source.read_header_bytes(source)
+
+def read_header(file_path, spec_path, paths):
+    """
+    This function decodes the parts of the header of a package needed to reach the paths. Only the header bytes are
+    read from the package
+        Parameters:
+            file_path: path of the package
+            spec_path: version of the spec
+            paths: expanded field paths
+    """
+    spec_data = load_spec(spec_path)
+    firmware_data = read_header_bytes(file_path)
+    output_dict = decode_header(firmware_data, spec_data, paths)
+    #unpack keeps the decoded bytes for the header checksum, it is not needed here
+    unpack.header_checksum_data = b""
+    return output_dict
+
+def read_package(file_path, spec_path):
+    """
+    This function decodes the whole header of a package, only the header bytes are read. It returns the decoded header
+    and whether the header checksum matches
+        Parameters:
+            file_path: path of the package
+            spec_path: version of the spec
+    """
+    output_dict = {}
+    unpack.header_checksum_data = b""
+    #unpack prints the header checksums of every package
+    with contextlib.redirect_stdout(io.StringIO()):
+        unpack.search(read_header_bytes(file_path), load_spec(spec_path), output_dict, 0)
+    unpack.header_checksum_data = b""
+    return output_dict, unpack.CRC_Match
+
+def query(file_path, spec_path, queries):
+    """
+    This function returns the (field path, value) pairs of a package matching the queries. Only the header bytes are
+    read from the package
+        Parameters:
+            file_path: path of the package
+            spec_path: version of the spec
+            queries: field path expressions
+    """
+    spec_data = load_spec(spec_path)
+    paths = [path for q in queries for path in expand_query(spec_data, q)]
+    output_dict = read_header(file_path, spec_path, paths)
+    return [match for path in paths for match in select(output_dict, path)]
+
+def main(file_path, spec_path, queries):
+    """
+    This function prints the values matching the queries for a package or for every package of a folder
+        Parameters:
+            file_path: package or folder of packages
+            spec_path: version of the spec
+            queries: field path expressions
+    """
+    path = Path(file_path)
+    packages = sorted(path.glob("*.fwpkg")) if path.is_dir() else [path]
+    for package in packages:
+        for field_path, value in query(package, spec_path, queries):
+            print(f"{package}: {field_path} = {value}" if path.is_dir() else f"{field_path} = {value}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    #take fwpkg file name or a folder of fwpkg files
+    parser.add_argument("-F", "--fwpkg-file-path", help="PLDM FW update package or folder of packages", dest="fwpkg_file_path", required=True)
+    #take the spec version
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0")
+    #take the field paths
+    parser.add_argument("-Q", "--query", help="Field path to print, e.g. ComponentImageInformationArea.ComponentImageInformation[*].ComponentIdentifier", dest="query", action="append", required=True)
+    args = parser.parse_args()
+    main(args.fwpkg_file_path, args.spec_path, args.query)
@@ -0,0 +1,337 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import re
+import argparse
+import email.utils
+import threading
+import http.client
+from pathlib import Path
+from collections import OrderedDict
+from urllib.parse import urlsplit, unquote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+
+#offset and length of PackageHeaderSize, fixed in all the versions of the spec
+HEADER_SIZE_OFFSET = 17
+HEADER_SIZE_LENGTH = 2
+
+#bytes fetched by one request when a large range is streamed
+CHUNK_SIZE = 4 * 1024 * 1024
+
+#ranges separated by at most this many bytes are fetched by the same requests, the gap is read and dropped
+COALESCE_GAP = 64 * 1024
+
+#small reads, e.g. the fields at the start of the header, are served from blocks of this size
+CACHE_BLOCK_SIZE = 16 * 1024
+
+#number of blocks kept by the block cache
+CACHE_BLOCKS = 64
+
+def is_url(location):
+    """
+    This function checks whether a package location is an http or https url
+        Parameters:
+            location: path or url of the package
+    """
+    return isinstance(location, str) and re.match(r"https?://", location) is not None
+
+class FileRangeSource:
+    """
+    Reads byte ranges of a local package
+    """
+    def __init__(self, file_path):
+        self.name = str(file_path)
+        self.file = open(file_path, "rb")
+        stat = os.fstat(self.file.fileno())
+        self.size = stat.st_size
+        self.mtime = int(stat.st_mtime)
+        self.requests = 0
+        self.bytes_read = 0
+
+    def read(self, offset, size):
+        self.file.seek(offset)
+        data = self.file.read(size)
+        self.requests += 1
+        self.bytes_read += len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+class HttpRangeSource:
+    """
+    Reads byte ranges of a package on an http server with Range requests over one kept alive connection. The size of
+    the package is taken from the Content-Range of the answers and its modification time from the Last-Modified, they
+    are None until the first read. A server answering with the whole package instead of the range is rejected, nothing
+    more than the range is transferred
+    """
+    def __init__(self, url, timeout=30):
+        self.name = url
+        parts = urlsplit(url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.netloc = parts.netloc
+        self.target = parts.path + ("?" + parts.query if parts.query else "")
+        self.timeout = timeout
+        self.connection = None
+        self.size = None
+        self.mtime = None
+        self.requests = 0
+        self.bytes_read = 0
+
+    def request(self, offset, size):
+        if self.connection is None:
+            self.connection = self.connection_class(self.netloc, timeout=self.timeout)
+        self.connection.request("GET", self.target, headers={"Range": f"bytes={offset}-{offset + size - 1}"})
+        return self.connection.getresponse()
+
+    def read(self, offset, size):
+        if self.size is not None:
+            size = min(size, self.size - offset)
+        if size <= 0:
+            return b""
+        try:
+            response = self.request(offset, size)
+        except (http.client.RemoteDisconnected, ConnectionError):
+            #the server closed the kept alive connection, try once more on a new one
+            self.close()
+            response = self.request(offset, size)
+        if response.status == 416:
+            response.read()
+            return b""
+        if response.status != 206:
+            self.close()
+            raise ValueError(f"{self.name} answered a range request with status {response.status}, the server has to support Range requests")
+        match = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+|\*)", response.getheader("Content-Range", ""))
+        if match is None or int(match.group(1)) != offset:
+            self.close()
+            raise ValueError(f"{self.name} answered bytes {offset}- with Content-Range {response.getheader('Content-Range')}")
+        if match.group(3) != "*":
+            self.size = int(match.group(3))
+        if self.mtime is None and response.getheader("Last-Modified"):
+            try:
+                self.mtime = int(email.utils.parsedate_to_datetime(response.getheader("Last-Modified")).timestamp())
+            except (TypeError, ValueError):
+                pass
+        data = response.read()
+        self.requests += 1
+        self.bytes_read += len(data)
+        return data
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+class CachedRangeSource:
+    """
+    Serves the small reads of a range source from an LRU cache of blocks, e.g. the fixed fields of the header and then
+    the rest of the header come from the same request. The blocks missing for a read are fetched by one request.
+    Reads of at least a block are passed to the source as they are
+    """
+    def __init__(self, source, block_size=CACHE_BLOCK_SIZE, cache_blocks=CACHE_BLOCKS):
+        self.source = source
+        self.name = source.name
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.cache = OrderedDict()
+
+    @property
+    def size(self):
+        return self.source.size
+
+    @property
+    def mtime(self):
+        return self.source.mtime
+
+    @property
+    def requests(self):
+        return self.source.requests
+
+    @property
+    def bytes_read(self):
+        return self.source.bytes_read
+
+    def read(self, offset, size):
+        if size >= self.block_size:
+            return self.source.read(offset, size)
+        first = offset // self.block_size
+        last = (offset + size - 1) // self.block_size
+        missing = [number for number in range(first, last + 1) if number not in self.cache]
+        if missing:
+            data = self.source.read(missing[0] * self.block_size, (missing[-1] - missing[0] + 1) * self.block_size)
+            for number in missing:
+                start = (number - missing[0]) * self.block_size
+                self.cache[number] = data[start:start + self.block_size]
+        chunks = []
+        for number in range(first, last + 1):
+            self.cache.move_to_end(number)
+            block_start = number * self.block_size
+            chunks.append(self.cache[number][max(offset - block_start, 0):offset + size - block_start])
+        while len(self.cache) > self.cache_blocks:
+            self.cache.popitem(last=False)
+        return b"".join(chunks)
+
+    def close(self):
+        self.source.close()
+
+def open_source(location):
+    """
+    This function opens a package for range reads, an http or https url or a local file, with a block cache
+        Parameters:
+            location: url or path of the package
+    """
+    return CachedRangeSource(HttpRangeSource(location) if is_url(location) else FileRangeSource(location))
+
+def read_header_bytes(source):
+    """
+    This function reads only the header bytes of a package from a range source, their number is given by
+    PackageHeaderSize
+        Parameters:
+            source: range source
+    """
+    firmware_data = source.read(0, HEADER_SIZE_OFFSET + HEADER_SIZE_LENGTH)
+    header_size = int.from_bytes(firmware_data[HEADER_SIZE_OFFSET:], "little")
+    return firmware_data + source.read(len(firmware_data), max(header_size - len(firmware_data), 0))
+
+def coalesce(ranges, max_gap=COALESCE_GAP):
+    """
+    This function groups byte ranges that touch or are at most max_gap bytes apart. It returns (start, end, indexes of
+    the ranges) for every group, in the order of the package
+        Parameters:
+            ranges: list of (offset, size)
+            max_gap: largest gap between two ranges fetched together
+    """
+    groups = []
+    for i in sorted(range(len(ranges)), key=lambda i: ranges[i][0]):
+        offset, size = ranges[i]
+        if size <= 0:
+            continue
+        if groups and offset <= groups[-1][1] + max_gap:
+            groups[-1][1] = max(groups[-1][1], offset + size)
+            groups[-1][2].append(i)
+        else:
+            groups.append([offset, offset + size, [i]])
+    return [tuple(group) for group in groups]
+
+def fetch_ranges(source, ranges, chunk_size=CHUNK_SIZE, max_gap=COALESCE_GAP):
+    """
+    This function fetches byte ranges of a package and yields (index of the range, chunk) with the chunks of every
+    range in order. Ranges close to each other are fetched by the same requests and large ranges are fetched in
+    chunk_size pieces, so they are never in memory as a whole
+        Parameters:
+            source: range source
+            ranges: list of (offset, size)
+            chunk_size: largest number of bytes fetched by one request
+            max_gap: largest gap between two ranges fetched together
+    """
+    for start, end, members in coalesce(ranges, max_gap):
+        for piece_start in range(start, end, chunk_size):
+            piece_end = min(piece_start + chunk_size, end)
+            data = source.read(piece_start, piece_end - piece_start)
+            if len(data) != piece_end - piece_start:
+                raise ValueError(f"{source.name} ended at {piece_start + len(data)}, before offset {piece_end}")
+            view = memoryview(data)
+            for i in members:
+                offset, size = ranges[i]
+                first, last = max(offset, piece_start), min(offset + size, piece_end)
+                if first < last:
+                    yield i, view[first - piece_start:last - piece_start]
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the files of a folder with support for single Range requests, a local stand-in for an artifact server
+    """
+    protocol_version = "HTTP/1.1"
+    folder = Path(".")
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.send_file(False)
+
+    def do_GET(self):
+        self.send_file(True)
+
+    def send_file(self, send_body):
+        folder = Path(self.folder).resolve()
+        file_path = (folder / unquote(urlsplit(self.path).path).lstrip("/")).resolve()
+        if folder not in file_path.parents or not file_path.is_file():
+            self.send_error(404)
+            return
+        stat = file_path.stat()
+        size = stat.st_size
+        start, end = 0, size - 1
+        range_header = self.headers.get("Range")
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip()) if range_header else None
+        if match and (match.group(1) or match.group(2)):
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            else:
+                start = max(size - int(match.group(2)), 0)
+            if start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Last-Modified", email.utils.formatdate(stat.st_mtime, usegmt=True))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if send_body:
+            with open(file_path, "rb") as f:
+                f.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = f.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+
+def start_server(folder, port=0, host="127.0.0.1"):
+    """
+    This function serves a folder with range support on a background thread. It returns the server and its url,
+    stop it with server.shutdown()
+        Parameters:
+            folder: folder of the packages
+            port: port of the server, a free one by default
+            host: address the server listens on
+    """
+    handler = type("FolderRangeRequestHandler", (RangeRequestHandler,), {"folder": Path(folder)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/"
+
+def main(folder, port, host="127.0.0.1"):
+    """
+    This function serves the packages of a folder with range support until it is interrupted
+        Parameters:
+            folder: folder of the packages
+            port: port of the server
+            host: address the server listens on
+    """
+    server, url = start_server(folder, port, host)
+    print(f"Serving {os.path.abspath(folder)} at {url}. Press Ctrl+C to stop.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("Stopped serving.")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-F", "--folder", help="Folder of the packages to serve", dest="folder", required=True)
+    parser.add_argument("-P", "--port", help="Port of the server", dest="port", type=int, default=8000)
+    parser.add_argument("--host", help="Address the server listens on", default="127.0.0.1")
+    args = parser.parse_args()
+    main(args.folder, args.port, args.host)
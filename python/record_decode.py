@@ -0,0 +1,126 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+
+#first field of the device records, the length of the whole record
+RECORD_LENGTH_FIELDS = ["RecordLength", "DownstreamDeviceRecordLength"]
+RECORD_LENGTH_SIZE = 2
+
+#record tables smaller than this are decoded in the calling process, starting the workers would take longer than
+#decoding them. PackageHeaderSize is 16 bits, so the tables of a compliant package stay below 64 KB
+PARALLEL_MIN_SIZE = 32 * 1024
+
+#number of batches given to every worker, more batches balance records of different sizes better
+BATCHES_PER_JOB = 4
+
+#record table and spec of the records of the worker process, set once by init_worker
+worker_state = {}
+
+def has_record_length(record_json_data):
+    """
+    This function checks whether the records of a spec start with the length of the record
+        Parameters:
+            record_json_data: spec of one record, without count
+    """
+    first_name, first_info = next(iter(record_json_data.items()))
+    return first_name in RECORD_LENGTH_FIELDS and first_info.get("length") == RECORD_LENGTH_SIZE and first_info.get("data_type") == "int"
+
+def record_boundaries(firmware_data, offset, count):
+    """
+    This function finds where the records of a table start by reading only their length fields. It returns the
+    offsets of the records followed by the end of the table, None when a length cannot be right
+        Parameters:
+            firmware_data: PLDM firmware package
+            offset: offset of the first record
+            count: number of records
+    """
+    boundaries = [offset]
+    for _ in range(count):
+        length = int.from_bytes(firmware_data[offset:offset + RECORD_LENGTH_SIZE], "little")
+        if length < RECORD_LENGTH_SIZE or offset + length > len(firmware_data):
+            return None
+        offset += length
+        boundaries.append(offset)
+    return boundaries
+
+def init_worker(table_data, record_json_data, bitmap_bit_length):
+    """
+    This function prepares a worker process, the record table is sent once instead of with every batch
+        Parameters:
+            table_data: bytes of the record table
+            record_json_data: spec of one record
+            bitmap_bit_length: ComponentBitmapBitLength of the package, for the ApplicableComponents fields
+    """
+    from python import unpack
+    unpack.info = {"ComponentBitmapBitLength": bitmap_bit_length}
+    worker_state["table_data"] = table_data
+    worker_state["record_json_data"] = record_json_data
+
+def decode_batch(batch):
+    """
+    This function decodes consecutive records in a worker process. It returns the decoded records, or the index of
+    the first record whose decoded size does not match its length field
+        Parameters:
+            batch: list of (index, start, end) of the records in the record table
+    """
+    from python import unpack
+    records = []
+    for index, start, end in batch:
+        record = {}
+        unpack.header_checksum_data = b""
+        try:
+            stop = unpack.search(worker_state["table_data"], worker_state["record_json_data"], record, start)
+        except (KeyError, ValueError, IndexError, TypeError, UnicodeDecodeError):
+            return index
+        if stop != end:
+            return index
+        records.append(record)
+    unpack.header_checksum_data = b""
+    return records
+
+def decode_records(firmware_data, record_json_data, offset, count, bitmap_bit_length, jobs=None):
+    """
+    This function decodes a table of device records on worker processes. The records are found with a scan of their
+    length fields, decoded in batches in parallel and put back in order. Every decoded record has to end where the
+    scan expects the next one to start. It returns the records and the end of the table, None when fewer than two
+    jobs are asked for, the table is too small to be worth it, the scan does not match the decoding or the worker
+    processes cannot be started, the table is then decoded sequentially
+        Parameters:
+            firmware_data: PLDM firmware package
+            record_json_data: spec of one record, without count
+            offset: offset of the first record
+            count: number of records
+            bitmap_bit_length: ComponentBitmapBitLength of the package
+            jobs: number of worker processes, None or 1 to decode sequentially
+    """
+    if jobs is None or jobs < 2 or count < 2 or not has_record_length(record_json_data):
+        return None
+    boundaries = record_boundaries(firmware_data, offset, count)
+    if boundaries is None or boundaries[-1] - offset < PARALLEL_MIN_SIZE:
+        return None
+    #the workers get only the record table, the offsets are made relative to it
+    table_data = bytes(firmware_data[offset:boundaries[-1]])
+    spans = [(i, boundaries[i] - offset, boundaries[i + 1] - offset) for i in range(count)]
+    batch_count = min(count, jobs * BATCHES_PER_JOB)
+    batches = [spans[i * count // batch_count:(i + 1) * count // batch_count] for i in range(batch_count)]
+    records = []
+    try:
+        with ProcessPoolExecutor(max_workers=min(jobs, batch_count), initializer=init_worker, initargs=(table_data, record_json_data, bitmap_bit_length)) as executor:
+            for result in executor.map(decode_batch, batches):
+                if isinstance(result, int):
+                    print(f"Record {result} does not match its length field, the records are decoded sequentially")
+                    executor.shutdown(cancel_futures=True)
+                    return None
+                records += result
+    except (BrokenProcessPool, OSError) as error:
+        print(f"The worker processes failed ({error!r}), the records are decoded sequentially")
+        return None
+    return records, boundaries[-1]
@@ -4,18 +4,41 @@
 import json
 import struct
 from datetime import datetime
-import binascii
 import operator
 import argparse
 from pathlib import Path
-import os
 import re
 import zlib
+import hashlib
+import tarfile
 from functools import reduce
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from spec import load_spec
+from python import header_stream
+from python import crc
+from python import output_writer
+from python import compressed_image
 
 info = {}
 output_dict = {}
 
+#compiled specs by field names and ids of the spec entries, see compile_spec
+compiled_specs = {}
+
+#number of bytes read at a time when streaming component images
+CHUNK_SIZE = 1024 * 1024
+
+#records that start with their own length
+RECORD_LENGTH_FIELDS = {
+    "FirmwareDeviceIdentificationArea": ("FirmwareDeviceIDRecords", "RecordLength"),
+    "DownstreamDeviceIdentificationArea": ("DownstreamDeviceIDRecords", "DownstreamDeviceRecordLength"),
+}
+
 def encode_timestamp(value):
     """
     This function is used to encode timestamp. The timestamp is formatted as series of 13 bytes defined in DSP0240 specification.
@@ -49,251 +72,664 @@ def encode_timestamp(value):
 
     return packed
 
+def write_int(buffer, offset, value, data_length):
+    """
+    This function writes a little endian integer field into the header buffer
+    """
+    if data_length in INT_FORMATS:
+        struct.pack_into(INT_FORMATS[data_length], buffer, offset, value)
+    else:
+        buffer[offset:offset + data_length] = value.to_bytes(data_length, "little")
+
+def write_hex_le(buffer, offset, value, data_length):
+    """
+    This function writes a hexadecimal string as a little endian field into the header buffer
+    """
+    write_int(buffer, offset, int(value, 16), data_length)
+
+def write_hex_be(buffer, offset, value, data_length):
+    """
+    This function writes a hexadecimal string as a big endian field into the header buffer
+    """
+    buffer[offset:offset + data_length] = int(value, 16).to_bytes(data_length, "big")
+
+def write_timestamp(buffer, offset, value, data_length):
+    """
+    This function writes a PackageReleaseDateTime string into the header buffer
+    """
+    buffer[offset:offset + data_length] = encode_timestamp(value)
+
+def write_bytes(buffer, offset, value, data_length):
+    """
+    This function writes already encoded bytes into the header buffer
+    """
+    buffer[offset:offset + data_length] = value
+
+#struct formats of the integer sizes that can be packed directly
+INT_FORMATS = {1: "<B", 2: "<H", 4: "<I", 8: "<Q"}
+
+#encoder table: data type -> (size of the field, writer). The size is a fixed number of bytes or None for the
+#length of the field in the spec
+ENCODERS = {
+    "int": (None, write_int),
+    "hex-le": (None, write_hex_le),
+    "hex-be": (None, write_hex_be),
+    "UUID": (16, write_hex_be),
+    "timestamp": (13, write_timestamp),
+}
+
+#string data types and their codec, strings are encoded while the header is sized
+STRING_CODECS = {"ASCII": "utf-8", "UTF8": "utf-8", "UTF16": "utf-16", "UTF16LE": "utf-16le", "UTF16BE": "utf-16be"}
+
+#operators allowed in the length and count expressions of the spec
+OPERATORS = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
+
 def encode_data(value,data_type,data_length):
     """
-    This function encodes the data to hex or int and then convert it into bytes object
+    This function encodes a single value to bytes using the encoder table
         Parameters:
-            data: Extracted firmware data for a particular field 
+            value: decoded value of the field
             data_type: data types(hex,int,ASCII)
             data_length: length of the field
     """
-    if isinstance(value,int):
-        return struct.pack(f"{data_length}s", value.to_bytes(data_length, "little"))
-    if isinstance(value,str):
-        if data_type == "hex-le":
-            if not value:
-                return b''
+    ops = []
+    add_op(ops, value, data_type, data_length, None)
+    return run_ops(ops)[0]
+
+def encoder_for(value, data_type, data_length, field_name=None):
+    """
+    This function picks the encoder of a value and returns the size of the encoded value with its writer. Strings and
+    unknown data types are returned already encoded with write_bytes
+        Parameters:
+            value: decoded value of the field
+            data_type: data type of the field
+            data_length: length of the field
+            field_name: name of the field, for the error message
+    """
+    if isinstance(value, int):
+        return data_length, write_int
+    if data_type in ENCODERS and isinstance(value, str):
+        if data_type == "hex-le" and not value:
+            return 0, write_bytes
+        size, writer = ENCODERS[data_type]
+        return (data_length if size is None else size), writer
+    raise TypeError(f"{field_name or 'Field'} of data type {data_type} and length {data_length} cannot be encoded from a {type(value).__name__} value {value!r}")
+
+def compile_length(length):
+    """
+    This function turns the length or count of a spec field into a function of the decoded values. It is called once
+    per spec field when the spec is compiled
+        Parameters:
+            length: length or count from the spec, a number, a field name or an expression of them
+    """
+    if isinstance(length, int):
+        return lambda output_dict: length
+    if length == "ComponentBitmapBitLength":
+        #the bitmap length is in PackageHeaderInformation, a different level of the dictionary
+        return lambda output_dict: int(info["ComponentBitmapBitLength"]/8)
+    for op in OPERATORS:
+        if op in length:
+            function = OPERATORS[op]
+            parts = length.split(op)
+            def evaluate(output_dict):
+                return reduce(function, [int(part) if part.isdigit() else output_dict[part] for part in parts])
+            return evaluate
+    return lambda output_dict: output_dict[length]
+
+def compile_spec(input_json_data):
+    """
+    This function compiles a spec into a list of nodes once, the nodes are reused for every header encoded with it
+        ("field", name, length, data_type)
+        ("decode", name, length, data_type, decode, keys by decoded value)
+        ("vendor", name, length, data_type, vendor defined nodes)
+        ("indirect", name, length, field holding the data type, decode)
+        ("count", name, count, nodes encoded once before the repeated nodes, repeated nodes)
+        ("section", name, nodes)
+        Parameters:
+            input_json_data: spec json or a part of it
+    """
+    #parts of the spec are often wrapped in a new dictionary, e.g. {field_name: field_info}, so the key is built from
+    #the field names and the ids of their spec entries, which are kept alive by the cache
+    key = tuple((k, id(v)) for k, v in input_json_data.items())
+    if key in compiled_specs:
+        return compiled_specs[key][1]
+    nodes = []
+    for field_name, field_info in input_json_data.items():
+        if not isinstance(field_info, dict):
+            continue
+        if "decode" in field_info:
+            decode = field_info["decode"]
+            if isinstance(field_info["length"], int):
+                keys = {}
+                for k, v in decode.items():
+                    keys.setdefault(v, k)
+                nodes.append(("decode", field_name, compile_length(field_info["length"]), field_info["data_type"], decode, keys))
+            elif "Vendor Defined" in decode:
+                nodes.append(("vendor", field_name, compile_length(field_info["length"]), field_info["data_type"], compile_spec(decode["Vendor Defined"])))
             else:
-                int_value = int(value,16) #convert hexadecimal string into an integer
-                # packs the hexadecimal value into a binary string using the struct module
-                return struct.pack(f"{data_length}s", int_value.to_bytes(data_length, "little"))
-        elif data_type == 'hex-be':
-            value = int(value, 16)
-            byte_data = value.to_bytes(data_length, byteorder='big')
-            return struct.pack(f"{data_length}s", byte_data)
-        elif data_type == 'UUID':
-            hex_str = int(value, 16)
-            data = hex_str.to_bytes(16, byteorder='big')  # UUIDs are 16 bytes
-            return data
-        elif data_type == "timestamp":
-            return encode_timestamp(value)
-        elif data_type == "ASCII":
-            hex_string = binascii.hexlify(value.encode()).decode() 
-            return bytes.fromhex(hex_string)
-        elif data_type == "UTF8":
-            hex_string = binascii.hexlify(value.encode('utf-8')).decode('utf-8') 
-            return bytes.fromhex(hex_string)
-        elif data_type == "UTF16":
-            hex_string = binascii.hexlify(value.encode('utf-8')).decode('utf-16') 
-            return bytes.fromhex(hex_string)
-        elif data_type == "UTF16LE":
-            hex_string = binascii.hexlify(value.encode('utf-16le')).decode('utf-16le') 
-            return bytes.fromhex(hex_string)
-        elif data_type == "UTF16BE":
-            hex_string = binascii.hexlify(value.encode('utf-16be')).decode('utf-16be') 
-            return bytes.fromhex(hex_string)
+                nodes.append(("indirect", field_name, compile_length(field_info["length"]), field_info["data_type"], decode))
+        elif "length" in field_info:
+            nodes.append(("field", field_name, compile_length(field_info["length"]), field_info["data_type"]))
+        elif "count" in field_info:
+            fields = [k for k in field_info if k != "count"]
+            count_index = list(field_info).index("count")
+            precount = {k: field_info[k] for k in fields[:count_index]}
+            repeated = {k: field_info[k] for k in fields[count_index:]}
+            nodes.append(("count", field_name, compile_length(field_info["count"]), compile_spec(precount) if precount else None, compile_spec(repeated)))
         else:
-            return str(value).encode()
- 
+            nodes.append(("section", field_name, compile_spec(field_info)))
+    compiled_specs[key] = (list(input_json_data.values()), nodes)
+    return nodes
 
-def process(firmware_data,output_dict,field_name,data_length,data_type):
+def plan(nodes, output_dict, ops):
     """
-    This function extracts the value from output dicitonary and then passes it to the encode_data function  
-    firmware data
+    This function walks the compiled spec with the decoded values and appends one (writer, value, size, field name)
+    operation per encoded field. Nothing is written yet, the sum of the sizes is the size of the header
         Parameters:
-            firmware_data: PLDM firmware package
-            output_dict: output dicitionary with all the decoded values
-            field name :current field
-            data_length: length of field extarcted from spec folder
-            data_type: data_type of field extracted from spec folder
-    """
-    operators = ["+", "-", "*", "/"]
-    functions = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
-    #When the length field has +,-,/,*
-    if isinstance(data_length, str):
-        for op in operators:
-            if op in data_length:
-                parts = data_length.split(op)
-                converted_parts = [int(part) if part.isdigit() else output_dict[part] for part in parts]
-                data_length = reduce(functions[op], converted_parts)
-                break
+            nodes: compiled spec
+            output_dict: dictionary with the decoded values
+            ops: list of operations
+    """
+    global info
+    for node in nodes:
+        kind, field_name = node[0], node[1]
+        if kind == "field":
+            if field_name in output_dict:
+                data_type = node[3]
+                #data type can be in another field, e.g. PackageVersionStringType
+                if data_type in output_dict:
+                    data_type = output_dict[data_type]
+                add_op(ops, output_dict[field_name], data_type, node[2](output_dict), field_name)
+        elif kind == "decode":
+            value = output_dict[field_name]
+            if value not in node[5]:
+                raise ValueError(f"{value} is not a valid value of {field_name}")
+            add_op(ops, node[5][value], node[3], node[2](output_dict), field_name)
+        elif kind == "indirect":
+            #data_type and data_length are indirect
+            data_type = node[4][str(output_dict[node[3]])]
+            add_op(ops, output_dict[field_name], data_type, node[2](output_dict), field_name)
+        elif kind == "vendor":
+            data_length = node[2](output_dict)
+            if output_dict["AdditionalDescriptorType"] == "Vendor Defined":
+                vendor_ops = []
+                plan(node[4], output_dict, vendor_ops)
+                if sum(op[2] for op in vendor_ops) > data_length:
+                    #vendor data longer than the descriptor length is cut
+                    vendor_data = run_ops(vendor_ops)[0][:data_length]
+                    ops.append((write_bytes, vendor_data, len(vendor_data), field_name))
+                else:
+                    ops.extend(vendor_ops)
+            else:
+                add_op(ops, output_dict[field_name], node[3], data_length, field_name)
+        elif kind == "count":
+            count = node[2](output_dict)
+            entries = output_dict.get(field_name, [])
+            first = 0
+            if node[3] is not None:
+                #elements before count are encoded once, together with the first entry
+                plan(node[3], entries[0], ops)
+                first = 1
+            for i in range(first, count):
+                plan(node[4], entries[i], ops)
         else:
-            data_length = output_dict[data_length]
-
-    # for field name exist
-    if field_name in output_dict:
-        value = output_dict[field_name]
-        packedData = encode_data(value,data_type,data_length)
-        #adding the encoded data to firmware data
-        firmware_data +=packedData
-        return firmware_data
-    else:
-        return firmware_data
+            plan(node[2], output_dict[field_name], ops)
+        #for applicable component field as value of length is present in another fields which is on a different level
+        if field_name == "PackageVersionString":
+            info = output_dict
+    return ops
 
-def process_count(firmware_data, output_dict, field_name, input_json_data, count_field):
+def add_op(ops, value, data_type, data_length, field_name):
     """
-    This function is for the fields having multiple instances in the firmware data eg records and descriptors 
-    Parameters:
-        firmware_data: PLDM firmware package
-        output_dict: output dicitionary with all the decoded values
-        field name :current field
-        input_json_data:input json for that specific field
-        count_field: value of count key
-    """
-    #First check if count is the first field or not. Store the index for now. 
-    count_index = list(input_json_data).index('count')
-    #When the count field is indirect and string and has some operation in it
-    if isinstance(count_field, str):
-        operators = ["+", "-", "*", "/"]
-        functions = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
-        for op in operators:
-            if op in count_field:
-                parts = count_field.split(op)
-                before = parts[0]
-                after = parts[1]
-                before_num = output_dict[before]
-                after_num = int(after)
-                count = functions[op](before_num, after_num)
-                break
-        else: # This will execute only if the loop did not break
-            count = output_dict[count_field]        
+    This function appends the operation encoding one value
+        Parameters:
+            ops: list of operations
+            value: decoded value
+            data_type: data type of the field
+            data_length: length of the field
+            field_name: name of the field
+    """
+    if isinstance(value, str) and data_type not in ENCODERS:
+        encoded = value.encode(STRING_CODECS.get(data_type, "utf-8"))
+        ops.append((write_bytes, encoded, len(encoded), field_name))
     else:
-        count = count_field
-    #keep a copy of input json file before passing to the search function
-    input_json_data_copy = input_json_data.copy()
-    #removing count or it will go into infinite loop
-    input_json_data_copy.pop("count")
-    #Check if there are elements in the spec before count - these should not be repeated. 
-    #But together they will be treated as one element
-    if count_index!=0:
-        input_json_data_precount={}
-        for i in range(count_index):
-            input_json_data_precount[list(input_json_data_copy)[0]]=input_json_data_copy[list(input_json_data_copy)[0]]
-            input_json_data_copy.pop(list(input_json_data_copy)[0])
-        firmware_data = search(firmware_data, input_json_data_precount, output_dict[field_name][0])
-        #Update count_index for the array of repeated entries
-        count_index=1
-    for i in range(count_index, count):
-        firmware_data = search(firmware_data, input_json_data_copy, output_dict[field_name][i])
-    return firmware_data
-
-def process_decode(firmware_data, output_dict,field_name, data_length, data_type,decode):
-    """
-    This function is for fields having specical decode feature
-        Parameter:
-            firmware_data: PLDM firmware package
-            output_dict: output dicitionary with all the decoded values
-            field name :current field
-            data_length: length of field extarcted from spec folder
-            data_type: data_type of field extracted from spec folder
-            decode: decode spec from json file
-    """
-    if isinstance(data_length,int):#initial descriptor type and additional descriptor type
-        value = output_dict[field_name]
-        key = None
-        for k,v in decode.items():
-            if v == value:
-                key = k
-                break
-        packedData = encode_data(key,data_type,data_length)#is this data length same?
-        firmware_data += packedData
-    # For AdditionalDescriptorType having AdditionalDescriptorType as Vendor Defined and indirect data length
-    elif("Vendor Defined" in decode): #AdditionalDescriptorIdentifierData
-        if(output_dict["AdditionalDescriptorType"] == "Vendor Defined"):
-            data_length = output_dict[data_length]
-            packedData = b""
-            vendorData=search(packedData,decode["Vendor Defined"],output_dict)
-            if(data_length != len(vendorData)):
-                vendorData = vendorData[:data_length]
-            firmware_data+= vendorData
-        else:
-            data_length = output_dict[data_length]
-            value = output_dict[field_name]
-            packedData = encode_data(value, data_type, data_length)
-            if(packedData):
-                firmware_data += packedData
-    else: 
-        #data_type and data_length are indirect 
-        data_length = output_dict[data_length]
-        data_type_no = output_dict[data_type]
-        data_type = decode[str(data_type_no)]
-        value = output_dict[field_name]
-        #call the encode_data function
-        packedData = encode_data(value, data_type,data_length)
-        #add the encoded data into firmware data
-        firmware_data += packedData
-            
-    return firmware_data
+        size, writer = encoder_for(value, data_type, data_length, field_name)
+        ops.append((writer, value, size, field_name))
+
+def run_ops(ops):
+    """
+    This function allocates the header once and writes every operation into it. The header checksum, the CRC32 of
+    everything before PackageHeaderChecksum, is calculated while writing. It returns the header and that checksum
+        Parameters:
+            ops: operations returned by plan
+    """
+    buffer = bytearray(sum(op[2] for op in ops))
+    view = memoryview(buffer)
+    offset = 0
+    checksum = 0
+    header_checksum = None
+    for writer, value, size, field_name in ops:
+        if field_name == "PackageHeaderChecksum":
+            header_checksum = checksum
+        writer(buffer, offset, value, size)
+        checksum = zlib.crc32(view[offset:offset + size], checksum)
+        offset += size
+    view.release()
+    return bytes(buffer), header_checksum
+
+def encode_header(input_json_data, output_dict):
+    """
+    This function encodes a header or a part of it. It returns the encoded bytes and the CRC32 of the bytes before
+    PackageHeaderChecksum, None when that field is not part of it
+        Parameters:
+            input_json_data: spec json or a part of it
+            output_dict: dictionary with the decoded values
+    """
+    return run_ops(plan(compile_spec(input_json_data), output_dict, []))
 
 def search(firmware_data,input_json_data, output_dict):
     """
-    It is a recursive function use to get the keys inside the innermost dictionary of spec json
+    This function encodes the fields of input_json_data and appends them to firmware_data
     Parameters:
         firmware_data: PLDM firmware package
         input_json_data:input json for that specific field
         output_dict: output dicitionary with all the decoded values
     """
-    global info
+    return firmware_data + encode_header(input_json_data, output_dict)[0]
+
+def encode_header_lines(json_data, header_lines):
+    """
+    This function encodes a header read piece by piece from a header.ndjson file. Device ID records are encoded as
+    they are read and are not kept. It returns the encoded header, the header without the device records and the
+    position of every top level field in the encoded header
+        Parameters:
+            json_data: spec json
+            header_lines: (path, value) pairs returned by header_stream.read_header_lines
+    """
+    firmware_data = bytearray()
+    output_dict = {}
+    positions = {}
+    for path, value in header_lines:
+        #spec of the parent of the piece
+        parent_json_data = json_data
+        for key in path[:-1]:
+            parent_json_data = parent_json_data[key]
+        start = len(firmware_data)
+        if isinstance(path[-1], int):
+            record_json_data = {k: v for k, v in parent_json_data.items() if k != "count"}
+            firmware_data += search(b"", record_json_data, value)
+        else:
+            firmware_data += search(b"", {path[-1]: parent_json_data[path[-1]]}, {path[-1]: value})
+        if len(path) == 1:
+            positions[path[0]] = (start, len(firmware_data))
+        if not (len(path) == 3 and path[1] in header_stream.STREAMED_RECORDS):
+            header_stream.assign(output_dict, path, value)
+    return bytes(firmware_data), output_dict, positions
+
+def encode_section(input_json_data, output_dict, cache=None):
+    """
+    This function encodes one part of the header. When a cache dictionary is given, parts with the same content are
+    encoded only once
+        Parameters:
+            input_json_data: spec of the part
+            output_dict: decoded values of the part
+            cache: dictionary shared between calls, None to disable caching
+    """
+    if cache is None:
+        return search(b"", input_json_data, output_dict)
+    #the bitmap length decides the size of ApplicableComponents so it is part of the key
+    values = {field_name: output_dict.get(field_name) for field_name in input_json_data}
+    key = (tuple(map(id, input_json_data.values())), info.get("ComponentBitmapBitLength"), json.dumps(values, sort_keys=True))
+    if key not in cache:
+        cache[key] = search(b"", input_json_data, output_dict)
+    return cache[key]
+
+def update_counts(input_json_data, output_dict):
+    """
+    This function updates the count fields and the string length fields so that they match the decoded values
+        Parameters:
+            input_json_data: spec json
+            output_dict: dictionary with all the decoded values
+    """
     for field_name, field_info in input_json_data.items():
-        if isinstance(field_info, dict):
-            if "decode" in field_info:
-                #for fields having additional key -decode
-                firmware_data = process_decode(firmware_data, output_dict,field_name, field_info["length"], field_info["data_type"],field_info["decode"])
-                # continue
-            #for fields having only length key
-            elif "length" in field_info:
-                if(field_info["length"]=="ComponentBitmapBitLength"):
-                    data_length = int(info["ComponentBitmapBitLength"]/8)
-                    firmware_data = process(firmware_data, output_dict,field_name, data_length, field_info["data_type"])
-                else:
-                    firmware_data = process(firmware_data, output_dict,field_name, field_info["length"], field_info["data_type"])
-            #for fields having additional key- count
-            elif "count" in field_info:
-                firmware_data=process_count(firmware_data,output_dict,field_name,field_info,field_info["count"])
+        if not isinstance(field_info, dict) or field_name not in output_dict:
+            continue
+        if "count" in field_info:
+            entries = output_dict[field_name]
+            record_json_data = {k: v for k, v in field_info.items() if k != "count"}
+            for entry in entries:
+                update_counts(record_json_data, entry)
+            #only direct references are updated, calculated counts are left as they are
+            if isinstance(field_info["count"], str) and field_info["count"] in output_dict:
+                output_dict[field_info["count"]] = len(entries)
+        elif "length" in field_info:
+            #strings having their type in another field
+            if isinstance(field_info["length"], str) and field_info["length"] in output_dict and field_info["data_type"] in output_dict:
+                output_dict[field_info["length"]] = len(encode_data(output_dict[field_name], output_dict[field_info["data_type"]], 0))
+        elif isinstance(output_dict[field_name], dict):
+            update_counts(field_info, output_dict[field_name])
+
+def finalize_header(json_data, output_dict, image_sizes, cache=None):
+    """
+    This function recalculates the fields that depend on the layout of the package: counts, string lengths, record
+    lengths, PackageHeaderSize, ComponentSize, ComponentLocationOffset and PackageHeaderChecksum. The images are placed
+    one after the other right after the header. It returns the encoded header
+        Parameters:
+            json_data: spec json
+            output_dict: dictionary with all the decoded values, updated in place
+            image_sizes: size of every component image
+            cache: dictionary shared between calls to encode identical header parts once
+    """
+    global info
+    info = output_dict["PackageHeaderInformation"]
+    update_counts(json_data, output_dict)
+    #record lengths
+    for area, (records_field, length_field) in RECORD_LENGTH_FIELDS.items():
+        if area in json_data and records_field in output_dict.get(area, {}):
+            record_json_data = {k: v for k, v in json_data[area][records_field].items() if k != "count"}
+            for record in output_dict[area][records_field]:
+                record[length_field] = len(encode_section(record_json_data, record, cache))
+    components = output_dict["ComponentImageInformationArea"]["ComponentImageInformation"]
+    for component, size in zip(components, image_sizes):
+        component["ComponentSize"] = size
+    #the size of the header does not depend on the values of the offsets and of the checksums
+    header_len = sum(len(encode_section({k: v}, output_dict, cache)) for k, v in json_data.items())
+    output_dict["PackageHeaderInformation"]["PackageHeaderSize"] = header_len
+    offset = header_len
+    for component in components:
+        component["ComponentLocationOffset"] = offset
+        offset += component["ComponentSize"]
+    #header checksum is calculated over everything before it
+    sections = []
+    for k, v in json_data.items():
+        if k == "PackageHeaderChecksum":
+            output_dict[k] = zlib.crc32(b"".join(sections))
+        sections.append(encode_section({k: v}, output_dict, cache))
+    return b"".join(sections)
+
+def image_file_name(image_information, index):
+    """
+    This function returns the name of the bin file that holds a component image inside the unpack folder
+        Parameters:
+            image_information: ComponentImageInformation entry of the component
+            index: index of the component in the package
+    """
+    return image_information['ComponentIdentifier'] + "_" + image_information['ComponentVersionString'] + "_image_" + str(index) + ".bin"
+
+def load_manifest(manifest_path):
+    """
+    This function loads a component manifest. The manifest maps every ComponentImageInformation entry to the source
+    of its image, either a file or a byte range of an existing package, so images do not have to be copied into the
+    unpack folder before repacking
+        {
+            "ComponentImageInformation": [
+                {"path": "build/bmc.bin"},
+                {"package": "old/bundle.fwpkg", "offset": 4096, "size": 1048576},
+                null
+            ],
+            "remaining_firmwareData": {"path": "build/signature.bin"}
+        }
+    ComponentImageInformation can also be a dictionary keyed by component index. Entries that are null or missing
+    fall back to the unpack folder. Relative paths are resolved against the folder of the manifest.
+        Parameters:
+            manifest_path: path of the manifest json file
+    """
+    manifest_folder = Path(manifest_path).parent
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    def resolve(entry):
+        if entry is None:
+            return None
+        source_path = entry.get("path", entry.get("package"))
+        if source_path is None:
+            raise ValueError(f"Manifest entry {entry} has neither 'path' nor 'package'")
+        source = {"path": manifest_folder / source_path, "offset": entry.get("offset", 0)}
+        if "size" in entry:
+            source["size"] = entry["size"]
+        return source
+
+    components = manifest.get("ComponentImageInformation", [])
+    if isinstance(components, dict):
+        components = {int(index): resolve(entry) for index, entry in components.items()}
+    else:
+        components = {index: resolve(entry) for index, entry in enumerate(components)}
+    return {"ComponentImageInformation": components, "remaining_firmwareData": resolve(manifest.get("remaining_firmwareData"))}
+
+def read_archive(archive_path):
+    """
+    This function reads the header of a tar archive written by unpack. The images are not extracted, the members are
+    returned by name so that their offset inside the archive can be used as source. The archive must not be compressed
+        Parameters:
+            archive_path: path of the tar archive
+    """
+    with tarfile.open(archive_path, "r:") as archive:
+        members = {member.name: member for member in archive.getmembers() if member.isfile()}
+        header_name = "header.json" if "header.json" in members else "header.ndjson"
+        if header_name not in members:
+            raise ValueError(f"{archive_path} has neither header.json nor header.ndjson")
+        header_text = archive.extractfile(members[header_name]).read().decode()
+    return header_name, header_text, members
+
+def archive_manifest(archive_path, members, image_output_data, manifest=None):
+    """
+    This function returns a manifest pointing the components and the remaining data to their byte ranges inside the
+    archive. Entries of a given manifest are kept
+        Parameters:
+            archive_path: path of the tar archive
+            members: members returned by read_archive
+            image_output_data: ComponentImageInformationArea of the header
+            manifest: manifest returned by load_manifest, None if there is none
+    """
+    sources = {}
+    for i in range(image_output_data["ComponentImageCount"]):
+        name = image_file_name(image_output_data["ComponentImageInformation"][i], i)
+        if name not in members and name + compressed_image.SUFFIX in members:
+            sources[i] = compressed_source(archive_path, members[name + compressed_image.SUFFIX].offset_data)
+            continue
+        if name not in members:
+            raise ValueError(f"{archive_path} has no member {name}")
+        sources[i] = {"path": Path(archive_path), "offset": members[name].offset_data, "size": members[name].size}
+    remaining = members.get("remaining_firmwareData.bin")
+    remaining_source = {"path": Path(archive_path), "offset": remaining.offset_data, "size": remaining.size} if remaining else None
+    if manifest:
+        sources.update((i, source) for i, source in manifest["ComponentImageInformation"].items() if source is not None)
+        remaining_source = manifest["remaining_firmwareData"] or remaining_source
+    return {"ComponentImageInformation": sources, "remaining_firmwareData": remaining_source}
+
+def compressed_source(file_path, offset=0):
+    """
+    This function returns the source of a component image stored compressed by unpack, None when the file does not
+    hold a compressed image at that offset. The size of the source is the size of the decompressed image
+        Parameters:
+            file_path: path of the file
+            offset: offset of the compressed image in the file
+    """
+    index = compressed_image.read_index(file_path, offset)
+    if index is None:
+        return None
+    return {"path": Path(file_path), "offset": offset, "size": index["size"], "compressed": True}
+
+def image_sources(image_output_data, file_path, manifest=None):
+    """
+    This function finds the source of every component image. A source is a dictionary with the path of the file, the
+    offset of the image inside that file and the size of the image. Images stored compressed are marked with
+    "compressed", their size is the decompressed size
+        Parameters:
+            image_output_data: ComponentImageInformationArea of the header
+            file_path: unpack folder
+            manifest: manifest returned by load_manifest, None when the images are in the unpack folder
+    """
+    sources = []
+    overrides = manifest["ComponentImageInformation"] if manifest else {}
+    for i in range(image_output_data["ComponentImageCount"]):
+        image_information = image_output_data['ComponentImageInformation'][i]
+        source = overrides.get(i)
+        if source is None:
+            #image is in the unpack folder, the size of the file decides the size of the image
+            image_file_path = Path(file_path) / image_file_name(image_information, i)
+            compressed_path = image_file_path.with_name(image_file_path.name + compressed_image.SUFFIX)
+            if not image_file_path.exists() and compressed_path.exists():
+                sources.append(compressed_source(compressed_path))
                 continue
-            #recursively calls the search function
-            else:
-                firmware_data = search(firmware_data,field_info,output_dict[field_name])
-            #for applicable component field as value of length is present in another fields which is on a different level
-            if(field_name == "PackageVersionString"):
-                info = output_dict
-    return firmware_data
+            sources.append({"path": image_file_path, "offset": 0, "size": os.path.getsize(image_file_path)})
+            continue
+        if "size" not in source and not source.get("compressed"):
+            #a manifest can point to an image compressed by unpack
+            source = compressed_source(source["path"], source["offset"]) or source
+        size = source.get("size", os.path.getsize(source["path"]) - source["offset"])
+        #offsets of the header are not recalculated, so an image from the manifest has to match the header
+        if size != image_information['ComponentSize']:
+            raise ValueError(f"Component {i} from {source['path']} is {size} bytes but ComponentSize is {image_information['ComponentSize']}")
+        sources.append({"path": source["path"], "offset": source["offset"], "size": size, "compressed": source.get("compressed", False)})
+    return sources
+
+def read_source(source, chunk_size=CHUNK_SIZE):
+    """
+    This function reads the bytes of a source chunk by chunk, a compressed source is decompressed while it is read
+        Parameters:
+            source: dictionary with path, offset and size
+            chunk_size: maximum number of bytes returned at a time
+    """
+    if source.get("compressed"):
+        for chunk in compressed_image.read_chunks(source["path"], source["offset"]):
+            view = memoryview(chunk)
+            for start in range(0, len(view), chunk_size):
+                yield view[start:start + chunk_size]
+        return
+    remaining = source["size"]
+    with open(source["path"], 'rb') as f:
+        f.seek(source["offset"])
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                raise ValueError(f"{source['path']} ended {remaining} bytes before the end of the image")
+            remaining -= len(chunk)
+            yield chunk
 
-def image_gluing(firmware_data,image_output_data,folder,file_path):
+def image_streaming(out_file, header_len, image_output_data, sources, checksums=None):
     """
-    This function extracts data from image bin files present in the unpack folder and append it to the firmware package
+    This function streams the component images from their sources into the output file, right after the header.
+    It returns the checksum of everything written after the header
         Parameters:
-            firmware_data  = header block to start with
-            image_json: image dictionary from spec
-            folder:output folder
-    """
-
-    #number of images present in the package
-    count = image_output_data["ComponentImageCount"]
-    for i in range(count):
-        # creating file path of the image bin file
-        file_name_version = image_output_data['ComponentImageInformation'][i]['ComponentVersionString']  #file version for file name
-        file_name_identifier = image_output_data['ComponentImageInformation'][i]['ComponentIdentifier'] #file identifier for file name
-        file_name = file_name_identifier+"_"+file_name_version + "_image_" + str(i) #file name
+            out_file: output file opened in binary mode and positioned at the end of the header
+            header_len: length of the header
+            image_output_data: ComponentImageInformationArea of the header
+            sources: image sources returned by image_sources
+            checksums: optional list with the CRC32 of every source, None when it is not known. The known CRC32s are
+                       not calculated again and the missing ones are filled in
+    """
+    if checksums is None:
+        checksums = [None] * len(sources)
+    position = header_len
+    payload_checksum = 0
+    for i, source in enumerate(sources):
         image_start = image_output_data['ComponentImageInformation'][i]['ComponentLocationOffset'] #image offset
+        if image_start < position:
+            raise ValueError(f"Component {i} starts at ComponentLocationOffset {image_start}, inside the header or the previous component that end at {position}")
+        # if image does not start immediately where the previous image ends
+        if image_start > position:
+            padding = bytes(image_start - position)
+            out_file.write(padding)
+            payload_checksum = crc.crc32_combine(payload_checksum, zlib.crc32(padding), len(padding))
+            position = image_start
+        image_crc = crc.ParallelCrc32() if checksums[i] is None else None
+        for chunk in read_source(source):
+            out_file.write(chunk)
+            if image_crc is not None:
+                image_crc.update(chunk)
+        if image_crc is not None:
+            checksums[i] = image_crc.value()
+        payload_checksum = crc.crc32_combine(payload_checksum, checksums[i], source["size"])
+        position += source["size"]
+    return payload_checksum
+
+def file_digest(file_path):
+    """
+    This function returns the SHA-256 of a file, read in chunks
+        Parameters:
+            file_path: path of the file
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def file_state(file_path):
+    """
+    This function returns the size, modification time, change time and inode of a file. The change time is set by
+    every write and cannot be set back, so a copy that keeps the size and the modification time (cp -p, tar, rsync -t)
+    still changes the state without the file being read
+        Parameters:
+            file_path: path of the file
+    """
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino]
 
-        # if image does not start immediately where the firmware_data ends
-        # /////////////////////////////////
-        if (size:=abs(image_start-len(firmware_data)) != 0): 
-            # size = image_start-len(firmware_data) #zero padding
-            bytes_obj =bytes(size)
-            firmware_data+=bytes_obj 
-        # ///////////////////////////////////////////
-
-        # adding image data to firmware data
-        file = file_name+'.bin'
-        image_file_path = os.path.join(file_path,file)
-        with open(image_file_path, 'rb') as image_file: #open image bin file
-            image_data = image_file.read()
-        firmware_data = firmware_data[:image_start]+image_data+firmware_data[image_start:]# add image data to firmware_data
-    return firmware_data #return the final image data
-
-def main(file_path, output, spec_path):
+def source_state(source):
+    """
+    This function returns what identifies the content of a source without reading it: resolved path, offset and size
+    of the source and the file_state of its file
+        Parameters:
+            source: image or remaining data source
+    """
+    return [str(Path(source["path"]).resolve()), source["offset"], source["size"]] + file_state(source["path"])
+
+def output_state(file_path):
+    """
+    This function returns the path, size and modification time of a repacked file, None when it does not exist
+        Parameters:
+            file_path: path of the repacked file
+    """
+    if not os.path.exists(file_path):
+        return None
+    stat = os.stat(file_path)
+    return [str(file_path), stat.st_size, stat.st_mtime_ns]
+
+def build_cache_path(folder):
+    """
+    This function returns the path of the build cache of an output folder. The caches are kept in the cache folder of
+    the user, not next to the repacked file
+        Parameters:
+            folder: folder in which the repack folder is created
+    """
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        cache_folder = Path(os.environ["LOCALAPPDATA"])
+    else:
+        cache_folder = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    key = hashlib.sha256(str(Path(folder).resolve()).encode()).hexdigest()[:32]
+    return cache_folder / "pldm_fwpkg" / "repack" / f"{key}.json"
+
+def load_build_cache(cache_path):
+    """
+    This function loads the build cache of repack, empty when it does not exist or cannot be read
+        {
+            "fingerprint": {"spec": ..., "header": sha256 of the header, "images": [source_state, ...], "remaining": source_state},
+            "output": output_state of the repacked file,
+            "checksums": {source_state as json: CRC32 of the image}
+        }
+        Parameters:
+            cache_path: path returned by build_cache_path
+    """
+    try:
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def is_up_to_date(build_cache, fingerprint):
+    """
+    This function checks whether the repacked file of the build cache was built from the same inputs and was not
+    changed since
+        Parameters:
+            build_cache: build cache returned by load_build_cache
+            fingerprint: fingerprint of the current inputs
+    """
+    output = build_cache.get("output")
+    return build_cache.get("fingerprint") == fingerprint and output is not None and output_state(output[0]) == output
+
+def main(file_path, output, spec_path, manifest_path=None, force=False):
     file = Path(file_path)
     
     #output is when there is error
@@ -307,68 +743,126 @@ def main(file_path, output, spec_path):
     #this is for handling folders-error files will go to new folder
     folder = output or output_folder
 
-    #path to the spec json file
-    spec_path += ".json"
-    json_file_path = os.path.join("spec",spec_path)
-
-    with open(json_file_path, 'r') as json_file:
-        json_data = json.load(json_file)
+    #spec json
+    json_data = load_spec(spec_path)
 
     # Creating a case for updates header checksum-pack folder
     header_file_path = Path(os.path.join(file_path,"header.json"))
+    #tar archive written by unpack, the images are read from inside the archive
+    archive = file.is_file() and tarfile.is_tarfile(file)
 
-    with open(header_file_path,"r") as f:
-        output_dict = json.load(f)
+    if archive:
+        header_name, header_text, members = read_archive(file)
+        header_file_path = Path(header_name)
+        if header_name == "header.json":
+            output_dict = json.loads(header_text)
+            firmware_data = search(b"", json_data, output_dict)
+        else:
+            firmware_data, output_dict, positions = encode_header_lines(json_data, header_stream.parse_header_lines(header_text.splitlines()))
+    elif header_file_path.exists():
+        with open(header_file_path,"r") as f:
+            output_dict = json.load(f)
+        #creating an empty byte object
+        firmware_data = b""
+        firmware_data = search(firmware_data,json_data,output_dict)
+    else:
+        #header written one piece per line, encoded while it is read
+        header_file_path = Path(os.path.join(file_path,"header.ndjson"))
+        firmware_data, output_dict, positions = encode_header_lines(json_data, header_stream.read_header_lines(header_file_path))
 
-    #creating an empty byte object
-    firmware_data = b""
-    firmware_data = search(firmware_data,json_data,output_dict)
+    manifest = load_manifest(manifest_path) if manifest_path else None
+    if archive:
+        manifest = archive_manifest(file, members, output_dict["ComponentImageInformationArea"], manifest)
+    sources = image_sources(output_dict["ComponentImageInformationArea"], file_path, manifest)
 
     header_len = len(firmware_data)
+
+    # adding signature or remaining data from the firmware file
+    remaining_source = manifest["remaining_firmwareData"] if manifest else None
+    if remaining_source is None:
+        remaining_data_file_path = Path(os.path.join(file_path,"remaining_firmwareData.bin"))
+        # Making remaining firmware data optional
+        if remaining_data_file_path.exists():
+            remaining_source = {"path": remaining_data_file_path, "offset": 0}
+    if remaining_source is not None and "size" not in remaining_source:
+        remaining_source["size"] = os.path.getsize(remaining_source["path"]) - remaining_source["offset"]
+
     #storing header info in a bin file-will be used for calculating the checksum
     with open(folder/"header_info.bin",'wb') as f:
         f.write(firmware_data)
 
-    firmware_data_updated = image_gluing(firmware_data,output_dict["ComponentImageInformationArea"],folder,file_path)
-    payload_checksum = firmware_data_updated[header_len:]
-    #updating the checksum in header file and then repacking the firmware file
-    if "PLDMFWPackagePayloadChecksum" in json_data:
-        output_dict["PLDMFWPackagePayloadChecksum"] = zlib.crc32(payload_checksum)
-        with open(header_file_path, "w") as f:
-            json.dump(output_dict,f,indent=4)
-        firmware_data = b""
-        firmware_data = search(firmware_data,json_data,output_dict)
-        firmware_data_updated = image_gluing(firmware_data,output_dict["ComponentImageInformationArea"],folder,file_path)
+    #nothing else is written when the last repacked file was built from the same inputs
+    cache_path = build_cache_path(folder)
+    build_cache = load_build_cache(cache_path)
+    fingerprint = {
+        "spec": spec_path,
+        "header": hashlib.sha256(header_text.encode()).hexdigest() if archive else file_digest(header_file_path),
+        "images": [source_state(source) for source in sources],
+        "remaining": source_state(remaining_source) if remaining_source is not None else None,
+    }
+    if not force and is_up_to_date(build_cache, fingerprint):
+        print("The repacked file", Path(build_cache["output"][0]).name, "is up to date here ", os.path.abspath(Path(build_cache["output"][0]).parent))
+        return
+    #CRC32s of the images that did not change since the last build
+    cached_checksums = build_cache.get("checksums", {})
+    checksums = [cached_checksums.get(json.dumps(state)) for state in fingerprint["images"]]
 
-    # adding signature or remaining data from the firmware file
-    remaining_data_file_path = Path(os.path.join(file_path,"remaining_firmwareData.bin"))
-    
-    # Making remaining firmware data optional
-    if remaining_data_file_path.exists():
-        with open(remaining_data_file_path, 'rb') as file: #open remaining firmware data bin file
-            remaining_data = file.read()
-        firmware_data_updated+= remaining_data #add the remaining data to firmware file
-
-    #create repack folder
-    new_path = folder / "repack"
-    if new_path.exists():
-        new_path = folder/"bundle"
-        if new_path.exists():
-            # Find the highest backup number
-            backup_number = 1
-            while(folder / f"bundle_backup_{backup_number}").exists():
-                backup_number += 1
-
-            # Rename existing bundle folder
-            new_path.rename(folder / f"bundle_backup_{backup_number}")
-        new_path.mkdir()
-        with open(new_path/"packed_data.fwpkg","wb") as f:
-            f.write(firmware_data_updated)
+    #create repack folder, the bundle folder when there is one already
+    #it is written next to its final place and renamed once complete, an existing bundle folder is renamed to the next backup
+    if (folder / "repack").exists():
+        writer = output_writer.OutputWriter(folder, "bundle", "bundle_backup_")
+        output_file_name = "packed_data.fwpkg"
+    else:
+        writer = output_writer.OutputWriter(folder, "repack")
+        output_file_name = "repacked_data.fwpkg"
+
+    #the images are streamed from their sources, the header is rewritten once the payload checksum is known
+    with writer, open(writer.path(output_file_name), "wb") as f:
+        f.write(firmware_data)
+        payload_checksum = image_streaming(f, header_len, output_dict["ComponentImageInformationArea"], sources, checksums)
+        #updating the checksum in header file and then repacking the firmware file
+        if "PLDMFWPackagePayloadChecksum" in json_data:
+            #the header file is only rewritten when the checksum changed, the header inside an archive is left as it is
+            rewrite_header = not archive and output_dict.get("PLDMFWPackagePayloadChecksum") != payload_checksum
+            output_dict["PLDMFWPackagePayloadChecksum"] = payload_checksum
+            if header_file_path.suffix == ".ndjson":
+                if rewrite_header:
+                    header_stream.update_header_lines(header_file_path, {("PLDMFWPackagePayloadChecksum",): payload_checksum})
+                #only the checksum field is encoded again
+                start, end = positions["PLDMFWPackagePayloadChecksum"]
+                checksum_data = search(b"", {"PLDMFWPackagePayloadChecksum": json_data["PLDMFWPackagePayloadChecksum"]}, output_dict)
+                firmware_data = firmware_data[:start] + checksum_data + firmware_data[end:]
+            else:
+                if rewrite_header:
+                    with open(header_file_path, "w") as header_file:
+                        json.dump(output_dict,header_file,indent=4)
+                firmware_data = b""
+                firmware_data = search(firmware_data,json_data,output_dict)
+        if remaining_source is not None:
+            for chunk in read_source(remaining_source):
+                f.write(chunk)
+        f.seek(0)
+        f.write(firmware_data)
+    new_path = writer.final_path
+
+    if not archive:
+        fingerprint["header"] = file_digest(header_file_path)
+    build_cache = {
+        "fingerprint": fingerprint,
+        "output": output_state(new_path/output_file_name),
+        "checksums": {json.dumps(state): checksum for state, checksum in zip(fingerprint["images"], checksums)},
+    }
+    #the cache only saves time, a cache folder that cannot be written does not fail the repack
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(build_cache, f, indent=4)
+    except OSError:
+        pass
+
+    if output_file_name == "packed_data.fwpkg":
         print("The packed File packed_data.fwpkg is available here ", os.path.abspath(new_path))
     else:
-        new_path.mkdir(exist_ok=True)
-        with open(new_path/"repacked_data.fwpkg","wb") as f:
-            f.write(firmware_data_updated)
         print("The repacked file repacked_data.fwpkg is available here ", os.path.abspath(new_path))
     
 if __name__ == '__main__':
@@ -379,7 +873,14 @@ if __name__ == '__main__':
     parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0")
     #takes the output folder in which the corrupted package will be stored
     parser.add_argument("-E", "--output", required=False, help="output folder")#for error injection
+    #takes the manifest that maps the components to their source files
+    parser.add_argument("-M", "--manifest", required=False, help="Manifest mapping components to image files or package byte ranges", dest="manifest")
+    #repack even when the last repacked file is up to date
+    parser.add_argument("-B", "--rebuild", help="Repack even when the repacked file is up to date", dest="rebuild", action="store_true")
+    # flush the output folder to the disk before it is published
+    parser.add_argument("-Y", "--sync", help="Flush the files of the output folder to the disk before publishing it", dest="sync", action="store_true")
     args = parser.parse_args()
+    output_writer.sync_output = args.sync
     file_path = args.fwpkg_file_path
     spec_path = args.spec_path
-    main(file_path,args.output, spec_path)
\ No newline at end of file
+    main(file_path,args.output, spec_path, args.manifest, args.rebuild)
\ No newline at end of file
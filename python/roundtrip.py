@@ -0,0 +1,296 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import json
+import time
+import random
+import argparse
+import tempfile
+import importlib
+import tracemalloc
+import contextlib
+from pathlib import Path
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from spec import load_spec
+
+#spec versions covered by the round trip
+SPEC_VERSIONS = ["pldm_spec_1.0.0", "pldm_spec_1.1.0", "pldm_spec_1.2.0", "pldm_spec_1.3.0"]
+
+#stored baselines, per MB of package
+BASELINE_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "roundtrip_baselines.json")
+
+#number of bytes compared at a time
+CHUNK_SIZE = 1024 * 1024
+
+def generate_record(record_json_data, index, component_count, downstream):
+    """
+    This function generates a firmware or downstream device ID record with the fields of the spec
+        Parameters:
+            record_json_data: spec of the record
+            index: index of the record, used to make every record different
+            component_count: number of components in the package
+            downstream: True for a downstream device ID record
+    """
+    descriptors = [
+        {"InitialDescriptorType": "PCI Vendor ID", "InitialDescriptorLength": 2, "InitialDescriptorData": hex(0x8086 + index)},
+        {"AdditionalDescriptorType": "PCI Device ID", "AdditionalDescriptorLength": 2, "AdditionalDescriptorIdentifierData": hex(0x1234 + index)},
+    ]
+    applicable_components = hex(((1 << component_count) - 1) >> (index % component_count))
+    if downstream:
+        record = {
+            "DownstreamDeviceRecordLength": 0,
+            "DownstreamDeviceDescriptorCount": len(descriptors),
+            "DownstreamDeviceUpdateOptionFlags": 0,
+            "DownstreamDeviceSelfContainedActivationMinVersionStringType": "ASCII",
+            "DownstreamDeviceSelfContainedActivationMinVersionStringLength": 0,
+            "DownstreamDevicePackageDataLength": 2,
+            "DownstreamDeviceReferenceManifestLength": 1,
+            "DownstreamDeviceApplicableComponents": applicable_components,
+            "DownstreamDeviceSelfContainedActivationMinVersionString": f"1.{index}",
+            "DownstreamDeviceSelfContainedActivationMinVersionComparisonStamp": 0,
+            "DownstreamDeviceRecordDescriptors": descriptors,
+            "DownstreamDevicePackageData": "0xbeef",
+            "DownstreamDeviceReferenceManifestData": "0x7",
+        }
+    else:
+        descriptors.append({"AdditionalDescriptorType": "UUID", "AdditionalDescriptorLength": 16, "AdditionalDescriptorIdentifierData": hex((0x1122334455667788 << 64) + index)})
+        record = {
+            "RecordLength": 0,
+            "DescriptorCount": len(descriptors),
+            "DeviceUpdateOptionFlags": 1,
+            "ComponentImageSetVersionStringType": "ASCII",
+            "ComponentImageSetVersionStringLength": 0,
+            "FirmwareDevicePackageDataLength": 2,
+            "ReferenceManifestLength": 2,
+            "ApplicableComponents": applicable_components,
+            "ComponentImageSetVersionString": f"v{index}.00",
+            "RecordDescriptors": descriptors,
+            "FirmwareDevicePackageData": "0xcafe",
+            "ReferenceManifestData": "0x1234",
+        }
+    #fields that are not part of this version of the spec
+    return {k: v for k, v in record.items() if k in record_json_data}
+
+def generate_header(spec_data, component_sizes, device_record_count):
+    """
+    This function generates a header for the spec with the given components
+        Parameters:
+            spec_data: spec json
+            component_sizes: size of every component image
+            device_record_count: number of firmware device ID records, the same number of downstream records is added
+    """
+    component_count = len(component_sizes)
+    header = {
+        "PackageHeaderInformation": {
+            #the identifier of the 1.0.0 header differs from the later ones
+            "PackageHeaderIdentifier": "0xf018878ccb7d49439800a02f059aca02" if "DownstreamDeviceIdentificationArea" not in spec_data else "0x1244d2648d7d4718a030fc8a56587d5a",
+            "PackageHeaderFormatRevision": 1,
+            "PackageHeaderSize": 0,
+            "PackageReleaseDateTime": "2024-05-01 12:30:45:123456 +0000 (0x00)",
+            "ComponentBitmapBitLength": 8 * ((component_count + 7) // 8),
+            "PackageVersionStringType": "ASCII",
+            "PackageVersionStringLength": 0,
+            "PackageVersionString": "ROUNDTRIP",
+        },
+    }
+    areas = [("FirmwareDeviceIdentificationArea", "FirmwareDeviceIDRecords", False), ("DownstreamDeviceIdentificationArea", "DownstreamDeviceIDRecords", True)]
+    for area, records_field, downstream in areas:
+        if area in spec_data:
+            record_json_data = spec_data[area][records_field]
+            records = [generate_record(record_json_data, i, component_count, downstream) for i in range(device_record_count)]
+            header[area] = {next(iter(spec_data[area])): len(records), records_field: records}
+    component_json_data = spec_data["ComponentImageInformationArea"]["ComponentImageInformation"]
+    components = []
+    for i, size in enumerate(component_sizes):
+        component = {
+            "ComponentClassification": "Firmware",
+            "ComponentIdentifier": hex(0x10 + i),
+            "ComponentComparisonStamp": i,
+            "ComponentOptions": "0x1",
+            "RequestedComponentActivationMethod": "0x2",
+            "ComponentLocationOffset": 0,
+            "ComponentSize": size,
+            "ComponentVersionStringType": "ASCII",
+            "ComponentVersionStringLength": 0,
+            "ComponentVersionString": f"c{i:03d}",
+            "ComponentOpaqueDataLength": 1,
+            "ComponentOpaqueData": "0x5",
+        }
+        components.append({k: v for k, v in component.items() if k in component_json_data})
+    header["ComponentImageInformationArea"] = {"ComponentImageCount": len(components), "ComponentImageInformation": components}
+    header["PackageHeaderChecksum"] = 0
+    return header
+
+def generate_package(spec_path, file_path, component_count, component_size, device_record_count, seed=0):
+    """
+    This function writes a valid package with random component images
+        Parameters:
+            spec_path: version of the spec
+            file_path: path of the package to write
+            component_count: number of components
+            component_size: size of every component image in bytes
+            device_record_count: number of device ID records
+            seed: seed of the random images
+    """
+    from python import repack
+    from python import crc
+    spec_data = load_spec(spec_path)
+    rng = random.Random(seed)
+    images = [rng.randbytes(component_size) for _ in range(component_count)]
+    header = generate_header(spec_data, [len(image) for image in images], device_record_count)
+    if "PLDMFWPackagePayloadChecksum" in spec_data:
+        payload_crc = crc.ParallelCrc32()
+        for image in images:
+            payload_crc.update(image)
+        header["PLDMFWPackagePayloadChecksum"] = payload_crc.value()
+    firmware_data = repack.finalize_header(spec_data, header, [len(image) for image in images])
+    with open(file_path, "wb") as f:
+        f.write(firmware_data)
+        for image in images:
+            f.write(image)
+        f.write(b"SIGNATURE")
+
+def files_identical(first_path, second_path):
+    """
+    This function compares two files chunk by chunk
+        Parameters:
+            first_path: path of the first file
+            second_path: path of the second file
+    """
+    if os.path.getsize(first_path) != os.path.getsize(second_path):
+        return False
+    with open(first_path, "rb") as first, open(second_path, "rb") as second:
+        while True:
+            first_chunk = first.read(CHUNK_SIZE)
+            if first_chunk != second.read(CHUNK_SIZE):
+                return False
+            if not first_chunk:
+                return True
+
+def file_checksum(file_path):
+    """
+    This function calculates the CRC32 of a whole file
+        Parameters:
+            file_path: path of the file
+    """
+    from python import crc
+    return crc.crc32_ranges([(file_path, 0, os.path.getsize(file_path))])
+
+def round_trip(file_path, spec_path, work_folder):
+    """
+    This function unpacks and repacks a package and returns whether the CRCs matched while unpacking and whether the
+    repacked package is identical to the input
+        Parameters:
+            file_path: package to round trip
+            spec_path: version of the spec
+            work_folder: empty folder for the unpacked and repacked files
+    """
+    from python import unpack, repack
+    os.makedirs(work_folder, exist_ok=True)
+    #the progress messages of unpack and repack are not part of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        crc_match = unpack.main(str(file_path), str(work_folder), spec_path, None)
+        repack.main(os.path.join(work_folder, "unpack"), str(work_folder), spec_path)
+    repacked_path = os.path.join(work_folder, "repack", "repacked_data.fwpkg")
+    identical = files_identical(file_path, repacked_path) and file_checksum(file_path) == file_checksum(repacked_path)
+    return crc_match, identical
+
+def measure(file_path, spec_path, work_folder):
+    """
+    This function round trips a package twice, once for the wall time and once under tracemalloc for the peak memory
+        Parameters:
+            file_path: package to round trip
+            spec_path: version of the spec
+            work_folder: folder in which the two round trips are done
+    """
+    start = time.perf_counter()
+    crc_match, identical = round_trip(file_path, spec_path, os.path.join(work_folder, "timed"))
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        round_trip(file_path, spec_path, os.path.join(work_folder, "traced"))
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    size_mb = max(os.path.getsize(file_path) / (1024 * 1024), 1e-6)
+    return {"crc_match": crc_match, "identical": identical, "seconds_per_mb": seconds / size_mb, "peak_memory_per_mb": peak_memory / size_mb}
+
+def main(sample_folder=None, sample_spec_path=None, component_size=4 * 1024 * 1024, device_record_count=64, update_baselines=False, check_time=True):
+    """
+    This function round trips a generated package for every version of the spec and every package of the sample
+    folder. A package fails when the unpack CRCs do not match, when the repacked package is not byte for byte
+    identical or when the time or the peak memory per MB exceeds the stored baseline times its tolerance. It returns
+    True when every package passed
+        Parameters:
+            sample_folder: optional folder of sample packages
+            sample_spec_path: version of the spec of the sample packages
+            component_size: size of every component of the generated packages
+            device_record_count: number of device ID records of the generated packages
+            update_baselines: store the measurements as the new baselines instead of checking them
+            check_time: check the time per MB against its baseline, it depends on the machine and the load of
+                        shared CI runners
+    """
+    report = {}
+    #import time of the codec, the modules are imported here for the first time
+    for name in ["unpack", "repack"]:
+        start = time.perf_counter()
+        importlib.import_module("python." + name)
+        report["import " + name] = time.perf_counter() - start
+    with open(BASELINE_FILE_PATH, "r") as f:
+        baselines = json.load(f)
+    #allowed factor over the baseline for every metric, time depends more on the machine than memory
+    tolerance = baselines["tolerance"]
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_folder:
+        packages = []
+        for spec_path in SPEC_VERSIONS:
+            package_path = os.path.join(temp_folder, spec_path + ".fwpkg")
+            generate_package(spec_path, package_path, 3, component_size, device_record_count)
+            packages.append((spec_path, package_path, spec_path))
+        if sample_folder:
+            for package_path in sorted(Path(sample_folder).glob("*.fwpkg")):
+                packages.append((package_path.name, str(package_path), sample_spec_path))
+        for index, (name, package_path, spec_path) in enumerate(packages):
+            results[name] = measure(package_path, spec_path, os.path.join(temp_folder, str(index)))
+
+    for step, seconds in report.items():
+        print(f"{step}: {seconds * 1000:.2f} ms")
+    passed = True
+    for name, result in results.items():
+        failures = []
+        if not result["crc_match"]:
+            failures.append("CRC mismatch")
+        if not result["identical"]:
+            failures.append("repacked package differs")
+        baseline = baselines["packages"].get(name)
+        if baseline and not update_baselines:
+            for metric in ["seconds_per_mb", "peak_memory_per_mb"] if check_time else ["peak_memory_per_mb"]:
+                if result[metric] > baseline[metric] * tolerance[metric]:
+                    failures.append(f"{metric} {result[metric]:.4g} exceeds baseline {baseline[metric]:.4g} x {tolerance[metric]}")
+        passed = passed and not failures
+        print(f"{name}: {result['seconds_per_mb'] * 1000:.2f} ms/MB, {result['peak_memory_per_mb'] / (1024 * 1024):.2f} MB/MB peak memory, {'FAILED: ' + '; '.join(failures) if failures else 'passed'}")
+    if update_baselines:
+        baselines["packages"].update({name: {metric: float(f"{result[metric]:.4g}") for metric in ["seconds_per_mb", "peak_memory_per_mb"]} for name, result in results.items()})
+        with open(BASELINE_FILE_PATH, "w") as f:
+            json.dump(baselines, f, indent=4)
+            f.write("\n")
+        print("Baselines updated in", BASELINE_FILE_PATH)
+    return passed
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    #take an optional folder of sample packages
+    parser.add_argument("-F", "--fwpkg-file-path", help="Folder of sample packages to round trip", dest="fwpkg_file_path", required=False)
+    #take the spec version of the sample packages
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec of the sample packages", dest="spec_path", choices=SPEC_VERSIONS, default="pldm_spec_1.0.0")
+    #store the measurements as baselines
+    parser.add_argument("-U", "--update-baselines", help="Store the measurements as the new baselines", dest="update_baselines", action="store_true")
+    args = parser.parse_args()
+    if not main(args.fwpkg_file_path, args.spec_path, update_baselines=args.update_baselines):
+        sys.exit(1)
@@ -0,0 +1,255 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import math
+import mmap
+import time
+import random
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import query
+from python import applicability
+
+#completion codes of RequestFirmwareData, DSP0267
+SUCCESS = 0x00
+DATA_OUT_OF_RANGE = 0x82
+INVALID_TRANSFER_LENGTH = 0x83
+
+#smallest transfer size a firmware device may use, DSP0267 baseline transfer size
+BASELINE_TRANSFER_SIZE = 32
+
+#transfer size of the simulated devices when none is given
+DEFAULT_TRANSFER_SIZE = 4096
+
+#the package is cached in blocks of this size, aligned on the start of the package
+CACHE_BLOCK_SIZE = 64 * 1024
+
+#bytes of the package kept in the chunk cache
+DEFAULT_CACHE_SIZE = 16 * 1024 * 1024
+
+#latency percentiles printed by the load generator
+PERCENTILES = [50, 90, 99, 99.9]
+
+class PackageServer:
+    """
+    Serves the component images of a package the way an update agent answers RequestFirmwareData. Only the header is
+    decoded, the images are read from the mmapped package through a bounded LRU cache of blocks shared by all the
+    devices. Safe to use from several threads.
+        with PackageServer("bundle.fwpkg", "pldm_spec_1.3.0") as server:
+            completion_code, data = server.request_firmware_data(0, 0, 4096)
+    """
+    def __init__(self, file_path, spec_path, cache_size=DEFAULT_CACHE_SIZE, max_transfer_size=None):
+        self.output_dict, _ = query.read_package(file_path, spec_path)
+        components = self.output_dict["ComponentImageInformationArea"]["ComponentImageInformation"]
+        #(offset in the package, size) of every component
+        self.components = [(c["ComponentLocationOffset"], c["ComponentSize"]) for c in components]
+        self.max_transfer_size = max_transfer_size
+        self.file = open(file_path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        for i, (offset, size) in enumerate(self.components):
+            if offset + size > len(self.data):
+                self.close()
+                raise ValueError(f"Component {i} ends at {offset + size}, after the end of the package at {len(self.data)}")
+        self.cache_blocks = cache_size // CACHE_BLOCK_SIZE
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def block(self, number):
+        """
+        This function returns a block of the package from the cache, reading it from the mmap on a miss
+        """
+        if self.cache_blocks == 0:
+            with self.lock:
+                self.misses += 1
+            return self.data[number * CACHE_BLOCK_SIZE:(number + 1) * CACHE_BLOCK_SIZE]
+        with self.lock:
+            data = self.cache.get(number)
+            if data is not None:
+                self.cache.move_to_end(number)
+                self.hits += 1
+                return data
+            self.misses += 1
+        data = self.data[number * CACHE_BLOCK_SIZE:(number + 1) * CACHE_BLOCK_SIZE]
+        with self.lock:
+            self.cache[number] = data
+            if len(self.cache) > self.cache_blocks:
+                self.cache.popitem(last=False)
+        return data
+
+    def read(self, start, length):
+        """
+        This function returns length bytes of the package from start, assembled from the cached blocks
+        """
+        first = start // CACHE_BLOCK_SIZE
+        last = (start + length - 1) // CACHE_BLOCK_SIZE
+        if first == last:
+            position = start - first * CACHE_BLOCK_SIZE
+            return self.block(first)[position:position + length]
+        chunks = []
+        for number in range(first, last + 1):
+            block_start = number * CACHE_BLOCK_SIZE
+            chunks.append(self.block(number)[max(start - block_start, 0):start + length - block_start])
+        return b"".join(chunks)
+
+    def request_firmware_data(self, component_index, offset, length):
+        """
+        This function answers a RequestFirmwareData of a firmware device updating a component. It returns the
+        completion code and the data. Data asked for after the end of the image is padded with zeros, like the update
+        agent does for the last transfer
+            Parameters:
+                component_index: index of the component being updated
+                offset: offset in the component image
+                length: number of bytes requested
+        """
+        if length < BASELINE_TRANSFER_SIZE or (self.max_transfer_size is not None and length > self.max_transfer_size):
+            return INVALID_TRANSFER_LENGTH, b""
+        component_offset, component_size = self.components[component_index]
+        if offset < 0 or offset >= component_size:
+            return DATA_OUT_OF_RANGE, b""
+        available = min(length, component_size - offset)
+        data = self.read(component_offset + offset, available)
+        if available < length:
+            data += bytes(length - available)
+        return SUCCESS, data
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+def device_components(output_dict, device_count):
+    """
+    This function returns the components updated by every simulated device. The devices take the firmware device ID
+    records in turn and update the components applicable to their record
+        Parameters:
+            output_dict: decoded header
+            device_count: number of simulated devices
+    """
+    index = applicability.build_index(output_dict)
+    record_count = len(index["records"]["FirmwareDeviceIDRecords"])
+    if record_count == 0:
+        return [list(range(index["component_count"]))] * device_count
+    return [[c for c in applicability.components_for(index, device % record_count) if c < index["component_count"]]
+            for device in range(device_count)]
+
+def simulate_device(server, components, transfer_size, order, seed):
+    """
+    This function simulates a firmware device pulling its components in transfer_size chunks. It returns the latency
+    of every request in nanoseconds and the number of bytes received
+        Parameters:
+            server: PackageServer
+            components: indexes of the components updated by the device
+            transfer_size: number of bytes requested at a time
+            order: sequential, or random for chunks requested at shuffled offsets
+            seed: seed of the shuffle
+    """
+    rng = random.Random(seed)
+    latencies = []
+    received = 0
+    for component_index in components:
+        offsets = list(range(0, server.components[component_index][1], transfer_size))
+        if order == "random":
+            rng.shuffle(offsets)
+        for offset in offsets:
+            start = time.perf_counter_ns()
+            completion_code, data = server.request_firmware_data(component_index, offset, transfer_size)
+            latencies.append(time.perf_counter_ns() - start)
+            if completion_code != SUCCESS:
+                raise ValueError(f"RequestFirmwareData of component {component_index} at offset {offset} failed with completion code {completion_code:#x}")
+            received += len(data)
+    return latencies, received
+
+def percentile(sorted_values, p):
+    """
+    This function returns the nearest rank percentile of sorted values
+    """
+    rank = math.ceil(p / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+def run_load(server, device_count, transfer_size=DEFAULT_TRANSFER_SIZE, order="random", seed=0):
+    """
+    This function runs device_count simulated devices at the same time against a package server and returns the
+    measurements: requests, bytes, seconds, requests per second, latency percentiles in microseconds and cache hits
+        Parameters:
+            server: PackageServer
+            device_count: number of devices updating at the same time
+            transfer_size: number of bytes requested at a time
+            order: sequential or random
+            seed: seed of the shuffles, device i uses seed + i
+    """
+    assignments = device_components(server.output_dict, device_count)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=device_count) as executor:
+        results = list(executor.map(lambda device: simulate_device(server, assignments[device], transfer_size, order, seed + device), range(device_count)))
+    seconds = time.perf_counter() - start
+    latencies = sorted(latency for device_latencies, _ in results for latency in device_latencies)
+    requests = len(latencies)
+    return {
+        "devices": device_count,
+        "requests": requests,
+        "bytes": sum(received for _, received in results),
+        "seconds": seconds,
+        "requests_per_second": requests / seconds if seconds else 0.0,
+        "latency_us": {p: percentile(latencies, p) / 1000 for p in PERCENTILES} if latencies else {},
+        "cache_hits": server.hits,
+        "cache_misses": server.misses,
+    }
+
+def main(file_path, spec_path, device_count=None, transfer_size=None, order="random", cache_size=DEFAULT_CACHE_SIZE):
+    """
+    This function serves a package to simulated firmware devices and prints the throughput and the latencies of
+    their RequestFirmwareData
+        Parameters:
+            file_path: path of the package
+            spec_path: version of the spec
+            device_count: number of devices updating at the same time, 8 by default
+            transfer_size: number of bytes requested at a time, DEFAULT_TRANSFER_SIZE by default
+            order: sequential or random
+            cache_size: bytes of the package kept in the chunk cache
+    """
+    device_count = device_count or 8
+    transfer_size = transfer_size or DEFAULT_TRANSFER_SIZE
+    if transfer_size < BASELINE_TRANSFER_SIZE:
+        raise ValueError(f"Transfer size {transfer_size} is smaller than the baseline transfer size of {BASELINE_TRANSFER_SIZE} bytes")
+    with PackageServer(file_path, spec_path, cache_size) as server:
+        result = run_load(server, device_count, transfer_size, order)
+    print(f"{result['devices']} devices, {transfer_size} byte chunks, {order} order")
+    print(f"{result['requests']} chunks, {result['bytes'] / 1e6:.2f} MB in {result['seconds']:.3f} s: "
+          f"{result['requests_per_second']:.0f} chunks/s, {result['bytes'] / 1e6 / result['seconds']:.1f} MB/s" if result["seconds"] else "No chunk requested")
+    for p, latency in result["latency_us"].items():
+        print(f"p{p} latency: {latency:.1f} us")
+    lookups = result["cache_hits"] + result["cache_misses"]
+    if lookups:
+        print(f"Chunk cache: {result['cache_hits']} hits, {result['cache_misses']} misses ({100 * result['cache_hits'] / lookups:.1f}% hits)")
+    return result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    #take fwpkg file name
+    parser.add_argument("-F", "--fwpkg-file-path", help="PLDM FW update package to serve", dest="fwpkg_file_path", required=True)
+    #take the spec version
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0")
+    parser.add_argument("-J", "--jobs", help="Number of simulated devices updating at the same time", dest="jobs", type=int)
+    parser.add_argument("-X", "--transfer-size", help="Number of bytes requested at a time", dest="transfer_size", type=int)
+    parser.add_argument("--order", help="Order in which the chunks are requested", choices=["sequential", "random"], default="random")
+    parser.add_argument("--cache-size", help="Bytes of the package kept in the chunk cache", dest="cache_size", type=int, default=DEFAULT_CACHE_SIZE)
+    args = parser.parse_args()
+    if args.transfer_size is not None and args.transfer_size < BASELINE_TRANSFER_SIZE:
+        parser.error(f"argument -X/--transfer-size: must be at least the baseline transfer size of {BASELINE_TRANSFER_SIZE} bytes")
+    main(args.fwpkg_file_path, args.spec_path, args.jobs, args.transfer_size, args.order, args.cache_size)
@@ -0,0 +1,233 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import re
+import copy
+import json
+import argparse
+from pathlib import Path
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import repack
+from python import query
+from python import applicability
+from spec import load_spec
+
+#length fields of the records, recalculated when a package is written
+RECORD_LENGTH_NAMES = ["RecordLength", "DownstreamDeviceRecordLength"]
+
+def remap_bitmap(value, mapping):
+    """
+    This function moves the bits of an ApplicableComponents bitmap to the new indexes of the components. Bits of
+    components that are not kept are dropped
+        Parameters:
+            value: decoded bitmap, e.g. "0x5"
+            mapping: dictionary of old component index to new component index
+    """
+    bits = applicability.set_bits(applicability.bitset(value))
+    return hex(sum(1 << mapping[bit] for bit in bits if bit in mapping))
+
+def component_sources(file_path, components):
+    """
+    This function returns the byte ranges of the component images inside their package, in the format of
+    repack.image_sources
+        Parameters:
+            file_path: path of the package
+            components: ComponentImageInformation entries of the package
+    """
+    return [{"path": Path(file_path), "offset": c["ComponentLocationOffset"], "size": c["ComponentSize"]} for c in components]
+
+def select(output_dict, component_indexes, record_indexes=None):
+    """
+    This function returns a copy of a decoded header keeping only some components, in the given order. The
+    ApplicableComponents bitmaps are rewritten for the new component indexes and records left without any applicable
+    component are dropped
+        Parameters:
+            output_dict: decoded header
+            component_indexes: indexes of the components to keep
+            record_indexes: indexes of the FirmwareDeviceIDRecords to keep, they are kept even without components.
+                            All the records with a remaining component by default
+    """
+    header = copy.deepcopy(output_dict)
+    mapping = {old: new for new, old in enumerate(component_indexes)}
+    image_area = header["ComponentImageInformationArea"]
+    image_area["ComponentImageInformation"] = [image_area["ComponentImageInformation"][i] for i in component_indexes]
+    for area, records_field, bitmap_field in applicability.BITMAP_FIELDS:
+        if records_field not in header.get(area, {}):
+            continue
+        explicit = record_indexes is not None and records_field == "FirmwareDeviceIDRecords"
+        records = []
+        for i, record in enumerate(header[area][records_field]):
+            if explicit and i not in record_indexes:
+                continue
+            record[bitmap_field] = remap_bitmap(record[bitmap_field], mapping)
+            if explicit or applicability.bitset(record[bitmap_field]):
+                records.append(record)
+        header[area][records_field] = records
+    return header
+
+def write_package(json_data, header, sources, output_path):
+    """
+    This function writes a package from a header and the sources of its images. Counts, lengths, offsets and
+    checksums are recalculated and the images are streamed from their sources into the package
+        Parameters:
+            json_data: spec json
+            header: decoded header of the new package, updated in place
+            sources: source of every component image, see repack.image_sources
+            output_path: path of the new package
+    """
+    header_data = repack.finalize_header(json_data, header, [source["size"] for source in sources])
+    with open(output_path, "wb") as f:
+        f.write(header_data)
+        payload_checksum = repack.image_streaming(f, len(header_data), header["ComponentImageInformationArea"], sources)
+        if "PLDMFWPackagePayloadChecksum" in json_data:
+            #the payload checksum follows the header checksum, only the payload checksum changes
+            header["PLDMFWPackagePayloadChecksum"] = payload_checksum
+            f.seek(0)
+            f.write(repack.search(b"", json_data, header))
+
+def split(file_path, spec_path, output, record_indexes=None):
+    """
+    This function writes one package per firmware device ID record with the record and the components applicable to
+    it. Downstream device records are kept when they apply to one of those components. The images are read directly
+    from the package. A record that applies to no component is skipped when all the records are split, asking for it
+    raises a ValueError. It returns the paths of the new packages
+        Parameters:
+            file_path: path of the package
+            spec_path: version of the spec
+            output: folder in which the split folder is created, parent of the package by default
+            record_indexes: indexes of the records to split out, all of them by default
+    """
+    json_data = load_spec(spec_path)
+    output_dict, _ = query.read_package(file_path, spec_path)
+    index = applicability.build_index(output_dict)
+    components = output_dict["ComponentImageInformationArea"]["ComponentImageInformation"]
+    sources = component_sources(file_path, components)
+    folder = (Path(output) if output is not None else Path(file_path).parent) / "split"
+    folder.mkdir(parents=True, exist_ok=True)
+    skip_empty = record_indexes is None
+    if record_indexes is None:
+        record_indexes = range(len(index["records"]["FirmwareDeviceIDRecords"]))
+    paths = []
+    for record_index in record_indexes:
+        component_indexes = [c for c in applicability.components_for(index, record_index) if c < len(components)]
+        #a package without components would not update anything
+        if not component_indexes:
+            if skip_empty:
+                print(f"Firmware device ID record {record_index} applies to no component, it is skipped")
+                continue
+            raise ValueError(f"Firmware device ID record {record_index} applies to no component, there is nothing to split out")
+        header = select(output_dict, component_indexes, [record_index])
+        output_path = folder / f"{Path(file_path).stem}_record_{record_index}.fwpkg"
+        write_package(json_data, header, [sources[c] for c in component_indexes], output_path)
+        paths.append(output_path)
+    return paths
+
+def record_key(record, bitmap_field):
+    """
+    This function returns what identifies a device record when records of several packages are merged, everything
+    except its applicable components and its length
+        Parameters:
+            record: decoded device record
+            bitmap_field: name of the ApplicableComponents field of the record
+    """
+    return json.dumps({k: v for k, v in record.items() if k != bitmap_field and k not in RECORD_LENGTH_NAMES}, sort_keys=True)
+
+def merge(inputs, spec_path, output_path):
+    """
+    This function writes one package with the components of several packages. The package information comes from the
+    first package. Device records that are identical apart from their applicable components are merged into one
+    record, the others are appended. The images are read directly from the input packages
+        Parameters:
+            inputs: list of (package path, indexes of the components to take or None for all of them)
+            spec_path: version of the spec, the same for all the packages
+            output_path: path of the new package
+    """
+    json_data = load_spec(spec_path)
+    merged = None
+    sources = []
+    #merged records by key for every records field
+    records = {}
+    for file_path, component_indexes in inputs:
+        output_dict, _ = query.read_package(file_path, spec_path)
+        components = output_dict["ComponentImageInformationArea"]["ComponentImageInformation"]
+        if component_indexes is None:
+            component_indexes = list(range(len(components)))
+        header = select(output_dict, component_indexes)
+        shift = len(sources)
+        sources += [component_sources(file_path, components)[i] for i in component_indexes]
+        if merged is None:
+            merged = copy.deepcopy(header)
+            merged["ComponentImageInformationArea"]["ComponentImageInformation"] = []
+        merged["ComponentImageInformationArea"]["ComponentImageInformation"] += header["ComponentImageInformationArea"]["ComponentImageInformation"]
+        bitmap_length = merged["PackageHeaderInformation"]["ComponentBitmapBitLength"]
+        merged["PackageHeaderInformation"]["ComponentBitmapBitLength"] = max(bitmap_length, header["PackageHeaderInformation"]["ComponentBitmapBitLength"])
+        for area, records_field, bitmap_field in applicability.BITMAP_FIELDS:
+            for record in header.get(area, {}).get(records_field, []):
+                bitmap = applicability.bitset(record[bitmap_field]) << shift
+                key = record_key(record, bitmap_field)
+                existing = records.setdefault(records_field, {}).get(key)
+                if existing is None:
+                    record[bitmap_field] = hex(bitmap)
+                    records[records_field][key] = record
+                else:
+                    existing[bitmap_field] = hex(applicability.bitset(existing[bitmap_field]) | bitmap)
+    if merged is None:
+        raise ValueError("No package to merge")
+    for area, records_field, _ in applicability.BITMAP_FIELDS:
+        if records_field in merged.get(area, {}):
+            merged[area][records_field] = list(records.get(records_field, {}).values())
+    #the bitmaps need a bit for every component, in whole bytes
+    information = merged["PackageHeaderInformation"]
+    information["ComponentBitmapBitLength"] = max(information["ComponentBitmapBitLength"], (len(sources) + 7) // 8 * 8)
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    write_package(json_data, merged, sources, output_path)
+    return output_path
+
+def parse_input(text):
+    """
+    This function splits a merge input package.fwpkg:0,2 into the path and the component indexes. Without indexes all
+    the components are taken
+        Parameters:
+            text: merge input
+    """
+    match = re.fullmatch(r"(.+):(\d+(?:,\d+)*)", text)
+    if match:
+        return match.group(1), [int(i) for i in match.group(2).split(",")]
+    return text, None
+
+def main(mode, file_paths, spec_path, output, record_indexes=None):
+    """
+    This function splits a package per device record or merges packages
+        Parameters:
+            mode: split or merge
+            file_paths: package to split, or merge inputs package.fwpkg[:component indexes]
+            spec_path: version of the spec
+            output: folder in which the split or merge folder is created, parent of the first package by default
+            record_indexes: indexes of the records to split out, all of them by default
+    """
+    if mode == "split":
+        for path in split(file_paths[0], spec_path, output, record_indexes):
+            print("The package", path.name, "is available here ", os.path.abspath(path.parent))
+        return
+    inputs = [parse_input(text) for text in file_paths]
+    folder = Path(output) if output is not None else Path(inputs[0][0]).parent
+    path = merge(inputs, spec_path, folder / "merge" / "merged_data.fwpkg")
+    print("The merged file merged_data.fwpkg is available here ", os.path.abspath(path.parent))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-N", "--name", help="split a package per device record or merge packages", dest="name", choices=["split", "merge"], required=True)
+    #take the package to split or the packages to merge
+    parser.add_argument("-F", "--fwpkg-file-path", help="Package to split, or package to merge with optional component indexes, e.g. bundle.fwpkg:0,2", dest="fwpkg_file_path", action="append", required=True)
+    #take the spec version
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0")
+    #take the records to split out
+    parser.add_argument("-R", "--record", help="Index of a firmware device ID record to split out, all of them by default", dest="record", type=int, action="append")
+    parser.add_argument("-E", "--output", required=False, help="output folder")
+    args = parser.parse_args()
+    main(args.name, args.fwpkg_file_path, args.spec_path, args.output, args.record)
@@ -2,12 +2,28 @@ import json
 from datetime import datetime
 import binascii
 import operator
-import sys
 import zlib
+import io
+import tarfile
+import tempfile
+import contextlib
 import argparse
-import os
 from pathlib import Path
+import functools
 from functools import reduce
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from spec import load_spec
+from python import header_stream
+from python import crc
+from python import output_writer
+from python import range_source
+from python import compressed_image
+from python import record_decode
 
 #to store the output of PackageHeaderInformation
 #will be used to extract the length of ApplicableComponents stored in ComponentBitmapBitLength
@@ -18,6 +34,9 @@ header_checksum_data = b""
 
 CRC_Match = False
 
+#number of worker processes decoding large device record tables, None or 1 to decode sequentially
+decode_jobs = None
+
 def parse_field(data, data_type):
     """
     This function decodes the data to more readable form depending upon the data type
@@ -187,6 +206,7 @@ def process_count(firmware_data, output_dict, field_name, input_json_data, count
         input_json_data:input json for that specific field
         count_field: value of count field
     """
+    global header_checksum_data
     #First check if count is the first field or not. Store the index for now. 
     count_index = list(input_json_data).index('count')
     #When the count field is indirect and string and has some operation in it
@@ -213,6 +233,14 @@ def process_count(firmware_data, output_dict, field_name, input_json_data, count
     #removing count or it will go into infinite loop
     input_json_data_copy.pop("count")
     
+    #large device record tables are decoded on worker processes, each record starts with its length
+    if count_index == 0 and count > 1 and decode_jobs is not None and decode_jobs > 1:
+        result = record_decode.decode_records(firmware_data, input_json_data_copy, offset, count, info.get("ComponentBitmapBitLength"), decode_jobs)
+        if result is not None:
+            output_dict[field_name], end = result
+            header_checksum_data += firmware_data[offset:end]
+            return end
+
     #Elements will always be a list. Initialize array.
     output_dict[field_name] = []
     #Check if there are elements in the spec before count - these should not be repeated. 
@@ -273,7 +301,99 @@ def search(firmware_data, input_json_data, output_dict, offset):
                 info = output_dict
     return offset
 
-def image_extraction(firmware_data,image_json,folder, dump_header):
+def stream_search(firmware_data, input_json_data, output_dict, offset, header_writer):
+    """
+    This function decodes the header like search and writes every top level section to the header writer as soon
+    as it is decoded. Device ID records are written one at a time and are not kept in output_dict, so the size of the
+    device record tables does not decide the memory used by unpack
+    Parameters:
+        firmware_data: PLDM firmware package
+        input_json_data: spec json
+        output_dict: output dictionary, keeps everything except the streamed device records
+        offset: offset of the header in firmware_data
+        header_writer: HeaderWriter of header_stream
+    """
+    for section_name, section_info in input_json_data.items():
+        #a section without record lists or a field of the top level
+        if "length" in section_info or not any(isinstance(v, dict) and "count" in v for v in section_info.values()):
+            offset = search(firmware_data, {section_name: section_info}, output_dict, offset)
+            header_writer.write([section_name], output_dict[section_name])
+            continue
+        output_dict[section_name] = {}
+        for field_name, field_info in section_info.items():
+            if not (isinstance(field_info, dict) and "count" in field_info):
+                offset = search(firmware_data, {field_name: field_info}, output_dict[section_name], offset)
+                header_writer.write([section_name, field_name], output_dict[section_name][field_name])
+                continue
+            #count of the records is a field decoded just before
+            count = output_dict[section_name][field_info["count"]]
+            record_json_data = {k: v for k, v in field_info.items() if k != "count"}
+            records = []
+            for i in range(count):
+                record = {}
+                offset = search(firmware_data, record_json_data, record, offset)
+                header_writer.write([section_name, field_name, i], record)
+                if field_name not in header_stream.STREAMED_RECORDS:
+                    records.append(record)
+            if records:
+                output_dict[section_name][field_name] = records
+    return offset
+
+class MemoryReader:
+    """
+    File like reader over a part of the package, tarfile copies the images out of it without another copy in memory
+    """
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.position = 0
+
+    def read(self, size=-1):
+        end = len(self.view) if size < 0 else self.position + size
+        chunk = self.view[self.position:end]
+        self.position += len(chunk)
+        return chunk
+
+class RangeReader:
+    """
+    File like reader over a byte range of a range source, tarfile copies the range out of it while it is fetched
+    piece by piece. The pieces are added to checksum when one is given
+    """
+    def __init__(self, source, offset, size, checksum=None):
+        self.chunks = range_source.fetch_ranges(source, [(offset, size)])
+        self.checksum = checksum
+        self.view = memoryview(b"")
+
+    def read(self, size=-1):
+        pieces = []
+        while size != 0:
+            if not self.view:
+                _, self.view = next(self.chunks, (None, memoryview(b"")))
+                if not self.view:
+                    break
+                if self.checksum is not None:
+                    self.checksum.update(self.view)
+            piece = self.view if size < 0 else self.view[:size]
+            self.view = self.view[len(piece):]
+            pieces.append(piece)
+            size -= len(piece) if size > 0 else 0
+        return pieces[0] if len(pieces) == 1 else b"".join(pieces)
+
+def add_archive_member(archive, name, reader, size, mtime):
+    """
+    This function appends a file to the tar archive written by unpack
+        Parameters:
+            archive: tarfile opened for writing
+            name: name of the member
+            reader: file like object the content of the member is read from
+            size: size of the member
+            mtime: modification time of the member, the one of the package so the same package gives the same archive
+    """
+    member = tarfile.TarInfo(name)
+    member.size = size
+    member.mtime = mtime
+    archive.addfile(member, reader)
+
+def image_extraction(firmware_data,image_json,folder, dump_header, writer=None, compression=None, level=None):
     """
     This function extracts the images from the firmware package and creates bin files using identifier and version as the file name
         Parameters:
@@ -281,8 +401,13 @@ def image_extraction(firmware_data,image_json,folder, dump_header):
             image_json: image dictionary from spec
             folder: output folder
             dump_header: flag to indicate whether to dump only header.json or extract images too
+            writer: OutputWriter the images are written with instead of the output folder
+            compression: zlib or lzma to store the images compressed as <name>.bin.pldmz, None to store them as they are
+            level: compression level, the default level of the codec by default
+    It returns the checksum of the images placed one after the other
     """
-    payload_data = b''
+    payload_crc = crc.ParallelCrc32()
+    firmware_view = memoryview(firmware_data)
     count = image_json["ComponentImageCount"]
     for i in range(count):
         file_name_version = image_json['ComponentImageInformation'][i]['ComponentVersionString']
@@ -292,75 +417,269 @@ def image_extraction(firmware_data,image_json,folder, dump_header):
         image_start = image_json['ComponentImageInformation'][i]['ComponentLocationOffset']
         #from the output file extracting the index where the image ends
         image_end = image_start+image_json['ComponentImageInformation'][i]['ComponentSize']
-        image_data = firmware_data[image_start:image_end]
-        payload_data+=image_data
+        image_data = firmware_view[image_start:image_end]
+        payload_crc.update(image_data)
+        if dump_header:
+            continue
+        encode = None
+        if compression is not None:
+            #repack decompresses the images while it streams them into the bundle
+            file_name += compressed_image.SUFFIX
+            encode = functools.partial(compressed_image.compress_image, codec=compression, level=level)
+        if writer is not None:
+            writer.write(file_name, image_data, encode)
+            continue
         file_name_path = folder/file_name
-        if not dump_header:
-            with open(file_name_path,'wb') as f:
-                f.write(image_data)
+        with open(file_name_path,'wb') as f:
+            f.write(encode(image_data) if encode else image_data)
     #extracting the sign key and creating a bin file for it
     lastImage = count-1
     start = image_json['ComponentImageInformation'][lastImage]['ComponentLocationOffset'] + image_json['ComponentImageInformation'][lastImage]['ComponentSize']
-    end = sys.getsizeof(firmware_data)
-    remaining_data = firmware_data[start:end]
+    remaining_data = firmware_view[start:]
     if not dump_header:
-        with open(folder/"remaining_firmwareData.bin",'wb') as f:
-            f.write(remaining_data)
-    return payload_data
+        if writer is not None:
+            writer.write("remaining_firmwareData.bin", remaining_data)
+        else:
+            with open(folder/"remaining_firmwareData.bin",'wb') as f:
+                f.write(remaining_data)
+    return payload_crc.value()
         
-def main(file_path,output,spec_path, dump_header):
+def select_components(component_indexes, count):
+    """
+    This function checks the indexes of the components to extract and returns them without the repeated ones, in the
+    order they were given. An index that is not a component of the package raises a ValueError
+        Parameters:
+            component_indexes: indexes of the components to extract
+            count: ComponentImageCount of the package
+    """
+    for i in component_indexes:
+        if not 0 <= i < count:
+            raise ValueError(f"Component index {i} is out of range, the package has {count} components, 0 to {count - 1}")
+    return list(dict.fromkeys(component_indexes))
+
+def range_extraction(source, image_json, writer, dump_header, component_indexes=None, compression=None, level=None):
+    """
+    This function fetches the component images and the remaining data from a range source, e.g. a package on an http
+    server, and writes them with the writer. Only the ranges of the selected components are fetched, ranges next to
+    each other are fetched by the same requests. It returns the checksum of the images placed one after the other,
+    None when only some components were fetched
+        Parameters:
+            source: range source of the package
+            image_json: image dictionary from spec
+            writer: OutputWriter of the unpack folder
+            dump_header: flag to indicate whether to dump only header.json or extract images too
+            component_indexes: indexes of the components to extract, all of them and the remaining data by default
+            compression: zlib or lzma to store the images compressed, None to store them as they are
+            level: compression level
+    """
+    components = image_json['ComponentImageInformation']
+    count = image_json["ComponentImageCount"]
+    if component_indexes is not None:
+        component_indexes = select_components(component_indexes, count)
+    if dump_header:
+        return None
+    names = []
+    ranges = []
+    suffix = compressed_image.SUFFIX if compression is not None else ""
+    for i in (range(count) if component_indexes is None else component_indexes):
+        names.append(components[i]['ComponentIdentifier'] + "_" + components[i]['ComponentVersionString'] + "_image_" + str(i) + ".bin" + suffix)
+        ranges.append((components[i]['ComponentLocationOffset'], components[i]['ComponentSize']))
+    if component_indexes is None:
+        #the remaining data starts after the last image and ends with the package
+        start = components[count - 1]['ComponentLocationOffset'] + components[count - 1]['ComponentSize']
+        names.append("remaining_firmwareData.bin")
+        ranges.append((start, source.size - start))
+    checksums = [0] * len(ranges)
+    with contextlib.ExitStack() as stack:
+        files = [stack.enter_context(open(writer.path(name), 'wb')) for name in names]
+        if compression is not None:
+            #the images are compressed while they are fetched, the remaining data is stored as it is
+            image_count = len(files) - (component_indexes is None)
+            files[:image_count] = [compressed_image.CompressedImageWriter(f, size, compression, level) for f, (_, size) in zip(files[:image_count], ranges)]
+        for i, chunk in range_source.fetch_ranges(source, ranges):
+            files[i].write(chunk)
+            checksums[i] = zlib.crc32(chunk, checksums[i])
+        if compression is not None:
+            for f in files[:image_count]:
+                f.close()
+    if component_indexes is not None:
+        return None
+    payload_checksum = 0
+    for checksum, (_, size) in zip(checksums[:count], ranges[:count]):
+        payload_checksum = crc.crc32_combine(payload_checksum, checksum, size)
+    return payload_checksum
+
+def archive_extraction(source, image_json, archive, dump_header, mtime, compression=None, level=None):
+    """
+    This function streams the component images and the remaining data of a range source into the tar archive, they
+    are fetched piece by piece while tarfile writes them. A compressed image is compressed to a temporary file first,
+    the size of a member is written before its data. It returns the checksum of the images placed one after the other
+        Parameters:
+            source: range source of the package
+            image_json: image dictionary from spec
+            archive: tarfile opened for writing
+            dump_header: flag to indicate whether to archive only the header, the images are still checksummed
+            mtime: modification time of the members
+            compression: zlib or lzma to store the images compressed, None to store them as they are
+            level: compression level
+    """
+    payload_crc = crc.ParallelCrc32()
+    components = image_json['ComponentImageInformation']
+    count = image_json["ComponentImageCount"]
+    for i in range(count):
+        file_name = components[i]['ComponentIdentifier'] + "_" + components[i]['ComponentVersionString'] + "_image_" + str(i) + ".bin"
+        offset, size = components[i]['ComponentLocationOffset'], components[i]['ComponentSize']
+        if dump_header:
+            for _, chunk in range_source.fetch_ranges(source, [(offset, size)]):
+                payload_crc.update(chunk)
+            continue
+        if compression is None:
+            add_archive_member(archive, file_name, RangeReader(source, offset, size, payload_crc), size, mtime)
+            continue
+        with tempfile.TemporaryFile() as f:
+            image_writer = compressed_image.CompressedImageWriter(f, size, compression, level)
+            for _, chunk in range_source.fetch_ranges(source, [(offset, size)]):
+                payload_crc.update(chunk)
+                image_writer.write(chunk)
+            image_writer.close()
+            compressed_size = f.tell()
+            f.seek(0)
+            add_archive_member(archive, file_name + compressed_image.SUFFIX, f, compressed_size, mtime)
+    if not dump_header:
+        start = components[count - 1]['ComponentLocationOffset'] + components[count - 1]['ComponentSize']
+        add_archive_member(archive, "remaining_firmwareData.bin", RangeReader(source, start, source.size - start), source.size - start, mtime)
+    return payload_crc.value()
+
+def write_archive(source, spec_data, dump_header, header_format, archive_file, compression=None, level=None):
+    """
+    This function decodes the header and streams it, the component images and the remaining data into a tar archive
+    instead of the unpack folder. The members are named like the files of the unpack folder, the header comes first.
+    Only the header is held in memory, the rest of the package is streamed from the source. The members get the
+    modification time of the package, 0 when the source does not know it. It returns the decoded header and the payload
+    checksum
+        Parameters:
+            source: range source of the package
+            spec_data: spec json
+            dump_header: flag to indicate whether to archive only the header
+            header_format: json, compact or ndjson
+            archive_file: binary file the archive is written to, it does not have to be seekable
+            compression: zlib or lzma to store the images compressed, None to store them as they are
+            level: compression level
+    """
+    firmware_data = range_source.read_header_bytes(source)
+    output_dict = {}
+    if header_format == "json":
+        search(firmware_data, spec_data, output_dict, 0)
+        header_text = json.dumps(output_dict, indent=4)
+    else:
+        header_buffer = io.StringIO()
+        header_writer = header_stream.HeaderWriter(header_buffer, header_format)
+        try:
+            stream_search(firmware_data, spec_data, output_dict, 0, header_writer)
+        finally:
+            header_writer.close()
+        header_text = header_buffer.getvalue()
+    mtime = source.mtime if source.mtime is not None else 0
+    header_data = header_text.encode()
+    with tarfile.open(fileobj=archive_file, mode="w|") as archive:
+        add_archive_member(archive, "header.ndjson" if header_format == "ndjson" else "header.json", MemoryReader(header_data), len(header_data), mtime)
+        payload_checksum = archive_extraction(source, output_dict["ComponentImageInformationArea"], archive, dump_header, mtime, compression, level)
+    return output_dict, payload_checksum
+
+def main(file_path,output,spec_path, dump_header, header_format="json", archive=None, components=None, compression=None, level=None, jobs=None):
+    global header_checksum_data
+    global decode_jobs
+    decode_jobs = jobs
+    if archive == "-":
+        #the archive is written to stdout, the messages of unpack go to stderr
+        archive_file = sys.stdout.buffer
+        with contextlib.redirect_stdout(sys.stderr):
+            return main(file_path, output, spec_path, dump_header, header_format, archive_file, components, compression, level, jobs)
+    #decoded bytes of a previous package must not be part of the header checksum
+    header_checksum_data = b""
+    spec_data = load_spec(spec_path)
+    #packages on an http server, archived or of which only some components are extracted, are read range by range
+    source = range_source.open_source(file_path) if range_source.is_url(file_path) or components is not None or archive is not None else None
+    try:
+        return unpack_package(file_path, output, spec_data, dump_header, header_format, archive, components, source, compression, level)
+    finally:
+        if source is not None:
+            source.close()
+            print(f"Fetched {source.bytes_read} bytes of {source.name} in {source.requests} requests")
+
+def unpack_package(file_path, output, spec_data, dump_header, header_format, archive, components, source, compression=None, level=None):
+    """
+    This function decodes a package and writes the unpack folder or the tar archive, see main
+        Parameters:
+            source: range source the package is read from, None to read the whole local package
+    """
+    if archive is not None:
+        #the archive is streamed from the source, the package is never read as a whole
+        if isinstance(archive, (str, os.PathLike)):
+            with open(archive, "wb") as archive_file:
+                output_dict, payload_checksum = write_archive(source, spec_data, dump_header, header_format, archive_file, compression, level)
+        else:
+            output_dict, payload_checksum = write_archive(source, spec_data, dump_header, header_format, archive, compression, level)
+        return payload_check(spec_data, output_dict, payload_checksum)
+
     file = Path(file_path)
-    #name of main folder
-    output_folder = (file.parent)
+    #name of main folder, the current folder for a package on an http server
+    output_folder = (file.parent) if not range_source.is_url(file_path) else Path(".")
     if(output != None):
         output=Path(output)
     #this is for handling error injection folder problem
     folder = output or output_folder
-    # create the output folder if it does not exist
-    if not os.path.exists(folder):
-        os.mkdir(folder)
-        
-    spec_path += ".json"
-    spec_json_file_path = os.path.join("spec",spec_path)
-    
+    #the output folder is created by the writer, and removed again when nothing could be written in it
+
     # For header extraction
-    with open(spec_json_file_path, 'r') as json_file:
-        spec_data = json.load(json_file)
-    with open(file_path, 'rb') as firmware_file:
-        firmware_data = firmware_file.read()
+    if source is not None:
+        #only the header is read, the images are fetched range by range
+        firmware_data = range_source.read_header_bytes(source)
+    else:
+        with open(file_path, 'rb') as firmware_file:
+            firmware_data = firmware_file.read()
     output_dict = {}
     offset = 0
-    firmware_data=search(firmware_data, spec_data, output_dict, offset)
+    if header_format == "json":
+        offset=search(firmware_data, spec_data, output_dict, offset)
 
-    # make unpack folder
-    new_path = folder / "unpack"
-    
-    if new_path.exists():
-        # Find the highest backup number
-        backup_number = 1
-        while (folder / f"unpack_backup_{backup_number}").exists():
-            backup_number += 1
-
-        # Rename existing unpack folder
-        new_path.rename(folder / f"unpack_backup_{backup_number}")
-    new_path.mkdir()
-
-    output_json = new_path/"header.json" #unpack folder inside worspace 
-    with open(output_json, "w") as file:
-        json.dump(output_dict, file, indent=4)
+    # make unpack folder, it is written next to the unpack folder and replaces it once complete
+    # an existing unpack folder is renamed to the next backup
+    with output_writer.OutputWriter(folder, "unpack", "unpack_backup_") as writer:
+        if header_format == "json":
+            output_json = writer.path("header.json") #unpack folder inside worspace 
+            with open(output_json, "w") as file:
+                json.dump(output_dict, file, indent=4)
+        else:
+            #the header is written while it is decoded
+            output_json = writer.path("header.ndjson" if header_format == "ndjson" else "header.json")
+            header_writer = header_stream.HeaderWriter(output_json, header_format)
+            try:
+                offset = stream_search(firmware_data, spec_data, output_dict, offset, header_writer)
+            finally:
+                header_writer.close()
 
-    # For image extraction
-    with open(file_path, 'rb') as firmware_file:
-        firmware_data_new = firmware_file.read()
+        # For image extraction
+        image_json = output_dict["ComponentImageInformationArea"]
 
-    with open(output_json, 'r') as f:
-        output_dict_data = json.load(f)
+        if source is not None:
+            payload_checksum = range_extraction(source, image_json, writer, dump_header, components, compression, level)
+        else:
+            payload_checksum = image_extraction(firmware_data,image_json,None, dump_header, writer=writer, compression=compression, level=level)
+    return payload_check(spec_data, output_dict, payload_checksum)
 
-    image_json = output_dict_data["ComponentImageInformationArea"]
-    
-    payload_data = image_extraction(firmware_data_new,image_json,new_path, dump_header)
+def payload_check(spec_data, output_dict, payload_checksum):
+    """
+    This function prints the payload checksums and returns whether the header and the payload checksums match
+        Parameters:
+            spec_data: spec json
+            output_dict: decoded header
+            payload_checksum: calculated checksum of the component images, None when not all of them were read
+    """
+    if payload_checksum is None and "PLDMFWPackagePayloadChecksum" in spec_data:
+        print("Payload Checksum not calculated, only some of the component images were read")
+        return CRC_Match
     if "PLDMFWPackagePayloadChecksum" in spec_data:
-        payload_checksum = zlib.crc32(payload_data)
         print("Unpacked Payload Checksum = ", output_dict["PLDMFWPackagePayloadChecksum"])
         print("Calculated Payload Checksum = ", payload_checksum)
         if output_dict["PLDMFWPackagePayloadChecksum"] == payload_checksum:
@@ -381,15 +700,31 @@ if __name__ == '__main__':
     parser.add_argument("-D", "--dump_header_json", help="Dump Header.json from bundle", dest="dump_header_json", action="store_true", required=False)
     # take the output path in which unpacked data/header.json file will be stored
     # parser.add_argument("-O", "--output", help="Provide directory path for storing output data", dest="output", required=False)
+    # format of the header file, compact and ndjson are written while the header is decoded
+    parser.add_argument("-H", "--header-format", help="Format of the header file", dest="header_format", choices=["json", "compact", "ndjson"], default="json")
+    # write a tar archive instead of the unpack folder, - for stdout
+    parser.add_argument("-A", "--archive", help="Tar archive written instead of the unpack folder, - for stdout", dest="archive", required=False)
+    # extract only some components, only their bytes are read
+    parser.add_argument("-K", "--component", help="Index of a component to extract, only the header and the selected components are read", dest="component", type=int, action="append")
+    # store the component images compressed, repack decompresses them while it streams them into the bundle
+    parser.add_argument("-Z", "--compress", help="Store the component images compressed with this codec", dest="compress", choices=["zlib", "lzma"])
+    parser.add_argument("-L", "--level", help="Compression level of -Z, 0 to 9", dest="level", type=int, choices=range(10))
+    # number of processes decoding large device record tables
+    parser.add_argument("-J", "--jobs", help="Number of processes decoding large device record tables, sequential decoding by default", dest="jobs", type=int)
+    # flush the output folder to the disk before it is published
+    parser.add_argument("-Y", "--sync", help="Flush the files of the output folder to the disk before publishing it", dest="sync", action="store_true")
     args = parser.parse_args()
+    output_writer.sync_output = args.sync
     file_path = args.fwpkg_file_path
     spec_path = args.spec_path
     dump_header = args.dump_header_json
     output_dir = args.output
-    if main(file_path, output_dir, spec_path, dump_header):
-        print("Unpack was successful. CRC matches! Package is PLDM compliant.")
+    #messages must not end up in an archive written to stdout
+    message_file = sys.stderr if args.archive == "-" else sys.stdout
+    if main(file_path, output_dir, spec_path, dump_header, args.header_format, args.archive, args.component, args.compress, args.level, args.jobs):
+        print("Unpack was successful. CRC matches! Package is PLDM compliant.", file=message_file)
     else:
-        print("Unpack completed. CRC mismatch detected! Package is NOT PLDM compliant.")
+        print("Unpack completed. CRC mismatch detected! Package is NOT PLDM compliant.", file=message_file)
     
 
     
\ No newline at end of file
@@ -0,0 +1,201 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import json
+import copy
+import queue
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import repack
+from python import crc
+from spec import load_spec
+
+#chunks read ahead of the slowest writer thread, every chunk is shared by all the threads
+QUEUED_CHUNKS = 8
+
+def apply_overrides(base, overrides):
+    """
+    This function returns a copy of the base header with the overrides of a variant applied. Dictionaries are merged
+    field by field, a list can be merged entry by entry with a dictionary keyed by index, any other value replaces the
+    value of the base header
+        Parameters:
+            base: base header dictionary
+            overrides: overrides of the variant
+    """
+    if isinstance(base, dict) and isinstance(overrides, dict):
+        merged = dict(base)
+        for key, value in overrides.items():
+            merged[key] = apply_overrides(base[key], value) if key in base else copy.deepcopy(value)
+        return merged
+    if isinstance(base, list) and isinstance(overrides, dict):
+        merged = list(base)
+        for index, value in overrides.items():
+            merged[int(index)] = apply_overrides(base[int(index)], value)
+        return merged
+    return copy.deepcopy(overrides)
+
+def payload_checksum(sources):
+    """
+    This function calculates the payload checksum of images placed one after the other
+        Parameters:
+            sources: image sources returned by repack.image_sources
+    """
+    return crc.crc32_ranges([(source["path"], source["offset"], source["size"]) for source in sources])
+
+def write_files(files, chunks):
+    """
+    This function writes the chunks of a queue to files until it gets None. After an error the remaining chunks are
+    still taken from the queue, so the reader is never blocked, and the error is raised at the end
+        Parameters:
+            files: files written by the thread
+            chunks: queue of the chunks
+    """
+    error = None
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            break
+        if error is not None:
+            continue
+        try:
+            for f in files:
+                f.write(chunk)
+        except OSError as e:
+            error = e
+    if error is not None:
+        raise error
+
+def write_variants(outputs, sources, remaining_source, jobs):
+    """
+    This function writes all the variants sharing the same images. Every chunk of every image is read once and
+    written to all the output files. With several jobs the files are shared out between the threads, every thread
+    writes the whole stream to its own files
+        Parameters:
+            outputs: list of (output path, encoded header)
+            sources: image sources shared by the variants
+            remaining_source: source of the data following the images, None if there is none
+            jobs: number of threads writing the output files
+    """
+    files = [open(path, "wb") for path, _ in outputs]
+    try:
+        for (_, header), f in zip(outputs, files):
+            f.write(header)
+        chunks = (chunk for source in sources + ([remaining_source] if remaining_source else []) for chunk in repack.read_source(source))
+        thread_count = min(jobs or 1, len(files))
+        if thread_count < 2:
+            for chunk in chunks:
+                for f in files:
+                    f.write(chunk)
+            return
+        queues = [queue.Queue(maxsize=QUEUED_CHUNKS) for _ in range(thread_count)]
+        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+            futures = [executor.submit(write_files, files[i::thread_count], queues[i]) for i in range(thread_count)]
+            try:
+                for chunk in chunks:
+                    for chunk_queue in queues:
+                        chunk_queue.put(chunk)
+            finally:
+                for chunk_queue in queues:
+                    chunk_queue.put(None)
+            for future in futures:
+                future.result()
+    finally:
+        for f in files:
+            f.close()
+
+def check_names(variants):
+    """
+    This function checks that every variant has its own name, the name of its output file. Names differing only in
+    case are the same file on Windows
+        Parameters:
+            variants: variants of the variants file
+    """
+    seen = {}
+    for variant in variants:
+        name = variant["name"]
+        if name.casefold() in seen:
+            raise ValueError(f"The variant name {name} is used twice, the second variant would overwrite {seen[name.casefold()]}.fwpkg")
+        seen[name.casefold()] = name
+
+def main(file_path, variants_path, output, spec_path, jobs=1, manifest_path=None):
+    """
+    This function builds every variant described in the variants file from one unpack folder. The header parts that
+    are the same between variants are encoded once, the payload checksum is calculated once for variants sharing the
+    same images and the images are read once for all the variants
+        {
+            "variants": [
+                {"name": "sku_a", "overrides": {"FirmwareDeviceIdentificationArea": {"FirmwareDeviceIDRecords": {"0": {"ApplicableComponents": "0x3"}}}}},
+                {"name": "sku_b", "overrides": {...}}
+            ]
+        }
+        Parameters:
+            file_path: unpack folder with the base header.json and the images
+            variants_path: variants json file
+            output: folder in which the variants folder is created, parent of the unpack folder by default
+            spec_path: version of the spec
+            jobs: number of threads writing the output files
+            manifest_path: optional manifest mapping the components to their source files
+    """
+    folder = Path(output) if output != None else Path(file_path).parent
+
+    json_data = load_spec(spec_path)
+
+    with open(os.path.join(file_path, "header.json"), "r") as f:
+        base = json.load(f)
+    with open(variants_path, "r") as f:
+        variants = json.load(f)["variants"]
+    check_names(variants)
+
+    manifest = repack.load_manifest(manifest_path) if manifest_path else None
+    remaining_source = manifest["remaining_firmwareData"] if manifest else None
+    if remaining_source is None and Path(file_path, "remaining_firmwareData.bin").exists():
+        remaining_source = {"path": Path(file_path, "remaining_firmwareData.bin"), "offset": 0}
+    if remaining_source is not None and "size" not in remaining_source:
+        remaining_source["size"] = os.path.getsize(remaining_source["path"]) - remaining_source["offset"]
+
+    new_path = folder / "variants"
+    new_path.mkdir(parents=True, exist_ok=True)
+
+    #encoded header parts and payload checksums shared between the variants
+    cache = {}
+    checksums = {}
+    groups = {}
+    for variant in variants:
+        output_dict = apply_overrides(base, variant.get("overrides", {}))
+        sources = repack.image_sources(output_dict["ComponentImageInformationArea"], file_path, manifest)
+        key = tuple((str(source["path"]), source["offset"], source["size"]) for source in sources)
+        if "PLDMFWPackagePayloadChecksum" in json_data:
+            if key not in checksums:
+                checksums[key] = payload_checksum(sources)
+            output_dict["PLDMFWPackagePayloadChecksum"] = checksums[key]
+        header = repack.finalize_header(json_data, output_dict, [source["size"] for source in sources], cache)
+        groups.setdefault(key, (sources, []))[1].append((new_path / (variant["name"] + ".fwpkg"), header))
+
+    for sources, outputs in groups.values():
+        write_variants(outputs, sources, remaining_source, jobs)
+    for _, outputs in groups.values():
+        for path, _ in outputs:
+            print("The variant", path.name, "is available here ", os.path.abspath(path.parent))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    #take the unpack folder having the base header.json and the images
+    parser.add_argument("-F", "--fwpkg-file-path", help="Unpack folder with the base header and images", dest="fwpkg_file_path", required=True)
+    #take the spec version
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0")
+    #take the variants file
+    parser.add_argument("-V", "--variants", help="Variants json file with the overrides of every variant", dest="variants", required=True)
+    #number of threads writing the variants
+    parser.add_argument("-J", "--jobs", help="Number of threads writing the variants", dest="jobs", type=int, default=1)
+    #takes the manifest that maps the components to their source files
+    parser.add_argument("-M", "--manifest", required=False, help="Manifest mapping components to image files or package byte ranges", dest="manifest")
+    parser.add_argument("-E", "--output", required=False, help="output folder")
+    args = parser.parse_args()
+    main(args.fwpkg_file_path, args.variants, args.output, args.spec_path, args.jobs, args.manifest)
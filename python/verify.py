@@ -0,0 +1,77 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import argparse
+from pathlib import Path
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import unpack
+from python import query
+from python import crc
+from spec import load_spec
+
+def verify(file_path, spec_path, jobs=None):
+    """
+    This function checks the header checksum and the payload checksum of a package without unpacking it. Only the
+    header is decoded, the images are read in chunks that are checksummed in parallel. It returns whether both match
+        Parameters:
+            file_path: path of the package
+            spec_path: version of the spec
+            jobs: number of threads used for the payload checksum, all the CPUs by default
+    """
+    spec_data = load_spec(spec_path)
+    firmware_data = query.read_header_bytes(file_path)
+    output_dict = {}
+    unpack.header_checksum_data = b""
+    unpack.search(firmware_data, spec_data, output_dict, 0)
+    unpack.header_checksum_data = b""
+    header_crc_match = unpack.CRC_Match
+    if "PLDMFWPackagePayloadChecksum" not in spec_data:
+        return header_crc_match
+    file_size = os.path.getsize(file_path)
+    ranges = []
+    for i, component in enumerate(output_dict["ComponentImageInformationArea"]["ComponentImageInformation"]):
+        start, size = component["ComponentLocationOffset"], component["ComponentSize"]
+        if start + size > file_size:
+            print(f"Component {i} ends at {start + size}, after the end of the package at {file_size}")
+            return False
+        ranges.append((file_path, start, size))
+    payload_checksum = crc.crc32_ranges(ranges, jobs)
+    print("Unpacked Payload Checksum = ", output_dict["PLDMFWPackagePayloadChecksum"])
+    print("Calculated Payload Checksum = ", payload_checksum)
+    return header_crc_match and output_dict["PLDMFWPackagePayloadChecksum"] == payload_checksum
+
+def main(file_path, spec_path, jobs=None):
+    """
+    This function verifies a package or every package of a folder and returns whether all of them are valid
+        Parameters:
+            file_path: package or folder of packages
+            spec_path: version of the spec
+            jobs: number of threads used for the payload checksum, all the CPUs by default
+    """
+    path = Path(file_path)
+    packages = sorted(path.glob("*.fwpkg")) if path.is_dir() else [path]
+    valid = True
+    for package in packages:
+        if verify(package, spec_path, jobs):
+            print(f"{package}: CRC matches! Package is PLDM compliant.")
+        else:
+            print(f"{package}: CRC mismatch detected! Package is NOT PLDM compliant.")
+            valid = False
+    return valid
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    #take fwpkg file name or a folder of fwpkg files
+    parser.add_argument("-F", "--fwpkg-file-path", help="PLDM FW update package or folder of packages", dest="fwpkg_file_path", required=True)
+    #take the spec version
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0")
+    #number of threads calculating the payload checksum
+    parser.add_argument("-J", "--jobs", help="Number of threads calculating the payload checksum", dest="jobs", type=int)
+    args = parser.parse_args()
+    if not main(args.fwpkg_file_path, args.spec_path, args.jobs):
+        sys.exit(1)
@@ -0,0 +1,256 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import json
+import time
+import zlib
+import shutil
+import argparse
+from pathlib import Path
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import repack
+from python import header_stream
+from python import crc
+from spec import load_spec
+
+#seconds between two looks at the unpack folder
+POLL_INTERVAL = 0.5
+
+#seconds the unpack folder has to stay unchanged before the bundle is built, editors write files in several steps
+DEBOUNCE_DELAY = 0.3
+
+def snapshot(folder):
+    """
+    This function returns the size, modification time and change time of every file of the unpack folder. The change
+    time is set by every write, also when the modification time is restored, e.g. by cp -p or tar
+        Parameters:
+            folder: unpack folder
+    """
+    files = {}
+    for entry in os.scandir(folder):
+        if entry.is_file():
+            stat = entry.stat()
+            files[entry.name] = (stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+    return files
+
+def load_header(folder):
+    """
+    This function loads header.json or header.ndjson of the unpack folder
+        Parameters:
+            folder: unpack folder
+    """
+    if (folder / "header.json").exists():
+        with open(folder / "header.json", "r") as f:
+            return json.load(f)
+    return header_stream.load_header(folder / "header.ndjson")
+
+def changed_spans(old, new):
+    """
+    This function returns the (start, end) ranges in which two byte strings of the same length differ
+        Parameters:
+            old: previous bytes
+            new: new bytes
+    """
+    spans = []
+    start = None
+    for i, (a, b) in enumerate(zip(old, new)):
+        if a != b and start is None:
+            start = i
+        elif a == b and start is not None:
+            spans.append((start, i))
+            start = None
+    if start is not None:
+        spans.append((start, len(new)))
+    return spans
+
+def copy_source(f, source, position, checksum_needed):
+    """
+    This function writes a source at a position of the bundle and returns its CRC32 when it is needed
+        Parameters:
+            f: bundle opened for writing
+            source: image or remaining data source
+            position: offset of the source in the bundle
+            checksum_needed: whether the CRC32 of the source has to be calculated
+    """
+    f.seek(position)
+    source_crc = crc.ParallelCrc32() if checksum_needed else None
+    for chunk in repack.read_source(source):
+        f.write(chunk)
+        if source_crc is not None:
+            source_crc.update(chunk)
+    return source_crc.value() if source_crc is not None else None
+
+def header_offsets(components, header_len, sizes):
+    """
+    This function returns the ComponentLocationOffsets of header.json when the images fit them: every image has its
+    ComponentSize and starts after the header and the previous image. It returns None otherwise
+        Parameters:
+            components: ComponentImageInformation of the header
+            header_len: length of the encoded header
+            sizes: size of every component image
+    """
+    position = header_len
+    offsets = []
+    for component, size in zip(components, sizes):
+        if component["ComponentSize"] != size or component["ComponentLocationOffset"] < position:
+            return None
+        offsets.append(component["ComponentLocationOffset"])
+        position = component["ComponentLocationOffset"] + size
+    return offsets
+
+def payload_checksum(header_len, offsets, sizes, checksums):
+    """
+    This function combines the CRC32s of the images and of the padding between them into the payload checksum, the
+    checksum repack.image_streaming calculates over everything after the header
+        Parameters:
+            header_len: length of the header
+            offsets: offset of every image in the bundle
+            sizes: size of every image
+            checksums: CRC32 of every image
+    """
+    checksum = 0
+    position = header_len
+    for offset, size, image_checksum in zip(offsets, sizes, checksums):
+        if offset > position:
+            checksum = crc.crc32_combine(checksum, zlib.crc32(bytes(offset - position)), offset - position)
+        checksum = crc.crc32_combine(checksum, image_checksum, size)
+        position = offset + size
+    return checksum
+
+def build(folder, json_data, output_path, state=None):
+    """
+    This function builds the bundle of an unpack folder, header.json itself is not modified. When the images fit the
+    ComponentSizes and ComponentLocationOffsets of header.json the bundle is laid out like repack lays it out, padding
+    and alignment included, so both build the same file. When an image changed size the counts, lengths, offsets and
+    checksums are recalculated and the images are placed back to back, like variants and split do. When the layout of
+    the bundle is the same as in the previous build only the components whose files changed are written again and only
+    the bytes of the header that changed are patched, the CRC32s of the other components are reused. The bundle is
+    patched in a copy that replaces it once complete. It returns the state of this build and the number of
+    (components written, header bytes patched)
+        Parameters:
+            folder: unpack folder
+            json_data: spec json
+            output_path: path of the bundle
+            state: state returned by the previous build, None for a full build
+    """
+    output_dict = load_header(folder)
+    sources = repack.image_sources(output_dict["ComponentImageInformationArea"], folder)
+    remaining_path = folder / "remaining_firmwareData.bin"
+    remaining_source = {"path": remaining_path, "offset": 0, "size": os.path.getsize(remaining_path)} if remaining_path.exists() else None
+    #the states are read from the file system only, a file is read when it changed
+    states = [repack.source_state(source) for source in sources]
+    remaining_state = repack.source_state(remaining_source) if remaining_source else None
+    sizes = [source["size"] for source in sources]
+    components = output_dict["ComponentImageInformationArea"]["ComponentImageInformation"]
+    #the size of the header does not depend on the payload checksum
+    header_data = repack.search(b"", json_data, output_dict)
+    offsets = header_offsets(components, len(header_data), sizes)
+    if offsets is None:
+        header_data = repack.finalize_header(json_data, output_dict, sizes)
+        offsets = [component["ComponentLocationOffset"] for component in components]
+    images_end = offsets[-1] + sizes[-1] if sources else len(header_data)
+    total_size = images_end + (remaining_source["size"] if remaining_source else 0)
+    layout = [len(header_data)] + offsets + sizes + [remaining_source["size"] if remaining_source else 0]
+    incremental = (state is not None and state["layout"] == layout and os.path.exists(output_path)
+                   and repack.output_state(output_path) == state["output"])
+    cached_checksums = state["checksums"] if state else {}
+    checksums = [cached_checksums.get(json.dumps(s)) for s in states]
+
+    #the bundle is never patched in place, a build that stops halfway leaves the previous bundle
+    target_path = output_path.with_name(output_path.name + ".tmp")
+    if incremental:
+        shutil.copyfile(output_path, target_path)
+    written = 0
+    try:
+        with open(target_path, "r+b" if incremental else "wb") as f:
+            if not incremental:
+                f.truncate(total_size)
+            for i, (source, offset) in enumerate(zip(sources, offsets)):
+                if incremental and states[i] == state["states"][i]:
+                    continue
+                checksum = copy_source(f, source, offset, checksums[i] is None)
+                if checksum is not None:
+                    checksums[i] = checksum
+                written += 1
+            if remaining_source and not (incremental and remaining_state == state["remaining"]):
+                copy_source(f, remaining_source, images_end, False)
+            if "PLDMFWPackagePayloadChecksum" in json_data:
+                output_dict["PLDMFWPackagePayloadChecksum"] = payload_checksum(len(header_data), offsets, sizes, checksums)
+                header_data = repack.search(b"", json_data, output_dict)
+            spans = changed_spans(state["header"], header_data) if incremental else [(0, len(header_data))]
+            for start, end in spans:
+                f.seek(start)
+                f.write(header_data[start:end])
+        os.replace(target_path, output_path)
+    except BaseException:
+        if target_path.exists():
+            target_path.unlink()
+        raise
+    new_state = {
+        "layout": layout,
+        "header": header_data,
+        "states": states,
+        "remaining": remaining_state,
+        "checksums": {json.dumps(s): checksum for s, checksum in zip(states, checksums)},
+        "output": repack.output_state(output_path),
+    }
+    return new_state, written, sum(end - start for start, end in spans)
+
+def main(file_path, spec_path, output=None, interval=POLL_INTERVAL, debounce=DEBOUNCE_DELAY):
+    """
+    This function watches an unpack folder and rebuilds its bundle every time the folder changed and then stayed
+    unchanged for the debounce delay. It runs until it is interrupted
+        Parameters:
+            file_path: unpack folder
+            spec_path: version of the spec
+            output: folder in which the watch folder is created, parent of the unpack folder by default
+            interval: seconds between two looks at the unpack folder
+            debounce: seconds the folder has to stay unchanged before building
+    """
+    folder = Path(file_path)
+    json_data = load_spec(spec_path)
+    output_folder = (Path(output) if output is not None else folder.parent) / "watch"
+    output_folder.mkdir(parents=True, exist_ok=True)
+    output_path = output_folder / "watched_data.fwpkg"
+    print(f"Watching {os.path.abspath(folder)}, the bundle is written to {os.path.abspath(output_path)}. Press Ctrl+C to stop.")
+    state = None
+    last_snapshot = None
+    try:
+        while True:
+            current = snapshot(folder)
+            if current == last_snapshot:
+                time.sleep(interval)
+                continue
+            #wait until the folder stops changing
+            while True:
+                time.sleep(debounce)
+                settled = snapshot(folder)
+                if settled == current:
+                    break
+                current = settled
+            last_snapshot = current
+            start = time.perf_counter()
+            try:
+                state, written, patched = build(folder, json_data, output_path, state)
+            except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+                #e.g. header.json saved halfway or an image that is not there yet, the next change builds again
+                print(f"Build failed: {e!r}")
+                continue
+            print(f"Built in {(time.perf_counter() - start) * 1000:.1f} ms: {written} components written, {patched} header bytes written")
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rebuilds the bundle of an unpack folder every time it changes")
+    #take the unpack folder
+    parser.add_argument("-F", "--fwpkg-file-path", help="Unpack folder to watch", dest="fwpkg_file_path", required=True)
+    #take the spec version
+    parser.add_argument("-S", "--spec-path", help="Version of the PLDM FW update Spec", dest="spec_path", choices=["pldm_spec_1.0.0","pldm_spec_1.1.0","pldm_spec_1.2.0","pldm_spec_1.3.0"], default="pldm_spec_1.0.0")
+    parser.add_argument("-E", "--output", required=False, help="output folder")
+    args = parser.parse_args()
+    main(args.fwpkg_file_path, args.spec_path, args.output)
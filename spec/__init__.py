@@ -0,0 +1,79 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+import zlib
+import marshal
+
+#folder of the spec json files, independent of the current working directory
+SPEC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+#specs already loaded in this process
+loaded_specs = {}
+
+def spec_file_path(spec_name):
+    """
+    This function returns the path of the json file of a spec
+        Parameters:
+            spec_name: name of the spec without extension, e.g. pldm_spec_1.0.0
+    """
+    return os.path.join(SPEC_DIR, spec_name + ".json")
+
+def load_spec(spec_name):
+    """
+    This function returns the spec dictionary. The precompiled spec of spec/compiled.py is used when it was generated
+    from the current json file, otherwise the json file is parsed. The json file is optional when the spec is
+    precompiled, e.g. inside an executable
+        Parameters:
+            spec_name: name of the spec without extension, e.g. pldm_spec_1.0.0
+    """
+    if spec_name in loaded_specs:
+        return loaded_specs[spec_name]
+    try:
+        from spec import compiled
+        checksum, marshalled = compiled.SPECS.get(spec_name, (None, None))
+    except ImportError:
+        checksum, marshalled = None, None
+    spec_data = None
+    json_file_path = spec_file_path(spec_name)
+    if os.path.exists(json_file_path):
+        with open(json_file_path, 'rb') as json_file:
+            content = json_file.read()
+        #the precompiled spec is stale when the json file was changed after compiling
+        if marshalled is not None and zlib.crc32(content) == checksum:
+            spec_data = marshal.loads(marshalled)
+        else:
+            import json
+            spec_data = json.loads(content)
+    elif marshalled is not None:
+        spec_data = marshal.loads(marshalled)
+    else:
+        raise FileNotFoundError(f"Spec {spec_name} is neither precompiled nor available at {json_file_path}")
+    loaded_specs[spec_name] = spec_data
+    return spec_data
+
+def compile_specs():
+    """
+    This function regenerates spec/compiled.py from all the spec json files. It has to be run after changing a spec
+    json file, a stale precompiled spec is ignored until then
+    """
+    import json
+    lines = [
+        "# Copyright (c) Microsoft Corporation.",
+        "# Licensed under the MIT License.",
+        "",
+        "# Generated by \"python -m spec\" from the spec json files. Do not edit.",
+        "",
+        "SPECS = {",
+    ]
+    for file_name in sorted(os.listdir(SPEC_DIR)):
+        if not file_name.endswith(".json"):
+            continue
+        with open(os.path.join(SPEC_DIR, file_name), 'rb') as json_file:
+            content = json_file.read()
+        spec_data = json.loads(content)
+        #marshal keeps the key order and is the fastest way to rebuild the dictionary
+        lines.append(f"    {file_name[:-len('.json')]!r}: ({zlib.crc32(content)}, {marshal.dumps(spec_data, 4)!r}),")
+    lines.append("}")
+    with open(os.path.join(SPEC_DIR, "compiled.py"), 'w') as f:
+        f.write("\n".join(lines) + "\n")
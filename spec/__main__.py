@@ -0,0 +1,14 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from spec import compile_specs, SPEC_DIR
+
+if __name__ == '__main__':
+    compile_specs()
+    print("Precompiled specs are available here ", os.path.join(SPEC_DIR, "compiled.py"))
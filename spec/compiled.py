@@ -0,0 +1,12 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+# Generated by "python -m spec" from the spec json files. Do not edit.
+
+SPECS = {
+    'pldm_spec': (365433702, b'\xfbz\x18PackageHeaderInformation{z\x17PackageHeaderIdentifier{\xfa\x06length\xe9\x10\x00\x00\x00\xfa\tdata_typez\x04UUID0z\x1bPackageHeaderFormatRevision{r\x01\x00\x00\x00\xe9\x01\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x11PackageHeaderSize{r\x01\x00\x00\x00\xe9\x02\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x16PackageReleaseDateTime{r\x01\x00\x00\x00\xe9\r\x00\x00\x00r\x03\x00\x00\x00z\ttimestamp0z\x18ComponentBitmapBitLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x18PackageVersionStringType{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le\xfa\x06decode{\xfa\x030x0z\x07Unknown\xfa\x030x1z\x05ASCII\xfa\x030x2z\x04UTF8\xfa\x030x3z\x05UTF16\xfa\x030x4z\x07UTF16LE\xfa\x030x5z\x07UTF16BE00z\x1aPackageVersionStringLength{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14PackageVersionString{r\x01\x00\x00\x00z\x1aPackageVersionStringLengthr\x03\x00\x00\x00z\x18PackageVersionStringType00z FirmwareDeviceIdentificationArea{z\x13DeviceIDRecordCount{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17FirmwareDeviceIDRecords{\xfa\x05countz\x13DeviceIDRecordCountz\x0cRecordLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x0fDescriptorCount{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17DeviceUpdateOptionFlags{r\x01\x00\x00\x00\xe9\x04\x00\x00\x00r\x03\x00\x00\x00z\x03int0z"ComponentImageSetVersionStringType{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x07\x00\x00\x00{r\x08\x00\x00\x00z\x07Unknownr\t\x00\x00\x00z\x05ASCIIr\n\x00\x00\x00z\x04UTF8r\x0b\x00\x00\x00z\x05UTF16r\x0c\x00\x00\x00z\x07UTF16LEr\r\x00\x00\x00z\x07UTF16BE00z$ComponentImageSetVersionStringLength{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1fFirmwareDevicePackageDataLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14ApplicableComponents{r\x01\x00\x00\x00z\x18ComponentBitmapBitLengthr\x03\x00\x00\x00z\x06hex-le0z\x1eComponentImageSetVersionString{r\x01\x00\x00\x00z$ComponentImageSetVersionStringLengthr\x03\x00\x00\x00z"ComponentImageSetVersionStringType0z\x11RecordDescriptors{z\x15InitialDescriptorType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x07\x00\x00\x00{\xfa\x050x000z\rPCI Vendor ID\xfa\x050x001z\x12IANA Enterprise ID\xfa\x050x002z\x04UUID\xfa\x050x003z\rPnP Vendor ID\xfa\x050x004z\x0eACPI Vendor ID\xfa\x050x005z\x18IEEE Assigned Company ID\xfa\x050x006z\x0eSCSI Vendor ID00z\x17InitialDescriptorLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x15InitialDescriptorData{r\x01\x00\x00\x00z\x17InitialDescriptorLengthr\x03\x00\x00\x00z\x06hex-le0r\x0e\x00\x00\x00z\x0fDescriptorCountz\x18AdditionalDescriptorType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x07\x00\x00\x00{r\x10\x00\x00\x00z\rPCI Vendor IDr\x11\x00\x00\x00z\x12IANA Enterprise IDr\x12\x00\x00\x00z\x04UUIDr\x13\x00\x00\x00z\rPnP Vendor IDr\x14\x00\x00\x00z\x0eACPI Vendor IDr\x15\x00\x00\x00z\x18IEEE Assigned Company IDr\x16\x00\x00\x00z\x0eSCSI Vendor IDz\x050x100z\rPCI Device IDz\x050x101z\x17PCI Subsystem Vendor IDz\x050x102z\x10PCI Subsystem IDz\x050x103z\x0fPCI Revision IDz\x050x104z\x16PnP Product Identifierz\x050x105z\x17ACPI Product Identifierz\x050x106z ASCII Model Number (Long String)z\x050x107z!ASCII Model Number (Short String)z\x050x108z\x0fSCSI Product IDz\x050x109z\x1aUBM Controller Device Code\xfa\x060xffffz\x0eVendor Defined00z\x1aAdditionalDescriptorLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z"AdditionalDescriptorIdentifierData{r\x01\x00\x00\x00z\x1aAdditionalDescriptorLengthr\x03\x00\x00\x00z\x06hex-ler\x07\x00\x00\x00{z\x0eVendor Defined{z&VendorDefinedDescriptorTitleStringType{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x07\x00\x00\x00{r\x08\x00\x00\x00z\x07Unknownr\t\x00\x00\x00z\x05ASCIIr\n\x00\x00\x00z\x04UTF8r\x0b\x00\x00\x00z\x05UTF16r\x0c\x00\x00\x00z\x07UTF16LEr\r\x00\x00\x00z\x07UTF16BE00z(VendorDefinedDescriptorTitleStringLength{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x03int0z"VendorDefinedDescriptorTitleString{r\x01\x00\x00\x00z(VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z&VendorDefinedDescriptorTitleStringType0z\x1bVendorDefinedDescriptorData{r\x01\x00\x00\x00zEAdditionalDescriptorLength-VendorDefinedDescriptorTitleStringLength-2r\x03\x00\x00\x00z\x06hex-be00000z\x19FirmwareDevicePackageData{r\x01\x00\x00\x00z\x1fFirmwareDevicePackageDataLengthr\x03\x00\x00\x00z\x06hex-le000z\x1dComponentImageInformationArea{z\x13ComponentImageCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x19ComponentImageInformation{r\x0e\x00\x00\x00z\x13ComponentImageCountz\x17ComponentClassification{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x07\x00\x00\x00{r\x10\x00\x00\x00z\x07Unknownr\x11\x00\x00\x00z\x05Otherr\x12\x00\x00\x00z\x06Driverr\x13\x00\x00\x00z\x16Configuration Softwarer\x14\x00\x00\x00z\x14Application Softwarer\x15\x00\x00\x00z\x0fInstrumentationr\x16\x00\x00\x00z\rFirmware/BIOSz\x050x007z\x13Diagnostic Softwarez\x050x008z\x10Operating Systemz\x050x009z\nMiddlewarez\x050x00Az\x08Firmwarez\x050x00Bz\nBIOS/FCodez\x050x00Cz\x14Support/Service Packz\x050x00Dz\x0fSoftware Bundlez\x060x8000z"Reserved for Vendor Defined valuesr\x17\x00\x00\x00z\x11Downstream Device00z\x13ComponentIdentifier{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le0z\x18ComponentComparisonStamp{r\x01\x00\x00\x00r\x0f\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x10ComponentOptions{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le0z"RequestedComponentActivationMethod{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le0z\x17ComponentLocationOffset{r\x01\x00\x00\x00r\x0f\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\rComponentSize{r\x01\x00\x00\x00r\x0f\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1aComponentVersionStringType{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x07\x00\x00\x00{r\x08\x00\x00\x00z\x06stringr\t\x00\x00\x00z\x05ASCIIr\n\x00\x00\x00z\x04UTF8r\x0b\x00\x00\x00z\x05UTF16r\x0c\x00\x00\x00z\x07UTF16LEr\r\x00\x00\x00z\x07UTF16BE00z\x1cComponentVersionStringLength{r\x01\x00\x00\x00r\x04\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x16ComponentVersionString{r\x01\x00\x00\x00z\x1cComponentVersionStringLengthr\x03\x00\x00\x00z\x1aComponentVersionStringType000z\x15PackageHeaderChecksum{r\x01\x00\x00\x00r\x0f\x00\x00\x00r\x03\x00\x00\x00z\x03int00'),
+    'pldm_spec_1.0.0': (601145147, b'\xfbz\x18PackageHeaderInformation{z\x17PackageHeaderIdentifier{\xfa\x06length\xe9\x10\x00\x00\x00\xfa\tdata_typez\x04UUID\xfa\x04infoz\x1fThis field is evaluated runtime0z\x1bPackageHeaderFormatRevision{r\x01\x00\x00\x00\xe9\x01\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime0z\x11PackageHeaderSize{r\x01\x00\x00\x00\xe9\x02\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime0z\x16PackageReleaseDateTime{r\x01\x00\x00\x00\xe9\r\x00\x00\x00r\x03\x00\x00\x00z\ttimestamp0z\x18ComponentBitmapBitLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x18PackageVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le\xfa\x06decode{\xfa\x030x0z\x07Unknown\xfa\x030x1z\x05ASCII\xfa\x030x2z\x04UTF8\xfa\x030x3z\x05UTF16\xfa\x030x4z\x07UTF16LE\xfa\x030x5z\x07UTF16BE00z\x1aPackageVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14PackageVersionString{r\x01\x00\x00\x00z\x1aPackageVersionStringLengthr\x03\x00\x00\x00z\x18PackageVersionStringType00z FirmwareDeviceIdentificationArea{z\x13DeviceIDRecordCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17FirmwareDeviceIDRecords{\xfa\x05countz\x13DeviceIDRecordCountz\x0cRecordLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x0fDescriptorCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17DeviceUpdateOptionFlags{r\x01\x00\x00\x00\xe9\x04\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00zh32-bit field where each bit represents an update option.\n [0] - Continue component updates after failure0z"ComponentImageSetVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z$ComponentImageSetVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1fFirmwareDevicePackageDataLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14ApplicableComponents{r\x01\x00\x00\x00z\x18ComponentBitmapBitLengthr\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00z\xacBitmap indicating which firmware components are applicable to this device. \n The size of this bitfield is based on the value contained in the ComponentBitmapBitLengthfield.0z\x1eComponentImageSetVersionString{r\x01\x00\x00\x00z$ComponentImageSetVersionStringLengthr\x03\x00\x00\x00z"ComponentImageSetVersionStringType0z\x11RecordDescriptors{z\x15InitialDescriptorType{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{\xfa\x050x000z\rPCI Vendor ID\xfa\x050x001z\x12IANA Enterprise ID\xfa\x050x002z\x04UUID\xfa\x050x003z\rPnP Vendor ID\xfa\x050x004z\x0eACPI Vendor ID\xfa\x050x005z\x18IEEE Assigned Company ID\xfa\x050x006z\x0eSCSI Vendor ID00z\x17InitialDescriptorLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x15InitialDescriptorData{r\x01\x00\x00\x00z\x17InitialDescriptorLengthr\x03\x00\x00\x00z\x06hex-le0r\x0f\x00\x00\x00z\x0fDescriptorCountz\x18AdditionalDescriptorType{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x11\x00\x00\x00z\rPCI Vendor IDr\x12\x00\x00\x00z\x12IANA Enterprise IDr\x13\x00\x00\x00z\x04UUIDr\x14\x00\x00\x00z\rPnP Vendor IDr\x15\x00\x00\x00z\x0eACPI Vendor IDr\x16\x00\x00\x00z\x18IEEE Assigned Company IDr\x17\x00\x00\x00z\x0eSCSI Vendor IDz\x050x100z\rPCI Device IDz\x050x101z\x17PCI Subsystem Vendor IDz\x050x102z\x10PCI Subsystem IDz\x050x103z\x0fPCI Revision IDz\x050x104z\x16PnP Product Identifierz\x050x105z\x17ACPI Product Identifierz\x050x106z ASCII Model Number (Long String)z\x050x107z!ASCII Model Number (Short String)z\x050x108z\x0fSCSI Product IDz\x050x109z\x1aUBM Controller Device Code\xfa\x060xffffz\x0eVendor Defined00z\x1aAdditionalDescriptorLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z"AdditionalDescriptorIdentifierData{r\x01\x00\x00\x00z\x1aAdditionalDescriptorLengthr\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{z\x0eVendor Defined{z&VendorDefinedDescriptorTitleStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z(VendorDefinedDescriptorTitleStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z"VendorDefinedDescriptorTitleString{r\x01\x00\x00\x00z(VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z&VendorDefinedDescriptorTitleStringType0z\x1bVendorDefinedDescriptorData{r\x01\x00\x00\x00zEAdditionalDescriptorLength-VendorDefinedDescriptorTitleStringLength-2r\x03\x00\x00\x00z\x06hex-be00000z\x19FirmwareDevicePackageData{r\x01\x00\x00\x00z\x1fFirmwareDevicePackageDataLengthr\x03\x00\x00\x00z\x06hex-le000z\x1dComponentImageInformationArea{z\x13ComponentImageCount{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x19ComponentImageInformation{r\x0f\x00\x00\x00z\x13ComponentImageCountz\x17ComponentClassification{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x11\x00\x00\x00z\x07Unknownr\x12\x00\x00\x00z\x05Otherr\x13\x00\x00\x00z\x06Driverr\x14\x00\x00\x00z\x16Configuration Softwarer\x15\x00\x00\x00z\x14Application Softwarer\x16\x00\x00\x00z\x0fInstrumentationr\x17\x00\x00\x00z\rFirmware/BIOSz\x050x007z\x13Diagnostic Softwarez\x050x008z\x10Operating Systemz\x050x009z\nMiddlewarez\x050x00Az\x08Firmwarez\x050x00Bz\nBIOS/FCodez\x050x00Cz\x14Support/Service Packz\x050x00Dz\x0fSoftware Bundlez\x060x8000z"Reserved for Vendor Defined valuesr\x18\x00\x00\x00z\x11Downstream Device00z\x13ComponentIdentifier{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le0z\x18ComponentComparisonStamp{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x10ComponentOptions{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00z_Bitfield indicating update options.\n [1] - Use Component Comparison Stamp \n [0] - Force Update 0z"RequestedComponentActivationMethod{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00a_\x01\x00\x00Bitfield specifying preferred activation methods.\n [5] - AC power cycle \n [4] - DC power cycle \n [3] - System reboot \n [2] - Medium-specific reset \n [1] - Self-Contained (can be performed upon transmission of ActivateFirmware command) \n [0] - Automatic (becomes active as the Apply completes, or as download completes if the FD performs an auto-apply)0z\x17ComponentLocationOffset{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\rComponentSize{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1aComponentVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x06stringr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z\x1cComponentVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x16ComponentVersionString{r\x01\x00\x00\x00z\x1cComponentVersionStringLengthr\x03\x00\x00\x00z\x1aComponentVersionStringType000z\x15PackageHeaderChecksum{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime00'),
+    'pldm_spec_1.1.0': (391047821, b'\xfbz\x18PackageHeaderInformation{z\x17PackageHeaderIdentifier{\xfa\x06length\xe9\x10\x00\x00\x00\xfa\tdata_typez\x04UUID\xfa\x04infoz\x1fThis field is evaluated runtime0z\x1bPackageHeaderFormatRevision{r\x01\x00\x00\x00\xe9\x01\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime0z\x11PackageHeaderSize{r\x01\x00\x00\x00\xe9\x02\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime0z\x16PackageReleaseDateTime{r\x01\x00\x00\x00\xe9\r\x00\x00\x00r\x03\x00\x00\x00z\ttimestamp0z\x18ComponentBitmapBitLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x18PackageVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le\xfa\x06decode{\xfa\x030x0z\x07Unknown\xfa\x030x1z\x05ASCII\xfa\x030x2z\x04UTF8\xfa\x030x3z\x05UTF16\xfa\x030x4z\x07UTF16LE\xfa\x030x5z\x07UTF16BE00z\x1aPackageVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14PackageVersionString{r\x01\x00\x00\x00z\x1aPackageVersionStringLengthr\x03\x00\x00\x00z\x18PackageVersionStringType00z FirmwareDeviceIdentificationArea{z\x13DeviceIDRecordCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17FirmwareDeviceIDRecords{\xfa\x05countz\x13DeviceIDRecordCountz\x0cRecordLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x0fDescriptorCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17DeviceUpdateOptionFlags{r\x01\x00\x00\x00\xe9\x04\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00zh32-bit field where each bit represents an update option.\n [0] - Continue component updates after failure0z"ComponentImageSetVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z$ComponentImageSetVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1fFirmwareDevicePackageDataLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14ApplicableComponents{r\x01\x00\x00\x00z\x18ComponentBitmapBitLengthr\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00z\xacBitmap indicating which firmware components are applicable to this device. \n The size of this bitfield is based on the value contained in the ComponentBitmapBitLengthfield.0z\x1eComponentImageSetVersionString{r\x01\x00\x00\x00z$ComponentImageSetVersionStringLengthr\x03\x00\x00\x00z"ComponentImageSetVersionStringType0z\x11RecordDescriptors{\xfa\x15InitialDescriptorType{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{\xfa\x050x000z\rPCI Vendor ID\xfa\x050x001z\x12IANA Enterprise ID\xfa\x050x002z\x04UUID\xfa\x050x003z\rPnP Vendor ID\xfa\x050x004z\x0eACPI Vendor ID\xfa\x050x005z\x18IEEE Assigned Company ID\xfa\x050x006z\x0eSCSI Vendor ID00\xfa\x17InitialDescriptorLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0\xfa\x15InitialDescriptorData{r\x01\x00\x00\x00z\x17InitialDescriptorLengthr\x03\x00\x00\x00z\x06hex-le0r\x0f\x00\x00\x00z\x0fDescriptorCount\xfa\x18AdditionalDescriptorType{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\rPCI Vendor IDr\x13\x00\x00\x00z\x12IANA Enterprise IDr\x14\x00\x00\x00z\x04UUIDr\x15\x00\x00\x00z\rPnP Vendor IDr\x16\x00\x00\x00z\x0eACPI Vendor IDr\x17\x00\x00\x00z\x18IEEE Assigned Company IDr\x18\x00\x00\x00z\x0eSCSI Vendor ID\xfa\x050x100z\rPCI Device ID\xfa\x050x101z\x17PCI Subsystem Vendor ID\xfa\x050x102z\x10PCI Subsystem ID\xfa\x050x103z\x0fPCI Revision ID\xfa\x050x104z\x16PnP Product Identifier\xfa\x050x105z\x17ACPI Product Identifierz\x050x106z ASCII Model Number (Long String)z\x050x107z!ASCII Model Number (Short String)z\x050x108z\x0fSCSI Product IDz\x050x109z\x1aUBM Controller Device Code\xfa\x060xffffz\x0eVendor Defined00\xfa\x1aAdditionalDescriptorLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0\xfa"AdditionalDescriptorIdentifierData{r\x01\x00\x00\x00z\x1aAdditionalDescriptorLengthr\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{\xfa\x0eVendor Defined{\xfa&VendorDefinedDescriptorTitleStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00\xfa(VendorDefinedDescriptorTitleStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0\xfa"VendorDefinedDescriptorTitleString{r\x01\x00\x00\x00z(VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z&VendorDefinedDescriptorTitleStringType0\xfa\x1bVendorDefinedDescriptorData{r\x01\x00\x00\x00zEAdditionalDescriptorLength-VendorDefinedDescriptorTitleStringLength-2r\x03\x00\x00\x00z\x06hex-be00000z\x19FirmwareDevicePackageData{r\x01\x00\x00\x00z\x1fFirmwareDevicePackageDataLengthr\x03\x00\x00\x00z\x06hex-le000z"DownstreamDeviceIdentificationArea{z\x1dDownstreamDeviceIDRecordCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x19DownstreamDeviceIDRecords{r\x0f\x00\x00\x00z\x1dDownstreamDeviceIDRecordCountz\x1cDownstreamDeviceRecordLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1fDownstreamDeviceDescriptorCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z!DownstreamDeviceUpdateOptionFlags{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z;DownstreamDeviceSelfContainedActivationMinVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z=DownstreamDeviceSelfContainedActivationMinVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z!DownstreamDevicePackageDataLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z$DownstreamDeviceApplicableComponents{r\x01\x00\x00\x00z\x18ComponentBitmapBitLengthr\x03\x00\x00\x00z\x06hex-le0z7DownstreamDeviceSelfContainedActivationMinVersionString{r\x01\x00\x00\x00z=DownstreamDeviceSelfContainedActivationMinVersionStringLengthr\x03\x00\x00\x00z;DownstreamDeviceSelfContainedActivationMinVersionStringType0z@DownstreamDeviceSelfContainedActivationMinVersionComparisonStamp{r\x01\x00\x00\x00z#4*DownstreamDeviceUpdateOptionFlagsr\x03\x00\x00\x00z\x03int0z!DownstreamDeviceRecordDescriptors{r\x11\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\rPCI Vendor IDr\x13\x00\x00\x00z\x12IANA Enterprise IDr\x14\x00\x00\x00z\x04UUIDr\x15\x00\x00\x00z\rPnP Vendor IDr\x16\x00\x00\x00z\x0eACPI Vendor IDz\x050x010z\rPCI Device IDr\x1d\x00\x00\x00z\x17PCI Subsystem Vendor IDr\x1e\x00\x00\x00z\x10PCI Subsystem IDr\x1f\x00\x00\x00z\x0fPCI Revision IDr \x00\x00\x00z\x16PnP Product Identifierr!\x00\x00\x00z\x17ACPI Product Identifierr"\x00\x00\x00z\x0eVendor Defined00r\x19\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0r\x1a\x00\x00\x00{r\x01\x00\x00\x00z\x17InitialDescriptorLengthr\x03\x00\x00\x00z\x06hex-le0r\x0f\x00\x00\x00z\x1fDownstreamDeviceDescriptorCountr\x1b\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\rPCI Vendor IDr\x13\x00\x00\x00z\x12IANA Enterprise IDr\x14\x00\x00\x00z\x04UUIDr\x15\x00\x00\x00z\rPnP Vendor IDr\x16\x00\x00\x00z\x0eACPI Vendor IDr\x1c\x00\x00\x00z\rPCI Device IDr\x1d\x00\x00\x00z\x17PCI Subsystem Vendor IDr\x1e\x00\x00\x00z\x10PCI Subsystem IDr\x1f\x00\x00\x00z\x0fPCI Revision IDr \x00\x00\x00z\x16PnP Product Identifierr!\x00\x00\x00z\x17ACPI Product Identifierr"\x00\x00\x00z\x0eVendor Defined00r#\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0r$\x00\x00\x00{r\x01\x00\x00\x00z\x1aAdditionalDescriptorLengthr\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r%\x00\x00\x00{r&\x00\x00\x00{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00r\'\x00\x00\x00{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0r(\x00\x00\x00{r\x01\x00\x00\x00z(VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z&VendorDefinedDescriptorTitleStringType0r)\x00\x00\x00{r\x01\x00\x00\x00zEAdditionalDescriptorLength-VendorDefinedDescriptorTitleStringLength-2r\x03\x00\x00\x00z\x06hex-be00000z\x1bDownstreamDevicePackageData{r\x01\x00\x00\x00z!DownstreamDevicePackageDataLengthr\x03\x00\x00\x00z\x06hex-le000z\x1dComponentImageInformationArea{z\x13ComponentImageCount{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x19ComponentImageInformation{r\x0f\x00\x00\x00z\x13ComponentImageCountz\x17ComponentClassification{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\x07Unknownr\x13\x00\x00\x00z\x05Otherr\x14\x00\x00\x00z\x06Driverr\x15\x00\x00\x00z\x16Configuration Softwarer\x16\x00\x00\x00z\x14Application Softwarer\x17\x00\x00\x00z\x0fInstrumentationr\x18\x00\x00\x00z\rFirmware/BIOSz\x050x007z\x13Diagnostic Softwarez\x050x008z\x10Operating Systemz\x050x009z\nMiddlewarez\x050x00Az\x08Firmwarez\x050x00Bz\nBIOS/FCodez\x050x00Cz\x14Support/Service Packz\x050x00Dz\x0fSoftware Bundlez\x060x8000z"Reserved for Vendor Defined valuesr"\x00\x00\x00z\x11Downstream Device00z\x13ComponentIdentifier{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le0z\x18ComponentComparisonStamp{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x10ComponentOptions{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00z_Bitfield indicating update options.\n [1] - Use Component Comparison Stamp \n [0] - Force Update 0z"RequestedComponentActivationMethod{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00a_\x01\x00\x00Bitfield specifying preferred activation methods.\n [5] - AC power cycle \n [4] - DC power cycle \n [3] - System reboot \n [2] - Medium-specific reset \n [1] - Self-Contained (can be performed upon transmission of ActivateFirmware command) \n [0] - Automatic (becomes active as the Apply completes, or as download completes if the FD performs an auto-apply)0z\x17ComponentLocationOffset{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\rComponentSize{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1aComponentVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x06stringr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z\x1cComponentVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x16ComponentVersionString{r\x01\x00\x00\x00z\x1cComponentVersionStringLengthr\x03\x00\x00\x00z\x1aComponentVersionStringType000z\x15PackageHeaderChecksum{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime00'),
+    'pldm_spec_1.2.0': (648262652, b'\xfbz\x18PackageHeaderInformation{z\x17PackageHeaderIdentifier{\xfa\x06length\xe9\x10\x00\x00\x00\xfa\tdata_typez\x04UUID\xfa\x04infoz\x1fThis field is evaluated runtime0z\x1bPackageHeaderFormatRevision{r\x01\x00\x00\x00\xe9\x01\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime0z\x11PackageHeaderSize{r\x01\x00\x00\x00\xe9\x02\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime0z\x16PackageReleaseDateTime{r\x01\x00\x00\x00\xe9\r\x00\x00\x00r\x03\x00\x00\x00z\ttimestamp0z\x18ComponentBitmapBitLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x18PackageVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le\xfa\x06decode{\xfa\x030x0z\x07Unknown\xfa\x030x1z\x05ASCII\xfa\x030x2z\x04UTF8\xfa\x030x3z\x05UTF16\xfa\x030x4z\x07UTF16LE\xfa\x030x5z\x07UTF16BE00z\x1aPackageVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14PackageVersionString{r\x01\x00\x00\x00z\x1aPackageVersionStringLengthr\x03\x00\x00\x00z\x18PackageVersionStringType00z FirmwareDeviceIdentificationArea{z\x13DeviceIDRecordCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17FirmwareDeviceIDRecords{\xfa\x05countz\x13DeviceIDRecordCountz\x0cRecordLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x0fDescriptorCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17DeviceUpdateOptionFlags{r\x01\x00\x00\x00\xe9\x04\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00zh32-bit field where each bit represents an update option.\n [0] - Continue component updates after failure0z"ComponentImageSetVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z$ComponentImageSetVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1fFirmwareDevicePackageDataLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14ApplicableComponents{r\x01\x00\x00\x00z\x18ComponentBitmapBitLengthr\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00z\xacBitmap indicating which firmware components are applicable to this device. \n The size of this bitfield is based on the value contained in the ComponentBitmapBitLengthfield.0z\x1eComponentImageSetVersionString{r\x01\x00\x00\x00z$ComponentImageSetVersionStringLengthr\x03\x00\x00\x00z"ComponentImageSetVersionStringType0z\x11RecordDescriptors{\xfa\x15InitialDescriptorType{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{\xfa\x050x000z\rPCI Vendor ID\xfa\x050x001z\x12IANA Enterprise ID\xfa\x050x002z\x04UUID\xfa\x050x003z\rPnP Vendor ID\xfa\x050x004z\x0eACPI Vendor ID\xfa\x050x005z\x18IEEE Assigned Company ID\xfa\x050x006z\x0eSCSI Vendor ID00\xfa\x17InitialDescriptorLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0\xfa\x15InitialDescriptorData{r\x01\x00\x00\x00z\x17InitialDescriptorLengthr\x03\x00\x00\x00z\x06hex-le0r\x0f\x00\x00\x00z\x0fDescriptorCount\xfa\x18AdditionalDescriptorType{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\rPCI Vendor IDr\x13\x00\x00\x00z\x12IANA Enterprise IDr\x14\x00\x00\x00z\x04UUIDr\x15\x00\x00\x00z\rPnP Vendor IDr\x16\x00\x00\x00z\x0eACPI Vendor IDr\x17\x00\x00\x00z\x18IEEE Assigned Company IDr\x18\x00\x00\x00z\x0eSCSI Vendor ID\xfa\x050x100z\rPCI Device ID\xfa\x050x101z\x17PCI Subsystem Vendor ID\xfa\x050x102z\x10PCI Subsystem ID\xfa\x050x103z\x0fPCI Revision ID\xfa\x050x104z\x16PnP Product Identifier\xfa\x050x105z\x17ACPI Product Identifier\xfa\x050x106z ASCII Model Number (Long String)\xfa\x050x107z!ASCII Model Number (Short String)\xfa\x050x108z\x0fSCSI Product ID\xfa\x050x109z\x1aUBM Controller Device Code\xfa\x060xffffz\x0eVendor Defined00\xfa\x1aAdditionalDescriptorLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0\xfa"AdditionalDescriptorIdentifierData{r\x01\x00\x00\x00z\x1aAdditionalDescriptorLengthr\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{\xfa\x0eVendor Defined{\xfa&VendorDefinedDescriptorTitleStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00\xfa(VendorDefinedDescriptorTitleStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0\xfa"VendorDefinedDescriptorTitleString{r\x01\x00\x00\x00z(VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z&VendorDefinedDescriptorTitleStringType0\xfa\x1bVendorDefinedDescriptorData{r\x01\x00\x00\x00zEAdditionalDescriptorLength-VendorDefinedDescriptorTitleStringLength-2r\x03\x00\x00\x00z\x06hex-be00000z\x19FirmwareDevicePackageData{r\x01\x00\x00\x00z\x1fFirmwareDevicePackageDataLengthr\x03\x00\x00\x00z\x06hex-le000z"DownstreamDeviceIdentificationArea{z\x1dDownstreamDeviceIDRecordCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x19DownstreamDeviceIDRecords{r\x0f\x00\x00\x00z\x1dDownstreamDeviceIDRecordCountz\x1cDownstreamDeviceRecordLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1fDownstreamDeviceDescriptorCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z!DownstreamDeviceUpdateOptionFlags{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z;DownstreamDeviceSelfContainedActivationMinVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z=DownstreamDeviceSelfContainedActivationMinVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z!DownstreamDevicePackageDataLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z$DownstreamDeviceApplicableComponents{r\x01\x00\x00\x00z\x18ComponentBitmapBitLengthr\x03\x00\x00\x00z\x06hex-le0z7DownstreamDeviceSelfContainedActivationMinVersionString{r\x01\x00\x00\x00z=DownstreamDeviceSelfContainedActivationMinVersionStringLengthr\x03\x00\x00\x00z;DownstreamDeviceSelfContainedActivationMinVersionStringType0z@DownstreamDeviceSelfContainedActivationMinVersionComparisonStamp{r\x01\x00\x00\x00z#4*DownstreamDeviceUpdateOptionFlagsr\x03\x00\x00\x00z\x03int0z!DownstreamDeviceRecordDescriptors{r\x11\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\rPCI Vendor IDr\x13\x00\x00\x00z\x12IANA Enterprise IDr\x14\x00\x00\x00z\x04UUIDr\x15\x00\x00\x00z\rPnP Vendor IDr\x16\x00\x00\x00z\x0eACPI Vendor IDr\x17\x00\x00\x00z\x18IEEE Assigned Company IDr\x18\x00\x00\x00z\x0eSCSI Vendor ID00r\x19\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0r\x1a\x00\x00\x00{r\x01\x00\x00\x00z\x17InitialDescriptorLengthr\x03\x00\x00\x00z\x06hex-le0r\x0f\x00\x00\x00z\x1fDownstreamDeviceDescriptorCountr\x1b\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\rPCI Vendor IDr\x13\x00\x00\x00z\x12IANA Enterprise IDr\x14\x00\x00\x00z\x04UUIDr\x15\x00\x00\x00z\rPnP Vendor IDr\x16\x00\x00\x00z\x0eACPI Vendor IDr\x17\x00\x00\x00z\x18IEEE Assigned Company IDr\x18\x00\x00\x00z\x0eSCSI Vendor IDr\x1c\x00\x00\x00z\rPCI Device IDr\x1d\x00\x00\x00z\x17PCI Subsystem Vendor IDr\x1e\x00\x00\x00z\x10PCI Subsystem IDr\x1f\x00\x00\x00z\x0fPCI Revision IDr \x00\x00\x00z\x16PnP Product Identifierr!\x00\x00\x00z\x17ACPI Product Identifierr"\x00\x00\x00z ASCII Model Number (Long String)r#\x00\x00\x00z!ASCII Model Number (Short String)r$\x00\x00\x00z\x0fSCSI Product IDr%\x00\x00\x00z\x1aUBM Controller Device Coder&\x00\x00\x00z\x0eVendor Defined00r\'\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0r(\x00\x00\x00{r\x01\x00\x00\x00z\x1aAdditionalDescriptorLengthr\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r)\x00\x00\x00{r*\x00\x00\x00{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00r+\x00\x00\x00{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0r,\x00\x00\x00{r\x01\x00\x00\x00z(VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z&VendorDefinedDescriptorTitleStringType0r-\x00\x00\x00{r\x01\x00\x00\x00zCAdditionalDescriptorLength-VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z\x06hex-be00000z\x1bDownstreamDevicePackageData{r\x01\x00\x00\x00z!DownstreamDevicePackageDataLengthr\x03\x00\x00\x00z\x06hex-le000z\x1dComponentImageInformationArea{z\x13ComponentImageCount{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x19ComponentImageInformation{r\x0f\x00\x00\x00z\x13ComponentImageCountz\x17ComponentClassification{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\x07Unknownr\x13\x00\x00\x00z\x05Otherr\x14\x00\x00\x00z\x06Driverr\x15\x00\x00\x00z\x16Configuration Softwarer\x16\x00\x00\x00z\x14Application Softwarer\x17\x00\x00\x00z\x0fInstrumentationr\x18\x00\x00\x00z\rFirmware/BIOSz\x050x007z\x13Diagnostic Softwarez\x050x008z\x10Operating Systemz\x050x009z\nMiddlewarez\x050x00Az\x08Firmwarez\x050x00Bz\nBIOS/FCodez\x050x00Cz\x14Support/Service Packz\x050x00Dz\x0fSoftware Bundlez\x060x8000z"Reserved for Vendor Defined valuesr&\x00\x00\x00z\x11Downstream Device00z\x13ComponentIdentifier{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le0z\x18ComponentComparisonStamp{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x10ComponentOptions{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00z_Bitfield indicating update options.\n [1] - Use Component Comparison Stamp \n [0] - Force Update 0z"RequestedComponentActivationMethod{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00a_\x01\x00\x00Bitfield specifying preferred activation methods.\n [5] - AC power cycle \n [4] - DC power cycle \n [3] - System reboot \n [2] - Medium-specific reset \n [1] - Self-Contained (can be performed upon transmission of ActivateFirmware command) \n [0] - Automatic (becomes active as the Apply completes, or as download completes if the FD performs an auto-apply)0z\x17ComponentLocationOffset{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\rComponentSize{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1aComponentVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x06stringr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z\x1cComponentVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x16ComponentVersionString{r\x01\x00\x00\x00z\x1cComponentVersionStringLengthr\x03\x00\x00\x00z\x1aComponentVersionStringType0z\x19ComponentOpaqueDataLength{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x13ComponentOpaqueData{r\x01\x00\x00\x00z\x19ComponentOpaqueDataLengthr\x03\x00\x00\x00z\x06hex-le000z\x15PackageHeaderChecksum{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime00'),
+    'pldm_spec_1.3.0': (2036539912, b'\xfbz\x18PackageHeaderInformation{z\x17PackageHeaderIdentifier{\xfa\x06length\xe9\x10\x00\x00\x00\xfa\tdata_typez\x04UUID\xfa\x04infoz\x1fThis field is evaluated runtime0z\x1bPackageHeaderFormatRevision{r\x01\x00\x00\x00\xe9\x01\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime0z\x11PackageHeaderSize{r\x01\x00\x00\x00\xe9\x02\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime0z\x16PackageReleaseDateTime{r\x01\x00\x00\x00\xe9\r\x00\x00\x00r\x03\x00\x00\x00z\ttimestamp0z\x18ComponentBitmapBitLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x18PackageVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le\xfa\x06decode{\xfa\x030x0z\x07Unknown\xfa\x030x1z\x05ASCII\xfa\x030x2z\x04UTF8\xfa\x030x3z\x05UTF16\xfa\x030x4z\x07UTF16LE\xfa\x030x5z\x07UTF16BE00z\x1aPackageVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14PackageVersionString{r\x01\x00\x00\x00z\x1aPackageVersionStringLengthr\x03\x00\x00\x00z\x18PackageVersionStringType00z FirmwareDeviceIdentificationArea{z\x13DeviceIDRecordCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17FirmwareDeviceIDRecords{\xfa\x05countz\x13DeviceIDRecordCountz\x0cRecordLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x0fDescriptorCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17DeviceUpdateOptionFlags{r\x01\x00\x00\x00\xe9\x04\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00zh32-bit field where each bit represents an update option.\n [0] - Continue component updates after failure0z"ComponentImageSetVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z$ComponentImageSetVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1fFirmwareDevicePackageDataLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x17ReferenceManifestLength{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x14ApplicableComponents{r\x01\x00\x00\x00z\x18ComponentBitmapBitLengthr\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00z\xacBitmap indicating which firmware components are applicable to this device. \n The size of this bitfield is based on the value contained in the ComponentBitmapBitLengthfield.0z\x1eComponentImageSetVersionString{r\x01\x00\x00\x00z$ComponentImageSetVersionStringLengthr\x03\x00\x00\x00z"ComponentImageSetVersionStringType0z\x11RecordDescriptors{\xfa\x15InitialDescriptorType{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{\xfa\x050x000z\rPCI Vendor ID\xfa\x050x001z\x12IANA Enterprise ID\xfa\x050x002z\x04UUID\xfa\x050x003z\rPnP Vendor ID\xfa\x050x004z\x0eACPI Vendor ID\xfa\x050x005z\x18IEEE Assigned Company ID\xfa\x050x006z\x0eSCSI Vendor ID00\xfa\x17InitialDescriptorLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0\xfa\x15InitialDescriptorData{r\x01\x00\x00\x00z\x17InitialDescriptorLengthr\x03\x00\x00\x00z\x06hex-le0r\x0f\x00\x00\x00z\x0fDescriptorCount\xfa\x18AdditionalDescriptorType{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\rPCI Vendor IDr\x13\x00\x00\x00z\x12IANA Enterprise IDr\x14\x00\x00\x00z\x04UUIDr\x15\x00\x00\x00z\rPnP Vendor IDr\x16\x00\x00\x00z\x0eACPI Vendor IDr\x17\x00\x00\x00z\x18IEEE Assigned Company IDr\x18\x00\x00\x00z\x0eSCSI Vendor ID\xfa\x050x100z\rPCI Device ID\xfa\x050x101z\x17PCI Subsystem Vendor ID\xfa\x050x102z\x10PCI Subsystem ID\xfa\x050x103z\x0fPCI Revision ID\xfa\x050x104z\x16PnP Product Identifier\xfa\x050x105z\x17ACPI Product Identifierz\x050x106z ASCII Model Number (Long String)z\x050x107z!ASCII Model Number (Short String)z\x050x108z\x0fSCSI Product IDz\x050x109z\x1aUBM Controller Device Code\xfa\x060xffffz\x0eVendor Defined00\xfa\x1aAdditionalDescriptorLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0\xfa"AdditionalDescriptorIdentifierData{r\x01\x00\x00\x00z\x1aAdditionalDescriptorLengthr\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{\xfa\x0eVendor Defined{\xfa&VendorDefinedDescriptorTitleStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00\xfa(VendorDefinedDescriptorTitleStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0\xfa"VendorDefinedDescriptorTitleString{r\x01\x00\x00\x00z(VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z&VendorDefinedDescriptorTitleStringType0\xfa\x1bVendorDefinedDescriptorData{r\x01\x00\x00\x00zEAdditionalDescriptorLength-VendorDefinedDescriptorTitleStringLength-2r\x03\x00\x00\x00z\x06hex-be00000z\x19FirmwareDevicePackageData{r\x01\x00\x00\x00z\x1fFirmwareDevicePackageDataLengthr\x03\x00\x00\x00z\x06hex-le0z\x15ReferenceManifestData{r\x01\x00\x00\x00z\x17ReferenceManifestLengthr\x03\x00\x00\x00z\x06hex-le000z"DownstreamDeviceIdentificationArea{z\x1dDownstreamDeviceIDRecordCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x19DownstreamDeviceIDRecords{r\x0f\x00\x00\x00z\x1dDownstreamDeviceIDRecordCountz\x1cDownstreamDeviceRecordLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1fDownstreamDeviceDescriptorCount{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z!DownstreamDeviceUpdateOptionFlags{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z;DownstreamDeviceSelfContainedActivationMinVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z=DownstreamDeviceSelfContainedActivationMinVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z!DownstreamDevicePackageDataLength{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\'DownstreamDeviceReferenceManifestLength{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z$DownstreamDeviceApplicableComponents{r\x01\x00\x00\x00z\x18ComponentBitmapBitLengthr\x03\x00\x00\x00z\x06hex-le0z7DownstreamDeviceSelfContainedActivationMinVersionString{r\x01\x00\x00\x00z=DownstreamDeviceSelfContainedActivationMinVersionStringLengthr\x03\x00\x00\x00z;DownstreamDeviceSelfContainedActivationMinVersionStringType0z@DownstreamDeviceSelfContainedActivationMinVersionComparisonStamp{r\x01\x00\x00\x00z#4*DownstreamDeviceUpdateOptionFlagsr\x03\x00\x00\x00z\x03int0z!DownstreamDeviceRecordDescriptors{r\x11\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\rPCI Vendor IDr\x13\x00\x00\x00z\x12IANA Enterprise IDr\x14\x00\x00\x00z\x04UUIDr\x15\x00\x00\x00z\rPnP Vendor IDr\x16\x00\x00\x00z\x0eACPI Vendor IDz\x050x010z\rPCI Device IDr\x1d\x00\x00\x00z\x17PCI Subsystem Vendor IDr\x1e\x00\x00\x00z\x10PCI Subsystem IDr\x1f\x00\x00\x00z\x0fPCI Revision IDr \x00\x00\x00z\x16PnP Product Identifierr!\x00\x00\x00z\x17ACPI Product Identifierr"\x00\x00\x00z\x0eVendor Defined00r\x19\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0r\x1a\x00\x00\x00{r\x01\x00\x00\x00z\x17InitialDescriptorLengthr\x03\x00\x00\x00z\x06hex-le0r\x0f\x00\x00\x00z\x1fDownstreamDeviceDescriptorCountr\x1b\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\rPCI Vendor IDr\x13\x00\x00\x00z\x12IANA Enterprise IDr\x14\x00\x00\x00z\x04UUIDr\x15\x00\x00\x00z\rPnP Vendor IDr\x16\x00\x00\x00z\x0eACPI Vendor IDr\x1c\x00\x00\x00z\rPCI Device IDr\x1d\x00\x00\x00z\x17PCI Subsystem Vendor IDr\x1e\x00\x00\x00z\x10PCI Subsystem IDr\x1f\x00\x00\x00z\x0fPCI Revision IDr \x00\x00\x00z\x16PnP Product Identifierr!\x00\x00\x00z\x17ACPI Product Identifierr"\x00\x00\x00z\x0eVendor Defined00r#\x00\x00\x00{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0r$\x00\x00\x00{r\x01\x00\x00\x00z\x1aAdditionalDescriptorLengthr\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r%\x00\x00\x00{r&\x00\x00\x00{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x07Unknownr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00r\'\x00\x00\x00{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0r(\x00\x00\x00{r\x01\x00\x00\x00z(VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z&VendorDefinedDescriptorTitleStringType0r)\x00\x00\x00{r\x01\x00\x00\x00zCAdditionalDescriptorLength-VendorDefinedDescriptorTitleStringLengthr\x03\x00\x00\x00z\x06hex-be00000z\x1bDownstreamDevicePackageData{r\x01\x00\x00\x00z!DownstreamDevicePackageDataLengthr\x03\x00\x00\x00z\x06hex-le0z%DownstreamDeviceReferenceManifestData{r\x01\x00\x00\x00z\'DownstreamDeviceReferenceManifestLengthr\x03\x00\x00\x00z\x06hex-le000z\x1dComponentImageInformationArea{z\x13ComponentImageCount{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x19ComponentImageInformation{r\x0f\x00\x00\x00z\x13ComponentImageCountz\x17ComponentClassification{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\x12\x00\x00\x00z\x07Unknownr\x13\x00\x00\x00z\x05Otherr\x14\x00\x00\x00z\x06Driverr\x15\x00\x00\x00z\x16Configuration Softwarer\x16\x00\x00\x00z\x14Application Softwarer\x17\x00\x00\x00z\x0fInstrumentationr\x18\x00\x00\x00z\rFirmware/BIOSz\x050x007z\x13Diagnostic Softwarez\x050x008z\x10Operating Systemz\x050x009z\nMiddlewarez\x050x00Az\x08Firmwarez\x050x00Bz\nBIOS/FCodez\x050x00Cz\x14Support/Service Packz\x050x00Dz\x0fSoftware Bundlez\x060x8000z"Reserved for Vendor Defined valuesr"\x00\x00\x00z\x11Downstream Device00z\x13ComponentIdentifier{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-le0z\x18ComponentComparisonStamp{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x10ComponentOptions{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00z_Bitfield indicating update options.\n [1] - Use Component Comparison Stamp \n [0] - Force Update 0z"RequestedComponentActivationMethod{r\x01\x00\x00\x00r\x06\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x04\x00\x00\x00a_\x01\x00\x00Bitfield specifying preferred activation methods.\n [5] - AC power cycle \n [4] - DC power cycle \n [3] - System reboot \n [2] - Medium-specific reset \n [1] - Self-Contained (can be performed upon transmission of ActivateFirmware command) \n [0] - Automatic (becomes active as the Apply completes, or as download completes if the FD performs an auto-apply)0z\x17ComponentLocationOffset{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\rComponentSize{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x1aComponentVersionStringType{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x06hex-ler\x08\x00\x00\x00{r\t\x00\x00\x00z\x06stringr\n\x00\x00\x00z\x05ASCIIr\x0b\x00\x00\x00z\x04UTF8r\x0c\x00\x00\x00z\x05UTF16r\r\x00\x00\x00z\x07UTF16LEr\x0e\x00\x00\x00z\x07UTF16BE00z\x1cComponentVersionStringLength{r\x01\x00\x00\x00r\x05\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x16ComponentVersionString{r\x01\x00\x00\x00z\x1cComponentVersionStringLengthr\x03\x00\x00\x00z\x1aComponentVersionStringType0z\x19ComponentOpaqueDataLength{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03int0z\x13ComponentOpaqueData{r\x01\x00\x00\x00z\x19ComponentOpaqueDataLengthr\x03\x00\x00\x00z\x06hex-le000z\x15PackageHeaderChecksum{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime0z\x1cPLDMFWPackagePayloadChecksum{r\x01\x00\x00\x00r\x10\x00\x00\x00r\x03\x00\x00\x00z\x03intr\x04\x00\x00\x00z\x1fThis field is evaluated runtime00'),
+}
@@ -0,0 +1,77 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+import contextlib
+from pathlib import Path
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import unpack
+from python import roundtrip
+from python import range_source
+from python import compressed_image
+
+SPEC_PATH = "pldm_spec_1.3.0"
+
+class ArchiveTest(unittest.TestCase):
+    """
+    Checks that the tar archive written by unpack holds the files of the unpack folder and does not depend on when or
+    from where the package was read
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name)
+        self.file_path = self.path / "package.fwpkg"
+        #images larger than a fetched piece are streamed in several pieces
+        roundtrip.generate_package(SPEC_PATH, self.file_path, 2, range_source.CHUNK_SIZE + 1000, 2)
+        os.utime(self.file_path, (1700000000, 1700000000))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def unpack(self, location, **options):
+        archive = io.BytesIO()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(unpack.main(location, str(self.path), SPEC_PATH, False, archive=archive, **options))
+        return archive.getvalue()
+
+    def test_archive_matches_unpack_folder(self):
+        data = self.unpack(str(self.file_path))
+        with contextlib.redirect_stdout(io.StringIO()):
+            unpack.main(str(self.file_path), str(self.path), SPEC_PATH, False)
+        with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+            members = archive.getmembers()
+            self.assertEqual(members[0].name, "header.json")
+            self.assertEqual(sorted(member.name for member in members), sorted(path.name for path in (self.path / "unpack").iterdir()))
+            for member in members:
+                self.assertEqual(member.mtime, 1700000000)
+                self.assertEqual(archive.extractfile(member).read(), (self.path / "unpack" / member.name).read_bytes(), member.name)
+
+    def test_archive_is_reproducible(self):
+        data = self.unpack(str(self.file_path))
+        self.assertEqual(self.unpack(str(self.file_path)), data)
+        server, url = range_source.start_server(self.path)
+        try:
+            self.assertEqual(self.unpack(url + "package.fwpkg"), data)
+        finally:
+            server.shutdown()
+
+    def test_compressed_archive(self):
+        data = self.unpack(str(self.file_path), compression="zlib")
+        package = self.file_path.read_bytes()
+        with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+            image_path = self.path / "image.bin.pldmz"
+            image_path.write_bytes(archive.extractfile(archive.getmembers()[1]).read())
+        image = b"".join(compressed_image.read_chunks(image_path))
+        self.assertEqual(len(image), range_source.CHUNK_SIZE + 1000)
+        self.assertIn(image, package)
+
+if __name__ == '__main__':
+    unittest.main()
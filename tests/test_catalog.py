@@ -0,0 +1,83 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import os
+import tempfile
+import unittest
+import contextlib
+from unittest import mock
+from pathlib import Path
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import catalog
+from python import roundtrip
+from spec import load_spec
+
+SPEC_PATH = "pldm_spec_1.3.0"
+
+class CatalogTest(unittest.TestCase):
+    """
+    Indexes a folder of generated packages and a package that cannot be decoded, then queries the catalog
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name)
+        roundtrip.generate_package(SPEC_PATH, self.path / "a.fwpkg", 3, 1000, 4)
+        roundtrip.generate_package(SPEC_PATH, self.path / "b.fwpkg", 2, 1000, 2, seed=1)
+        (self.path / "bad.fwpkg").write_bytes(bytes(40))
+        self.catalog_path = self.path / catalog.CATALOG_NAME
+        self.types = catalog.descriptor_types(load_spec(SPEC_PATH))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def index(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return catalog.index(self.path, SPEC_PATH)
+
+    def find(self, *filters):
+        connection = catalog.connect(self.catalog_path)
+        try:
+            return [Path(path).name for path, _ in catalog.find_packages(connection, [catalog.parse_filter(f, self.types) for f in filters])]
+        finally:
+            connection.close()
+
+    def test_failures_are_not_decoded_again(self):
+        self.assertEqual(self.index(), (2, 0, 0))
+        #the package that failed is skipped like the unchanged ones until it changes
+        with mock.patch.object(catalog, "store_package", side_effect=AssertionError("decoded again")):
+            self.assertEqual(self.index(), (0, 3, 0))
+        (self.path / "bad.fwpkg").unlink()
+        self.assertEqual(self.index(), (0, 2, 0))
+        connection = catalog.connect(self.catalog_path)
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM failures").fetchone(), (0,))
+        connection.close()
+
+    def test_failed_package_leaves_no_rows(self):
+        #the package fails after some of its rows were written
+        with mock.patch.object(catalog.applicability, "build_index", side_effect=ValueError("invalid bitmap")):
+            self.assertEqual(self.index(), (0, 0, 0))
+        connection = catalog.connect(self.catalog_path)
+        for table in ["packages", "device_records", "descriptors", "components", "record_components"]:
+            self.assertEqual(connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone(), (0,), table)
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM failures").fetchone(), (3,))
+        connection.close()
+
+    def test_filters(self):
+        self.index()
+        self.assertEqual(self.find("PackageVersionString=ROUNDTRIP"), ["a.fwpkg", "b.fwpkg"])
+        self.assertEqual(self.find("PCI Vendor ID=0x8086", "PCI Device ID=0x1234"), ["a.fwpkg", "b.fwpkg"])
+        self.assertEqual(self.find("PCI Vendor ID=0x8089"), ["a.fwpkg"])
+        #the two descriptors have to be in the same record
+        self.assertEqual(self.find("PCI Vendor ID=0x8086", "PCI Device ID=0x1235"), [])
+        with self.assertRaises(ValueError):
+            catalog.parse_filter("Vendor=0x8086", self.types)
+        with self.assertRaises(ValueError):
+            catalog.parse_filter("PCI Vendor ID", self.types)
+
+if __name__ == '__main__':
+    unittest.main()
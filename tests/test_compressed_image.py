@@ -0,0 +1,71 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import os
+import random
+import tempfile
+import unittest
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import compressed_image
+
+class CompressedImageTest(unittest.TestCase):
+    """
+    Checks that compressed images decompress chunk by chunk to the original image
+    """
+    def setUp(self):
+        rng = random.Random(2)
+        #compressible with a random part, over several chunks
+        self.image = bytes(50000) + rng.randbytes(30000) + b"PLDM" * 10000
+
+    def write(self, folder, codec, chunk_size, prefix=b""):
+        file_path = os.path.join(folder, "image.bin" + compressed_image.SUFFIX)
+        with open(file_path, "wb") as f:
+            f.write(prefix)
+            writer = compressed_image.CompressedImageWriter(f, len(self.image), codec, 1, chunk_size)
+            #writes of uneven sizes
+            for start in range(0, len(self.image), 7000):
+                writer.write(self.image[start:start + 7000])
+            writer.close()
+        return file_path
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for codec in compressed_image.CODECS:
+                file_path = self.write(folder, codec, 16384)
+                index = compressed_image.read_index(file_path)
+                self.assertEqual((index["codec"], index["size"], len(index["compressed_sizes"])), (codec, len(self.image), 8))
+                chunks = list(compressed_image.read_chunks(file_path))
+                self.assertTrue(all(len(chunk) <= 16384 for chunk in chunks))
+                self.assertEqual(b"".join(chunks), self.image)
+
+    def test_offset_in_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = self.write(folder, "zlib", 32768, prefix=b"x" * 512)
+            self.assertIsNone(compressed_image.read_index(file_path))
+            self.assertEqual(b"".join(compressed_image.read_chunks(file_path, 512)), self.image)
+
+    def test_compress_image(self):
+        data = compressed_image.compress_image(self.image, "lzma")
+        self.assertTrue(data.startswith(compressed_image.MAGIC))
+        self.assertLess(len(data), len(self.image))
+
+    def test_size_mismatch(self):
+        writer = compressed_image.CompressedImageWriter(io.BytesIO(), 10)
+        with self.assertRaises(ValueError):
+            writer.write(bytes(11))
+        writer = compressed_image.CompressedImageWriter(io.BytesIO(), 10)
+        writer.write(bytes(5))
+        with self.assertRaises(ValueError):
+            writer.close()
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            compressed_image.CompressedImageWriter(io.BytesIO(), 10, "bzip2")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+import zlib
+import random
+import tempfile
+import unittest
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import crc
+
+class CrcTest(unittest.TestCase):
+    """
+    Checks the parallel CRC32 engine against zlib
+    """
+    def setUp(self):
+        self.data = random.Random(0).randbytes(300000)
+
+    def test_combine_matches_zlib(self):
+        for split in [0, 1, 7, 4096, 150001, len(self.data)]:
+            first, second = self.data[:split], self.data[split:]
+            self.assertEqual(crc.crc32_combine(zlib.crc32(first), zlib.crc32(second), len(second)), zlib.crc32(self.data))
+
+    def test_parallel_crc_matches_zlib(self):
+        for jobs, chunk_size in [(1, 1000), (2, 65536), (4, 70001)]:
+            checksum = crc.ParallelCrc32(jobs, chunk_size)
+            #updates of uneven sizes, across the chunk boundaries
+            for start in range(0, len(self.data), 12345):
+                checksum.update(self.data[start:start + 12345])
+            self.assertEqual(checksum.value(), zlib.crc32(self.data))
+
+    def test_empty_stream(self):
+        self.assertEqual(crc.ParallelCrc32().value(), 0)
+
+    def test_ranges_match_zlib(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, "data.bin")
+            with open(file_path, "wb") as f:
+                f.write(self.data)
+            ranges = [(file_path, 10, 5000), (file_path, 200000, 90000), (file_path, 0, 0)]
+            expected = zlib.crc32(self.data[10:5010] + self.data[200000:290000])
+            self.assertEqual(crc.crc32_ranges(ranges, 2), expected)
+
+if __name__ == '__main__':
+    unittest.main()
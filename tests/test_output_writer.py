@@ -0,0 +1,75 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import output_writer
+
+class OutputWriterTest(unittest.TestCase):
+    """
+    Checks that output folders are published whole, backed up and cleaned up
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write_folder(self, data, jobs=2):
+        with output_writer.OutputWriter(self.path, "unpack", "unpack_backup_", jobs) as writer:
+            for i in range(10):
+                writer.write(f"image_{i}.bin", data)
+            with open(writer.path("header.json"), "w") as f:
+                f.write("{}")
+
+    def test_publish_and_backups(self):
+        self.write_folder(b"first")
+        self.write_folder(b"second")
+        self.write_folder(b"third", jobs=1)
+        self.assertEqual(sorted(entry.name for entry in self.path.iterdir()), ["unpack", "unpack_backup_1", "unpack_backup_2"])
+        self.assertEqual((self.path / "unpack" / "image_9.bin").read_bytes(), b"third")
+        self.assertEqual((self.path / "unpack_backup_1" / "image_0.bin").read_bytes(), b"first")
+        self.assertEqual(len(list((self.path / "unpack").iterdir())), 11)
+        self.assertEqual(output_writer.allocate_backup(self.path, "unpack_backup_"), self.path / "unpack_backup_3")
+
+    def test_error_keeps_output(self):
+        self.write_folder(b"first")
+        with self.assertRaises(RuntimeError):
+            with output_writer.OutputWriter(self.path, "unpack", "unpack_backup_") as writer:
+                writer.write("image_0.bin", b"second")
+                raise RuntimeError("decode failed")
+        self.assertEqual(sorted(entry.name for entry in self.path.iterdir()), ["unpack"])
+        self.assertEqual((self.path / "unpack" / "image_0.bin").read_bytes(), b"first")
+
+    def test_existing_output_without_backups(self):
+        (self.path / "repack").mkdir()
+        writer = output_writer.OutputWriter(self.path, "repack")
+        writer.write("repacked_data.fwpkg", b"data")
+        with self.assertRaises(FileExistsError):
+            writer.publish()
+        writer.abort()
+
+    @unittest.skipIf(os.name == "nt", "processes are checked on POSIX only")
+    def test_stale_staging_removed(self):
+        #the staging folder of a process that exited
+        process = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+        stale = self.path / f".unpack.tmp{process.stdout.strip()}"
+        stale.mkdir()
+        #the staging folder of a process that is still running
+        running = self.path / f".unpack.tmp{os.getppid()}"
+        running.mkdir()
+        self.write_folder(b"data")
+        self.assertFalse(stale.exists())
+        self.assertTrue(running.exists())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import os
+import tempfile
+import unittest
+import contextlib
+from pathlib import Path
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import query
+from python import unpack
+from python import applicability
+from python import roundtrip
+from spec import load_spec
+
+SPEC_PATH = "pldm_spec_1.3.0"
+
+class QueryTest(unittest.TestCase):
+    """
+    Checks that query decodes only what the field paths need, the applicability index and the component selection of
+    unpack on a generated package. The records of the package apply to components [0, 1, 2], [0, 1], [0] and [0, 1, 2]
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.folder.name, "package.fwpkg")
+        roundtrip.generate_package(SPEC_PATH, self.file_path, 3, 1000, 4)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_query_values(self):
+        results = query.query(self.file_path, SPEC_PATH, ["PackageVersionString", "FirmwareDeviceIdentificationArea.FirmwareDeviceIDRecords[2].ApplicableComponents"])
+        self.assertEqual(results, [
+            ("PackageHeaderInformation.PackageVersionString", "ROUNDTRIP"),
+            ("FirmwareDeviceIdentificationArea.FirmwareDeviceIDRecords[2].ApplicableComponents", "0x1"),
+        ])
+
+    def test_records_are_skipped(self):
+        paths = query.expand_query(load_spec(SPEC_PATH), "FirmwareDeviceIdentificationArea.FirmwareDeviceIDRecords[2].ApplicableComponents")
+        output_dict = query.read_header(self.file_path, SPEC_PATH, paths)
+        records = output_dict["FirmwareDeviceIdentificationArea"]["FirmwareDeviceIDRecords"]
+        self.assertEqual([record is None for record in records], [True, True, False, True])
+        #decoding stops after the last section needed
+        self.assertEqual(list(output_dict), ["PackageHeaderInformation", "FirmwareDeviceIdentificationArea"])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            query.expand_query(load_spec(SPEC_PATH), "NoSuchField")
+
+    def test_applicability_index(self):
+        output_dict, header_crc_match = query.read_package(self.file_path, SPEC_PATH)
+        self.assertTrue(header_crc_match)
+        index = applicability.build_index(output_dict)
+        self.assertEqual(index["records"]["FirmwareDeviceIDRecords"], [[0, 1, 2], [0, 1], [0], [0, 1, 2]])
+        self.assertEqual(applicability.records_for(index, 2), [0, 3])
+        self.assertTrue(applicability.applies(index, 1, 1))
+        self.assertFalse(applicability.applies(index, 2, 1))
+        self.assertEqual(applicability.invalid_bits(index), [])
+
+    def test_component_selection(self):
+        output = Path(self.folder.name) / "output"
+        for indexes in [[3], [-1], [0, 9]]:
+            with self.assertRaises(ValueError):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    unpack.main(self.file_path, str(output), SPEC_PATH, False, components=indexes)
+            #nothing is left behind
+            self.assertFalse(output.exists())
+        with contextlib.redirect_stdout(io.StringIO()):
+            unpack.main(self.file_path, str(output), SPEC_PATH, False, components=[2, 0, 2])
+        self.assertEqual(sorted(path.name.split("_image_")[-1] for path in (output / "unpack").glob("*.bin")), ["0.bin", "2.bin"])
+
+    def test_bits(self):
+        self.assertEqual(applicability.bitset("0x5"), 5)
+        self.assertEqual(applicability.bitset(""), 0)
+        self.assertEqual(applicability.set_bits(0b101001), [0, 3, 5])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+import random
+import tempfile
+import unittest
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import range_source
+
+class RangeSourceTest(unittest.TestCase):
+    """
+    Checks range coalescing, the order of fetched chunks and the block cache, on a local file and a local http server
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.data = random.Random(1).randbytes(200000)
+        self.file_path = os.path.join(self.folder.name, "package.fwpkg")
+        with open(self.file_path, "wb") as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_coalesce(self):
+        ranges = [(1000, 100), (0, 100), (100, 50), (200000, 10), (120, 0), (5000, 10)]
+        groups = range_source.coalesce(ranges, max_gap=1000)
+        #empty ranges are dropped, ranges within the gap are grouped, groups are in package order
+        self.assertEqual(groups, [(0, 1100, [1, 2, 0]), (5000, 5010, [5]), (200000, 200010, [3])])
+
+    def test_fetch_ranges(self):
+        ranges = [(150000, 30000), (10, 20), (40, 1000), (100000, 0)]
+        source = range_source.FileRangeSource(self.file_path)
+        try:
+            chunks = {}
+            order = []
+            for i, chunk in range_source.fetch_ranges(source, ranges, chunk_size=4096, max_gap=64):
+                chunks.setdefault(i, bytearray()).extend(chunk)
+                order.append(i)
+        finally:
+            source.close()
+        for i, (offset, size) in enumerate(ranges):
+            self.assertEqual(bytes(chunks.get(i, b"")), self.data[offset:offset + size])
+        #ranges are fetched in package order, the chunks of a range in order
+        self.assertEqual(order[0], 1)
+        self.assertEqual(order[-1], 0)
+        #the two close ranges are fetched by one request, the large one in 4096 byte pieces
+        self.assertEqual(source.requests, 1 + (30000 + 4095) // 4096)
+
+    def test_fetch_past_end(self):
+        source = range_source.FileRangeSource(self.file_path)
+        try:
+            with self.assertRaises(ValueError):
+                list(range_source.fetch_ranges(source, [(len(self.data) - 10, 20)]))
+        finally:
+            source.close()
+
+    def test_cached_reads(self):
+        source = range_source.CachedRangeSource(range_source.FileRangeSource(self.file_path), block_size=1024, cache_blocks=4)
+        try:
+            self.assertEqual(source.read(10, 20), self.data[10:30])
+            self.assertEqual(source.read(500, 1000), self.data[500:1500])
+            #both reads come from the blocks fetched by the first two requests
+            self.assertEqual(source.read(30, 100), self.data[30:130])
+            self.assertEqual(source.requests, 2)
+            #reads of at least a block go to the source
+            self.assertEqual(source.read(4000, 2048), self.data[4000:6048])
+            self.assertEqual(source.requests, 3)
+        finally:
+            source.close()
+
+    def test_http_source(self):
+        server, url = range_source.start_server(self.folder.name)
+        try:
+            source = range_source.open_source(url + "package.fwpkg")
+            try:
+                self.assertEqual(source.read(100, 50), self.data[100:150])
+                self.assertEqual(source.read(150000, 40000), self.data[150000:190000])
+                self.assertEqual(source.size, len(self.data))
+                self.assertEqual(source.bytes_read, range_source.CACHE_BLOCK_SIZE + 40000)
+            finally:
+                source.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
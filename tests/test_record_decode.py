@@ -0,0 +1,59 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import query
+from python import unpack
+from python import roundtrip
+from python import record_decode
+
+SPEC_PATH = "pldm_spec_1.3.0"
+
+class RecordDecodeTest(unittest.TestCase):
+    """
+    Forces the record tables of a package onto the worker processes and compares the header with the one decoded
+    sequentially. The tables of a compliant package are too small to take the parallel path on their own
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.folder.name, "package.fwpkg")
+        roundtrip.generate_package(SPEC_PATH, self.file_path, 3, 1000, 40)
+
+    def tearDown(self):
+        unpack.decode_jobs = None
+        self.folder.cleanup()
+
+    def test_parallel_matches_sequential(self):
+        sequential, sequential_crc_match = query.read_package(self.file_path, SPEC_PATH)
+        results = {}
+        def decode_records(firmware_data, record_json_data, *args):
+            result = original(firmware_data, record_json_data, *args)
+            results[next(iter(record_json_data))] = result
+            return result
+        original = record_decode.decode_records
+        unpack.decode_jobs = 3
+        with mock.patch.object(record_decode, "PARALLEL_MIN_SIZE", 0), mock.patch.object(record_decode, "decode_records", decode_records):
+            parallel, parallel_crc_match = query.read_package(self.file_path, SPEC_PATH)
+        #both record tables were decoded by the workers
+        self.assertIsNotNone(results["RecordLength"])
+        self.assertIsNotNone(results["DownstreamDeviceRecordLength"])
+        self.assertEqual(parallel, sequential)
+        self.assertTrue(parallel_crc_match and sequential_crc_match)
+
+    def test_boundaries(self):
+        table = (4).to_bytes(2, "little") + b"ab" + (3).to_bytes(2, "little") + b"c"
+        self.assertEqual(record_decode.record_boundaries(table, 0, 2), [0, 4, 7])
+        #a length running past the table or shorter than the length field cannot be right
+        self.assertIsNone(record_decode.record_boundaries(table, 0, 3))
+        self.assertIsNone(record_decode.record_boundaries(bytes(4), 0, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import unittest
+import contextlib
+import sys
+import os
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import roundtrip
+
+class RoundTripTest(unittest.TestCase):
+    """
+    Runs the round trip of -N roundtrip: the generated packages of every spec version have to unpack with matching
+    CRCs, repack byte for byte and stay within the peak memory baselines of python/roundtrip_baselines.json. The time
+    baselines are only checked by -N roundtrip, shared CI runners are too noisy for them
+    """
+    def test_roundtrip(self):
+        report = io.StringIO()
+        with contextlib.redirect_stdout(report):
+            passed = roundtrip.main(check_time=False)
+        self.assertTrue(passed, report.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import os
+import tempfile
+import unittest
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import query
+from python import roundtrip
+from python import simulator
+
+SPEC_PATH = "pldm_spec_1.3.0"
+
+class SimulatorTest(unittest.TestCase):
+    """
+    Checks the RequestFirmwareData answers of the package server against the bytes of the package
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.folder.name, "package.fwpkg")
+        roundtrip.generate_package(SPEC_PATH, self.file_path, 3, 100000, 4)
+        with open(self.file_path, "rb") as f:
+            self.data = f.read()
+        output_dict, _ = query.read_package(self.file_path, SPEC_PATH)
+        self.components = output_dict["ComponentImageInformationArea"]["ComponentImageInformation"]
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_request_firmware_data(self):
+        #a small cache forces blocks to be evicted and reads across blocks
+        with simulator.PackageServer(self.file_path, SPEC_PATH, cache_size=2 * simulator.CACHE_BLOCK_SIZE) as server:
+            for index, component in enumerate(self.components):
+                start, size = component["ComponentLocationOffset"], component["ComponentSize"]
+                for offset, length in [(0, 4096), (65000, 1000), (size - 10, 32)]:
+                    completion_code, data = server.request_firmware_data(index, offset, length)
+                    self.assertEqual(completion_code, simulator.SUCCESS)
+                    expected = self.data[start + offset:start + min(offset + length, size)]
+                    #the last transfer is padded with zeros
+                    self.assertEqual(data, expected + bytes(length - len(expected)))
+
+    def test_completion_codes(self):
+        with simulator.PackageServer(self.file_path, SPEC_PATH, max_transfer_size=4096) as server:
+            size = self.components[0]["ComponentSize"]
+            self.assertEqual(server.request_firmware_data(0, size, 32)[0], simulator.DATA_OUT_OF_RANGE)
+            self.assertEqual(server.request_firmware_data(0, -1, 32)[0], simulator.DATA_OUT_OF_RANGE)
+            self.assertEqual(server.request_firmware_data(0, 0, simulator.BASELINE_TRANSFER_SIZE - 1)[0], simulator.INVALID_TRANSFER_LENGTH)
+            self.assertEqual(server.request_firmware_data(0, 0, 4097)[0], simulator.INVALID_TRANSFER_LENGTH)
+
+    def test_run_load(self):
+        with simulator.PackageServer(self.file_path, SPEC_PATH) as server:
+            result = simulator.run_load(server, 4, 4096)
+        #device i updates the components of record i: [0, 1, 2], [0, 1], [0] and [0, 1, 2]
+        self.assertEqual(result["bytes"], 9 * 25 * 4096)
+        self.assertEqual(result["requests"], 9 * 25)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(simulator.percentile(values, 50), 50)
+        self.assertEqual(simulator.percentile(values, 99.9), 100)
+        self.assertEqual(simulator.percentile([7], 50), 7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import os
+import tempfile
+import unittest
+import contextlib
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import query
+from python import verify
+from python import roundtrip
+from python import split_merge
+
+SPEC_PATH = "pldm_spec_1.3.0"
+
+class SplitMergeTest(unittest.TestCase):
+    """
+    Splits a generated package per device record, merges the parts again and verifies every package written
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.folder.name, "package.fwpkg")
+        roundtrip.generate_package(SPEC_PATH, self.file_path, 3, 1000, 4)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def assertValid(self, file_path):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(verify.verify(file_path, SPEC_PATH), file_path)
+
+    def test_split_then_merge(self):
+        paths = split_merge.split(self.file_path, SPEC_PATH, self.folder.name)
+        self.assertEqual(len(paths), 4)
+        component_counts = []
+        for path in paths:
+            self.assertValid(path)
+            output_dict, _ = query.read_package(path, SPEC_PATH)
+            self.assertEqual(len(output_dict["FirmwareDeviceIdentificationArea"]["FirmwareDeviceIDRecords"]), 1)
+            component_counts.append(output_dict["ComponentImageInformationArea"]["ComponentImageCount"])
+        self.assertEqual(component_counts, [3, 2, 1, 3])
+
+        merged_path = os.path.join(self.folder.name, "merge", "merged_data.fwpkg")
+        split_merge.merge([(str(paths[1]), None), (str(paths[0]), [2])], SPEC_PATH, merged_path)
+        self.assertValid(merged_path)
+        merged, _ = query.read_package(merged_path, SPEC_PATH)
+        original, _ = query.read_package(self.file_path, SPEC_PATH)
+        identifiers = lambda header: [c["ComponentIdentifier"] for c in header["ComponentImageInformationArea"]["ComponentImageInformation"]]
+        self.assertEqual(identifiers(merged), identifiers(original))
+        #the images are copied as they are
+        with open(self.file_path, "rb") as f:
+            original_data = f.read()
+        with open(merged_path, "rb") as f:
+            merged_data = f.read()
+        for merged_component, original_component in zip(merged["ComponentImageInformationArea"]["ComponentImageInformation"],
+                                                         original["ComponentImageInformationArea"]["ComponentImageInformation"]):
+            start, size = merged_component["ComponentLocationOffset"], merged_component["ComponentSize"]
+            original_start = original_component["ComponentLocationOffset"]
+            self.assertEqual(merged_data[start:start + size], original_data[original_start:original_start + size])
+
+    def test_parse_input(self):
+        self.assertEqual(split_merge.parse_input("bundle.fwpkg:0,2"), ("bundle.fwpkg", [0, 2]))
+        self.assertEqual(split_merge.parse_input("C:/bundle.fwpkg"), ("C:/bundle.fwpkg", None))
+
+if __name__ == '__main__':
+    unittest.main()
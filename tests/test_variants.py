@@ -0,0 +1,65 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import os
+import json
+import tempfile
+import unittest
+import contextlib
+from pathlib import Path
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import query
+from python import unpack
+from python import verify
+from python import variants
+from python import roundtrip
+
+SPEC_PATH = "pldm_spec_1.3.0"
+
+class VariantsTest(unittest.TestCase):
+    """
+    Builds variants of an unpacked package with one and several writer threads
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name)
+        self.file_path = self.path / "package.fwpkg"
+        roundtrip.generate_package(SPEC_PATH, self.file_path, 3, 3 * 1024 * 1024, 2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            unpack.main(str(self.file_path), str(self.path), SPEC_PATH, False)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def build(self, names, jobs, output):
+        variants_path = self.path / "variants.json"
+        variants_path.write_text(json.dumps({"variants": [
+            {"name": name, "overrides": {"PackageHeaderInformation": {"PackageVersionString": name}}} for name in names]}))
+        with contextlib.redirect_stdout(io.StringIO()):
+            variants.main(str(self.path / "unpack"), variants_path, self.path / output, SPEC_PATH, jobs)
+        return self.path / output / "variants"
+
+    def test_threads_write_the_same_bundles(self):
+        names = ["sku_a", "sku_b", "sku_c", "sku_d", "sku_e"]
+        sequential = self.build(names, 1, "sequential")
+        parallel = self.build(names, 3, "parallel")
+        for name in names:
+            data = (parallel / f"{name}.fwpkg").read_bytes()
+            self.assertEqual(data, (sequential / f"{name}.fwpkg").read_bytes(), name)
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertTrue(verify.verify(parallel / f"{name}.fwpkg", SPEC_PATH))
+            output_dict, _ = query.read_package(parallel / f"{name}.fwpkg", SPEC_PATH)
+            self.assertEqual(output_dict["PackageHeaderInformation"]["PackageVersionString"], name)
+
+    def test_duplicate_names(self):
+        with self.assertRaises(ValueError):
+            self.build(["sku_a", "sku_b", "SKU_A"], 1, "duplicates")
+        self.assertFalse((self.path / "duplicates" / "variants").exists())
+
+if __name__ == '__main__':
+    unittest.main()
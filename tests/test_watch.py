@@ -0,0 +1,86 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+
+import io
+import os
+import zlib
+import tempfile
+import unittest
+import contextlib
+from pathlib import Path
+import sys
+# Get the parent directory path
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Append the parent directory to the Python path
+sys.path.append(parent_dir)
+from python import unpack
+from python import verify
+from python import watch
+from python import roundtrip
+from spec import load_spec
+
+SPEC_PATH = "pldm_spec_1.3.0"
+
+class WatchTest(unittest.TestCase):
+    """
+    Checks the incremental builds of an unpack folder against the package it was unpacked from
+    """
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = Path(self.folder.name)
+        self.file_path = self.path / "package.fwpkg"
+        roundtrip.generate_package(SPEC_PATH, self.file_path, 3, 5000, 4)
+        with contextlib.redirect_stdout(io.StringIO()):
+            unpack.main(str(self.file_path), str(self.path), SPEC_PATH, None)
+        self.unpack_path = self.path / "unpack"
+        self.output_path = self.path / "watched.fwpkg"
+        self.json_data = load_spec(SPEC_PATH)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def assertValid(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(verify.verify(self.output_path, SPEC_PATH))
+
+    def test_changed_spans(self):
+        self.assertEqual(watch.changed_spans(b"abcdef", b"abcdef"), [])
+        self.assertEqual(watch.changed_spans(b"abcdef", b"xbcdyy"), [(0, 1), (4, 6)])
+
+    def test_payload_checksum(self):
+        images = [b"first", b"second image"]
+        offsets = [10, 20]
+        payload = images[0] + bytes(5) + images[1]
+        checksum = watch.payload_checksum(10, offsets, [len(image) for image in images], [zlib.crc32(image) for image in images])
+        self.assertEqual(checksum, zlib.crc32(payload))
+
+    def test_builds(self):
+        state, written, patched = watch.build(self.unpack_path, self.json_data, self.output_path)
+        self.assertEqual(written, 3)
+        self.assertEqual(self.output_path.read_bytes(), self.file_path.read_bytes())
+        state, written, patched = watch.build(self.unpack_path, self.json_data, self.output_path, state)
+        self.assertEqual((written, patched), (0, 0))
+
+        image_path = sorted(self.unpack_path.glob("*image_1.bin"))[0]
+        original = image_path.read_bytes()
+        edited = bytearray(original)
+        edited[5] ^= 1
+        image_path.write_bytes(edited)
+        state, written, patched = watch.build(self.unpack_path, self.json_data, self.output_path, state)
+        self.assertEqual(written, 1)
+        #only the payload checksum changed in the header
+        self.assertLessEqual(patched, 4)
+        self.assertValid()
+
+        image_path.write_bytes(original + b"resized")
+        state, written, patched = watch.build(self.unpack_path, self.json_data, self.output_path, state)
+        self.assertEqual(written, 3)
+        self.assertValid()
+
+        image_path.write_bytes(original)
+        watch.build(self.unpack_path, self.json_data, self.output_path, state)
+        self.assertEqual(self.output_path.read_bytes(), self.file_path.read_bytes())
+        self.assertFalse(self.output_path.with_name(self.output_path.name + ".tmp").exists())
+
+if __name__ == '__main__':
+    unittest.main()